@@ -1,7 +1,43 @@
-from hofs.common import FunctionalIterator, Table, table_from_rows
+from hofs.common import (
+    AhoCorasick,
+    AsyncFunctionalIterator,
+    BloomFilter,
+    Cache,
+    Estimate,
+    FunctionalIterator,
+    GroupBy,
+    HyperLogLog,
+    P2Quantile,
+    Profile,
+    Progress,
+    StageProfile,
+    Table,
+    Throttle,
+    table_from_rows,
+)
 from hofs.exceptions import HofsException
-from hofs.filelike import Dir, File, FileIterator, FileLike, TextFile, TextFileIterator
+from hofs.filelike import (
+    ArchiveDir,
+    ArchiveFile,
+    ArchiveTextFile,
+    Checkpoint,
+    Dir,
+    Distributed,
+    File,
+    FileIterator,
+    FileLike,
+    TextFile,
+    TextFileIterator,
+)
 from hofs.filesize import FileSize, FileSizeUnit
+from hofs.index import (
+    FileIndex,
+    TextIndex,
+    TrigramIndex,
+    regex_trigram_query,
+    tokenize_lines,
+    trigrams,
+)
 from hofs.paths import (
     dir_exists,
     expand_path,
@@ -19,13 +55,30 @@ from hofs.paths import (
 
 __all__ = [
     # common
+    "AhoCorasick",
+    "AsyncFunctionalIterator",
+    "BloomFilter",
+    "Cache",
+    "Estimate",
     "FunctionalIterator",
+    "GroupBy",
+    "HyperLogLog",
+    "P2Quantile",
+    "Profile",
+    "Progress",
+    "StageProfile",
     "Table",
+    "Throttle",
     "table_from_rows",
     # exceptions
     "HofsException",
     # filelike
+    "ArchiveDir",
+    "ArchiveFile",
+    "ArchiveTextFile",
+    "Checkpoint",
     "Dir",
+    "Distributed",
     "File",
     "FileIterator",
     "FileLike",
@@ -34,6 +87,13 @@ __all__ = [
     # filesize
     "FileSize",
     "FileSizeUnit",
+    # index
+    "FileIndex",
+    "TextIndex",
+    "TrigramIndex",
+    "regex_trigram_query",
+    "tokenize_lines",
+    "trigrams",
     # paths
     "dir_exists",
     "expand_path",
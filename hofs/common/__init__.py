@@ -1,10 +1,38 @@
-from hofs.common.functional import FunctionalIterator
+from hofs.common.aho_corasick import AhoCorasick
+from hofs.common.async_functional import AsyncFunctionalIterator
+from hofs.common.functional import Cache, FunctionalIterator
+from hofs.common.grouping import GroupBy
+from hofs.common.profile import Profile, StageProfile
+from hofs.common.progress import Progress
+from hofs.common.sampling import Estimate
+from hofs.common.sketches import BloomFilter, HyperLogLog, P2Quantile
 from hofs.common.table import Table, table_from_rows
+from hofs.common.throttle import Throttle
 
 __all__ = [
+    # aho_corasick
+    "AhoCorasick",
+    # async_functional
+    "AsyncFunctionalIterator",
     # functional
+    "Cache",
     "FunctionalIterator",
+    # grouping
+    "GroupBy",
+    # profile
+    "Profile",
+    "StageProfile",
+    # progress
+    "Progress",
+    # sampling
+    "Estimate",
+    # sketches
+    "BloomFilter",
+    "HyperLogLog",
+    "P2Quantile",
     # table
     "Table",
     "table_from_rows",
+    # throttle
+    "Throttle",
 ]
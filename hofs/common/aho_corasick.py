@@ -0,0 +1,85 @@
+from collections import deque
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple, Union
+
+from hofs.exceptions.exceptions import HofsException
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Sequence[Union[str, bytes]]) -> None:
+        """
+        Build an Aho-Corasick automaton matching all given patterns at once.
+
+        :param patterns: The patterns. Strings are encoded as UTF-8.
+        """
+        self.patterns = list(patterns)
+        self._encoded = [
+            pattern.encode("utf-8") if isinstance(pattern, str) else pattern
+            for pattern in self.patterns
+        ]
+        if any(len(pattern) == 0 for pattern in self._encoded):
+            raise HofsException("patterns must not be empty")
+
+        # State 0 is the root, every state has its transitions, its failure state
+        # and the indices of the patterns ending in it (including patterns ending
+        # in states reachable via failure transitions)
+        self._goto: List[Dict[int, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pattern_idx, pattern in enumerate(self._encoded):
+            state = 0
+            for byte in pattern:
+                next_state = self._goto[state].get(byte)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][byte] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append(pattern_idx)
+
+        self._build_fail()
+
+    def _build_fail(self) -> None:
+        queue = deque(self._goto[0].values())
+        while len(queue) != 0:
+            state = queue.popleft()
+            for byte, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail != 0 and byte not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(byte, 0)
+                self._fail[next_state] = fail
+                self._out[next_state] = self._out[next_state] + self._out[fail]
+
+    def scan(
+        self, stream: BinaryIO, chunk_size: int = 1 << 16
+    ) -> Iterator[Tuple[int, Union[str, bytes]]]:
+        """
+        Find all occurrences of the patterns in a binary stream.
+
+        The stream is read in chunks, i.e. the memory usage doesn't depend on its size.
+        Every byte is processed exactly once, independently of the number of patterns.
+
+        :param stream: The binary stream.
+        :param chunk_size: The number of bytes to read at once.
+        :return: An iterator of (offset, pattern) tuples, where offset is the byte offset at
+            which the occurrence starts. Occurrences are ordered by the offset at which they end.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        encoded, patterns = self._encoded, self.patterns
+
+        state, offset = 0, 0
+        chunk = stream.read(chunk_size)
+        while len(chunk) != 0:
+            for byte in chunk:
+                offset += 1
+                while state != 0 and byte not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(byte, 0)
+                for pattern_idx in out[state]:
+                    yield offset - len(encoded[pattern_idx]), patterns[pattern_idx]
+            chunk = stream.read(chunk_size)
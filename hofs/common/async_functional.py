@@ -0,0 +1,236 @@
+import asyncio
+import collections
+import itertools
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from hofs.exceptions.exceptions import HofsException
+
+T = TypeVar("T")
+
+
+def _next_chunk(iterator: Iterator[T], size: int) -> List[T]:
+    return list(itertools.islice(iterator, size))
+
+
+async def _from_sync(
+    iterator: Iterator[T], executor: Optional[Executor], chunk_size: int
+) -> AsyncIterator[T]:
+    # The iterator is advanced in the executor, one chunk at a time. The next chunk is
+    # read while the current one is consumed, i.e. at most two chunks are held in memory
+    loop = asyncio.get_running_loop()
+    pending = loop.run_in_executor(executor, _next_chunk, iterator, chunk_size)
+    try:
+        while True:
+            chunk = await pending
+            if len(chunk) == 0:
+                return
+            pending = loop.run_in_executor(executor, _next_chunk, iterator, chunk_size)
+            for value in chunk:
+                yield value
+    finally:
+        # Wait for the chunk that is being read, so that the iterator isn't closed while
+        # it is used in the executor
+        await asyncio.wait([pending])
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncFunctionalIterator(AsyncIterator[T]):
+    def __init__(
+        self, aiterable: AsyncIterable[T], executor: Optional[Executor] = None
+    ) -> None:
+        """
+        An asynchronous iterator with higher-order functions.
+
+        Blocking functions (see amap and afilter) run in an executor, so they don't block the
+        event loop.
+
+        :param aiterable: The asynchronous iterable.
+        :param executor: The executor blocking functions run in. If None, the default
+            executor of the event loop (a bounded thread pool) is used.
+        """
+        self.it = aiterable.__aiter__()
+        self.executor = executor
+        self._parent = (
+            aiterable if isinstance(aiterable, AsyncFunctionalIterator) else None
+        )
+
+    @staticmethod
+    def from_iterable(
+        iterable: Iterator[T],
+        executor: Optional[Executor] = None,
+        chunk_size: int = 64,
+    ) -> "AsyncFunctionalIterator[T]":
+        """
+        Create an asynchronous iterator from a (blocking) iterator.
+
+        The iterator is advanced in the executor chunk by chunk. Only one chunk is read ahead,
+        so a fast iterator (like a directory walk) can't run arbitrarily far ahead of a slow
+        consumer.
+
+        :param iterable: The iterator.
+        :param executor: The executor (see __init__).
+        :param chunk_size: The number of values read at once.
+        :return: The asynchronous iterator.
+        """
+        return AsyncFunctionalIterator(
+            _from_sync(iter(iterable), executor, chunk_size), executor
+        )
+
+    def __anext__(self) -> Awaitable[T]:
+        return self.it.__anext__()
+
+    def _then(self, aiterable: AsyncIterable[Any]) -> "AsyncFunctionalIterator[Any]":
+        result: AsyncFunctionalIterator[Any] = AsyncFunctionalIterator(
+            aiterable, self.executor
+        )
+        result._parent = self
+        return result
+
+    async def aclose(self) -> None:
+        """
+        Stop this iterator and all iterators it reads from (see FunctionalIterator.close).
+        """
+        aclose = getattr(self.it, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        if self._parent is not None:
+            await self._parent.aclose()
+
+    def map(self, fun: Callable[[T], Any]) -> "AsyncFunctionalIterator[Any]":
+        """
+        Map the values using a fast, non-blocking function (it runs on the event loop).
+
+        :param fun: The function.
+        :return: An asynchronous iterator containing the mapped values.
+        """
+
+        async def mapped() -> AsyncIterator[Any]:
+            async for value in self:
+                yield fun(value)
+
+        return self._then(mapped())
+
+    def filter(self, fun: Callable[[T], bool]) -> "AsyncFunctionalIterator[T]":
+        """
+        Filter the values using a fast, non-blocking function (it runs on the event loop).
+
+        :param fun: The filter function.
+        :return: An asynchronous iterator containing the values for which fun returns True.
+        """
+
+        async def filtered() -> AsyncIterator[T]:
+            async for value in self:
+                if fun(value):
+                    yield value
+
+        return self._then(filtered())
+
+    def map_async(
+        self, fun: Callable[[T], Awaitable[Any]], concurrency: int = 8
+    ) -> "AsyncFunctionalIterator[Any]":
+        """
+        Map the values using a coroutine function, running up to concurrency calls at once.
+
+        The order of the values is kept. No further values are requested while concurrency
+        calls are running, i.e. a fast source can't flood the memory.
+
+        :param fun: The coroutine function.
+        :param concurrency: The maximum number of concurrent calls.
+        :return: An asynchronous iterator containing the mapped values.
+        """
+        if concurrency < 1:
+            raise HofsException(f"concurrency must be positive, but was {concurrency}")
+
+        async def mapped() -> AsyncIterator[Any]:
+            pending: Deque[asyncio.Future] = collections.deque()
+            try:
+                async for value in self:
+                    pending.append(asyncio.ensure_future(fun(value)))
+                    if len(pending) >= concurrency:
+                        yield await pending.popleft()
+                while len(pending) != 0:
+                    yield await pending.popleft()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return self._then(mapped())
+
+    def amap(
+        self, fun: Callable[[T], Any], concurrency: int = 1
+    ) -> "AsyncFunctionalIterator[Any]":
+        """
+        Map the values using a blocking function, which runs in the executor.
+
+        For example afiles().amap(lambda file: file.t().content, concurrency=8) reads up to
+        8 files at once without blocking the event loop.
+
+        :param fun: The blocking function.
+        :param concurrency: The maximum number of concurrent calls (see map_async).
+        :return: An asynchronous iterator containing the mapped values.
+        """
+        return self.map_async(
+            lambda value: asyncio.get_running_loop().run_in_executor(
+                self.executor, fun, value
+            ),
+            concurrency,
+        )
+
+    def afilter(
+        self, fun: Callable[[T], bool], concurrency: int = 1
+    ) -> "AsyncFunctionalIterator[T]":
+        """
+        Filter the values using a blocking function, which runs in the executor.
+
+        :param fun: The blocking filter function.
+        :param concurrency: The maximum number of concurrent calls (see map_async).
+        :return: An asynchronous iterator containing the values for which fun returns True.
+        """
+        return (
+            self.amap(lambda value: (value, fun(value)), concurrency)
+            .filter(lambda pair: pair[1])
+            .map(lambda pair: pair[0])
+        )
+
+    async def list(self) -> List[T]:
+        return [value async for value in self]
+
+    async def len(self) -> int:
+        n = 0
+        async for _ in self:
+            n += 1
+        return n
+
+    async def sum(self) -> Any:
+        total: Any = 0
+        async for value in self:
+            total += value
+        return total
+
+    async def first(self, default: Any = None) -> Any:
+        """
+        Get the first value and close the iterator.
+
+        :param default: The value to return if there are no values.
+        :return: The first value (or default).
+        """
+        try:
+            async for value in self:
+                return value
+            return default
+        finally:
+            await self.aclose()
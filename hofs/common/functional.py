@@ -1,9 +1,89 @@
+import collections
+import csv
 import heapq
+import itertools
+import math
+import operator
+import queue
+import random
+import threading
+import weakref
 from collections.abc import Iterator
+from concurrent.futures import Executor
 from functools import reduce
-from typing import Any, Callable, Iterable, List, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+from hofs.common.async_functional import AsyncFunctionalIterator
+from hofs.common.grouping import GroupBy
+from hofs.common.profile import Profile
+from hofs.common.progress import ProgressCallback, track_progress
+from hofs.common.sampling import Estimate, estimate_from_sample, reservoir_sample
+from hofs.common.sketches import BloomFilter, HyperLogLog, P2Quantile
+from hofs.common.spill import SpillFiles
+from hofs.common.table import Table
+from hofs.exceptions.exceptions import HofsException
 
 T = TypeVar("T")
+IteratorT = TypeVar("IteratorT", bound="FunctionalIterator")
+
+
+def describe_source(source: Any) -> str:
+    """
+    Describe the source of an iterator chain (used by explain).
+
+    :param source: The source, e.g. a directory walk.
+    :return: The description.
+    """
+    describe = getattr(source, "describe", None)
+    return describe() if describe is not None else type(source).__name__
+
+
+def fun_name(fun: Callable) -> str:
+    """
+    Get a readable name of a callable (used for describing iterator stages).
+
+    Lambdas defined inside a function are named after the function, e.g. the lambda
+    in TextFileIterator.map_line_count is named "TextFileIterator.map_line_count".
+
+    :param fun: The callable.
+    :return: The name.
+    """
+    name = getattr(fun, "__qualname__", None)
+    if name is None:
+        return repr(fun)
+    return name.replace(".<locals>.<lambda>", "")
+
+
+# The number of chunks buffered per sink of FunctionalIterator.broadcast
+_BROADCAST_QUEUE_SIZE = 4
+
+# The number of values FunctionalIterator.aggregate passes to the builtin sum, min and max
+# at once
+_AGGREGATE_BATCH_SIZE = 1024
+
+
+def _chunked(values: Iterator[T], size: int) -> Iterator[List[T]]:
+    while True:
+        chunk = list(itertools.islice(values, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def _identity(value: Any) -> Any:
+    return value
 
 
 class FunctionalIterator(Iterator[T]):
@@ -11,26 +91,430 @@ class FunctionalIterator(Iterator[T]):
         super().__init__()
         self.it = iter(iterable)
 
+        # The iterator this iterator reads from and a description of what this iterator
+        # does with the values (None if it just passes them through)
+        self._parent: Optional[FunctionalIterator] = (
+            iterable if isinstance(iterable, FunctionalIterator) else None
+        )
+        self._stage: Optional[str] = None
+        # Whether the stage depends on the values before the current one (like take), i.e.
+        # it can't be applied to parts of the values separately (see distributed)
+        self._sequential = False
+
     def __next__(self) -> T:
         return next(self.it)
 
+    def _same_kind(self, iterable: Iterable[T]) -> "FunctionalIterator[T]":
+        # A new iterator of the same kind as this one (e.g. a FileIterator for a FileIterator)
+        return FunctionalIterator(iterable)
+
+    def _share_chunk(self, chunk: List[T]) -> List[T]:
+        # Prepare a chunk of values for being passed to several consumers
+        return chunk
+
+    def _then(
+        self, iterable: Iterable[Any], stage: str, sequential: bool = False
+    ) -> "FunctionalIterator[Any]":
+        result: FunctionalIterator[Any] = FunctionalIterator(iterable)
+        result._parent = self
+        result._stage = stage
+        result._sequential = sequential
+        return result
+
+    def _then_same_kind(
+        self, iterable: Iterable[T], stage: str, sequential: bool = False
+    ) -> "FunctionalIterator[T]":
+        # Like _then, for stages that pass on (some of) the values unchanged
+        result = self._same_kind(iterable)
+        result._parent = self
+        result._stage = stage
+        result._sequential = sequential
+        return result
+
+    def _explain_lines(self) -> List[str]:
+        if self._parent is not None:
+            lines = self._parent._explain_lines()
+        else:
+            lines = [describe_source(self.it)]
+
+        if self._stage is not None:
+            lines.append(self._stage)
+        return lines
+
+    def _source_iterator(self) -> Any:
+        # The iterator the values of the first stage come from
+        return self.it
+
+    def _chain(self) -> "List[FunctionalIterator]":
+        # The iterators of this chain, starting with the first one
+        chain: List[FunctionalIterator] = []
+        node: Optional[FunctionalIterator] = self
+        while node is not None:
+            chain.append(node)
+            node = node._parent
+        chain.reverse()
+        return chain
+
+    def _stage_name(self) -> str:
+        return self._stage if self._stage is not None else type(self).__name__
+
+    def explain(self) -> str:
+        """
+        Describe the stages of this iterator chain (starting with the source).
+
+        This doesn't consume any values.
+
+        :return: The description, one stage per line.
+        """
+        return "\n".join(self._explain_lines())
+
+    def close(self) -> None:
+        """
+        Stop this iterator and all iterators it reads from.
+
+        This releases their resources, e.g. a directory walk stops and open files are closed.
+        Afterwards, the iterator doesn't return any more values. The short-circuiting terminals
+        (like first or any) close the iterator as soon as they know their result.
+        """
+        close = getattr(self.it, "close", None)
+        if close is not None:
+            close()
+        self.it = iter([])
+
+        if self._parent is not None:
+            self._parent.close()
+
+    def profile(self) -> Profile:
+        """
+        Profile the stages of this iterator chain.
+
+        Every stage of the chain (e.g. the directory walk, a filter or a map) records the
+        number of values it returns, the wall and CPU time spent in it and the I/O it performs
+        (stat calls, opened files, listed directories and bytes read). Times and I/O are
+        attributed to the innermost stage, i.e. the time of a map stage doesn't include the
+        time spent in the walk feeding it.
+
+        Profiling starts immediately and ends when calling stop on the profile (or when
+        leaving a with block):
+
+            files = fs.Dir(".").files.filter_ext("py").t().map_lc()
+            with files.profile() as profile:
+                files.sum()
+            print(profile.report())
+
+        :return: The profile.
+        """
+        chain = self._chain()
+        source = chain[0]._source_iterator()
+        return Profile(
+            [(source, describe_source(source))]
+            + [(node, node._stage_name()) for node in chain]
+        )
+
+    def progress(
+        self,
+        callback: ProgressCallback,
+        interval: float = 1.0,
+        total: Optional[int] = None,
+    ) -> "FunctionalIterator[T]":
+        """
+        Report the progress of the values passing this point of the chain.
+
+        The callback is called with a Progress object at most every interval seconds and once
+        after the last value. It contains the number of values so far, the values per second,
+        the bytes read from files and (if the chain is fed by a directory walk) the number
+        of visited directory entries and pending directories. If total is given, it also
+        contains an ETA.
+
+        For example fs.Dir("/").files.progress(print, interval=10).t().map_lc().sum() prints
+        the progress of a scan every ten seconds. Chains without a progress stage are not
+        slowed down at all.
+
+        :param callback: The function called with the progress.
+        :param interval: The minimum number of seconds between two reports.
+        :param total: The expected total number of values (e.g. from a previous run).
+        :return: A functional iterator of the same kind as this one (e.g. a FileIterator)
+            containing the same values.
+        """
+        source = self._chain()[0]._source_iterator()
+        return self._then_same_kind(
+            track_progress(self, source, callback, interval, total),
+            f"progress: every {interval}s",
+        )
+
     def list(self) -> List[T]:
         return list(self)
 
+    def aiter(
+        self, executor: Optional[Executor] = None, chunk_size: int = 64
+    ) -> AsyncFunctionalIterator[T]:
+        """
+        Iterate over the values asynchronously.
+
+        This iterator is advanced in an executor (chunk by chunk), so it doesn't block the
+        event loop. Only one chunk is read ahead.
+
+        :param executor: The executor. If None, the default executor of the event loop is used.
+        :param chunk_size: The number of values read at once.
+        :return: An asynchronous functional iterator containing the values.
+        """
+        return AsyncFunctionalIterator.from_iterable(self, executor, chunk_size)
+
+    def first(self, default: Any = None) -> Any:
+        """
+        Get the first value and close the iterator.
+
+        :param default: The value to return if there are no values.
+        :return: The first value (or default).
+        """
+        try:
+            return next(self, default)
+        finally:
+            self.close()
+
+    def find(self, fun: Callable[[T], bool], default: Any = None) -> Any:
+        """
+        Get the first value for which fun returns True and close the iterator.
+
+        :param fun: The predicate.
+        :param default: The value to return if there is no such value.
+        :return: The first value for which fun returns True (or default).
+        """
+        try:
+            return next(filter(fun, self), default)
+        finally:
+            self.close()
+
+    def any(self, fun: Optional[Callable[[T], bool]] = None) -> bool:
+        """
+        Check whether fun returns True for any value and close the iterator.
+
+        The iteration stops at the first such value, e.g. fs.Dir(".").files.any(lambda file:
+        file.name == ".env") stops walking as soon as the first .env file is found.
+
+        :param fun: The predicate (None to check the truth values of the values themselves).
+        :return: True if fun returns True for at least one value, False otherwise.
+        """
+        try:
+            return any(self if fun is None else map(fun, self))
+        finally:
+            self.close()
+
+    def all(self, fun: Optional[Callable[[T], bool]] = None) -> bool:
+        """
+        Check whether fun returns True for all values and close the iterator.
+
+        The iteration stops at the first value for which fun returns False.
+
+        :param fun: The predicate (None to check the truth values of the values themselves).
+        :return: True if fun returns True for all values (or if there are no values),
+            False otherwise.
+        """
+        try:
+            return all(self if fun is None else map(fun, self))
+        finally:
+            self.close()
+
+    def take(self, n: int) -> "FunctionalIterator[T]":
+        """
+        Take the first n values.
+
+        This iterator is closed as soon as the n-th value was taken.
+
+        :param n: The number of values.
+        :return: An iterator of the same kind as this one (e.g. a FileIterator)
+            containing (at most) the first n values.
+        """
+        return self._then_same_kind(self._take(n), f"take: {n}", True)
+
+    def _take(self, n: int) -> Iterator[T]:
+        if n > 0:
+            for idx, value in enumerate(self, start=1):
+                yield value
+                if idx == n:
+                    break
+        self.close()
+
+    def take_while(self, fun: Callable[[T], bool]) -> "FunctionalIterator[T]":
+        """
+        Take values as long as fun returns True for them.
+
+        This iterator is closed as soon as fun returns False.
+
+        :param fun: The predicate.
+        :return: An iterator of the same kind as this one (e.g. a FileIterator)
+            containing the values before the first value for which fun returns False.
+        """
+        return self._then_same_kind(
+            self._take_while(fun), f"take_while: {fun_name(fun)}", True
+        )
+
+    def _take_while(self, fun: Callable[[T], bool]) -> Iterator[T]:
+        for value in self:
+            if not fun(value):
+                break
+            yield value
+        self.close()
+
+    def skip(self, n: int) -> "FunctionalIterator[T]":
+        """
+        Skip the first n values.
+
+        :param n: The number of values.
+        :return: An iterator of the same kind as this one (e.g. a FileIterator)
+            containing all values but the first n ones.
+        """
+        return self._then_same_kind(itertools.islice(self, n, None), f"skip: {n}", True)
+
     def filter(self, fun: Callable[[T], bool]) -> "FunctionalIterator[T]":
-        return FunctionalIterator(filter(fun, self))
+        return self._then(filter(fun, self), f"filter: {fun_name(fun)}")
 
     def map(self, fun: Callable[[T], Any]) -> "FunctionalIterator[Any]":
-        return FunctionalIterator(map(fun, self))
+        return self._then(map(fun, self), f"map: {fun_name(fun)}")
+
+    def _chunks(self, size: int) -> Iterator[Sequence[T]]:
+        return _chunked(self, size)
+
+    def batch(self, n: int) -> "FunctionalIterator[List[T]]":
+        """
+        Group the values into lists of n consecutive values.
+
+        :param n: The number of values per list.
+        :return: A functional iterator containing the lists (the last list might be shorter).
+        """
+        return self._then(self._chunks(n), f"batch: {n}", True)
+
+    def map_batch(
+        self, fun: Callable[[Sequence[T]], Iterable[Any]], size: int = 1024
+    ) -> "FunctionalIterator[Any]":
+        """
+        Map the values chunk by chunk.
+
+        Instead of calling fun once per value, fun is called with a list of (up to) size
+        values and must return the mapped values. This allows vectorized functions
+        (e.g. NumPy functions or a regular expression applied to a joined string) to process
+        many values at once. Consecutive batch stages pass their chunks to each other
+        directly (re-chunked to the size of the next stage), i.e. the values don't go through
+        the per-value iteration of the chain until after the last batch stage.
+
+        :param fun: The function mapping a chunk of values to the chunk of mapped values.
+        :param size: The chunk size.
+        :return: A functional iterator containing the mapped values.
+        """
+        return _BatchIterator(self, fun, size, f"map_batch: {fun_name(fun)}")
+
+    def filter_batch(
+        self, fun: Callable[[Sequence[T]], Iterable[bool]], size: int = 1024
+    ) -> "FunctionalIterator[T]":
+        """
+        Filter the values chunk by chunk.
+
+        Instead of calling fun once per value, fun is called with a list of (up to) size
+        values and must return one boolean per value (see map_batch).
+
+        :param fun: The function mapping a chunk of values to a chunk of booleans.
+        :param size: The chunk size.
+        :return: A functional iterator containing the values for which fun returned True.
+        """
+        return _BatchIterator(
+            self,
+            lambda chunk: list(itertools.compress(chunk, fun(chunk))),
+            size,
+            f"filter_batch: {fun_name(fun)}",
+        )
+
+    def cache(self, max_memory_items: Optional[int] = None) -> "Cache[T]":
+        """
+        Cache the values, so that they can be iterated over several times.
+
+        The values are cached lazily, i.e. only when a replay requests them for the first time.
+        This means that e.g. a directory is walked only once, no matter how many replays read
+        from the cache.
+
+        :param max_memory_items: The maximum number of values held in memory. Further values
+            are spilled to temporary files, which requires them to be picklable.
+            None means that all values are kept in memory.
+        :return: The cache, call replay to iterate over the values.
+        """
+        return Cache(self, max_memory_items)
+
+    def tee(
+        self, n: int = 2, max_memory_items: Optional[int] = None
+    ) -> Tuple["FunctionalIterator[T]", ...]:
+        """
+        Split this iterator into n independent iterators of the same kind.
+
+        This is equivalent to calling replay n times on cache(max_memory_items), except that
+        the cache (including spilled values) is deleted as soon as all iterators are
+        exhausted or closed.
+
+        :param n: The number of iterators.
+        :param max_memory_items: The maximum number of values held in memory (see cache).
+        :return: A tuple containing the iterators.
+        """
+        cache = self.cache(max_memory_items)
+        replays = tuple(cache.replay() for _ in range(n))
+        cache._open_replays = n
+        return replays
+
+    def broadcast(
+        self: IteratorT, *sinks: Callable[[IteratorT], Any], chunk_size: int = 256
+    ) -> List[Any]:
+        """
+        Pass every value to several sinks in a single pass.
+
+        Every sink is a function that gets an iterator of the same kind as this one
+        (e.g. a FileIterator) and returns a result, e.g. lambda files: files.len() or
+        lambda files: files.t().map_lc().sum(). The sinks run in their own threads and
+        are fed chunk by chunk through bounded queues, i.e. the values aren't stored and
+        slow sinks slow down the whole pass. Sinks don't have to consume all values.
+
+        Files are passed to the sinks as copies that call stat at most once, so e.g. the
+        sizes and modification times of the files are shared between all sinks. Since the
+        sinks process the same files at roughly the same time, reading the same file in
+        several sinks is usually served from the operating system's page cache.
+
+        :param sinks: The sinks.
+        :param chunk_size: The number of values passed to the sinks at once.
+        :return: A list containing the results of the sinks (in the order of the sinks).
+            If a sink raises an exception, the exception is re-raised after all sinks
+            are done.
+        """
+        if len(sinks) == 0:
+            raise HofsException("at least one sink must be given")
+
+        consumers = [_BroadcastSink(sink, self._same_kind) for sink in sinks]
+        for consumer in consumers:
+            consumer.thread.start()
+
+        try:
+            self._feed(consumers, chunk_size)
+        finally:
+            for consumer in consumers:
+                consumer.finish()
+
+        for consumer in consumers:
+            if consumer.error is not None:
+                raise consumer.error
+        return [consumer.result for consumer in consumers]
+
+    def _feed(self, consumers: "List[_BroadcastSink]", chunk_size: int) -> None:
+        for chunk in self._chunks(chunk_size):
+            shared_chunk = self._share_chunk(list(chunk))
+            for consumer in consumers:
+                consumer.queue.put(shared_chunk)
 
     def reduce(self, fun: Callable[[Any, T], T], start: Any) -> Any:
         return reduce(fun, self, start)
 
     def len(self) -> int:
-        return self.reduce(lambda acc, val: acc + 1, 0)
+        # Let zip and deque drive the iteration, so that no Python code runs per value
+        counter = itertools.count()
+        collections.deque(zip(self, counter), maxlen=0)
+        return next(counter)
 
     def sum(self) -> int:
-        return self.reduce(lambda acc, val: acc + val, 0)
+        return sum(self, 0)  # type: ignore
 
     def min(self) -> int:
         return min(self)  # type: ignore
@@ -38,6 +522,224 @@ class FunctionalIterator(Iterator[T]):
     def max(self) -> int:
         return max(self)  # type: ignore
 
+    def aggregate(
+        self,
+        count: bool = False,
+        sum: bool = False,
+        min: bool = False,
+        max: bool = False,
+        mean: bool = False,
+        stdev: bool = False,
+        quantiles: Optional[List[float]] = None,
+        key: Optional[Callable[[T], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute several aggregates in a single pass over the values.
+
+        All aggregates use constant memory. Quantiles are estimated using the P-square
+        algorithm (they are exact for up to five values).
+
+        For example fs.Dir(".").files.aggregate(count=True, sum=True, max=True,
+        key=lambda f: int(f.size)) computes the number of files, their total size and
+        the size of the biggest file while walking the directory only once.
+
+        :param count: Whether to compute the number of values.
+        :param sum: Whether to compute the sum of the values.
+        :param min: Whether to compute the minimum of the values.
+        :param max: Whether to compute the maximum of the values.
+        :param mean: Whether to compute the mean of the values.
+        :param stdev: Whether to compute the sample standard deviation of the values.
+        :param quantiles: The quantiles to estimate (each strictly between 0 and 1).
+        :param key: If given, the aggregates are computed over key(value) instead of value.
+        :return: A dictionary containing the requested aggregates under the names of the
+            respective parameters. Quantiles are returned as a dictionary mapping every
+            quantile to its estimate. Aggregates that are undefined (like the minimum of
+            no values) are None.
+        """
+        requested = {
+            "count": count,
+            "sum": sum,
+            "min": min,
+            "max": max,
+            "mean": mean,
+            "stdev": stdev,
+        }
+        if not any(requested.values()) and quantiles is None:
+            raise HofsException("at least one aggregate must be requested")
+
+        aggregates = _Aggregates(requested, quantiles)
+        values = self if key is None else map(key, self)
+        for batch in _chunked(iter(values), _AGGREGATE_BATCH_SIZE):
+            aggregates.add_batch(batch)
+        return aggregates.result()
+
+    def distinct(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        approx: bool = False,
+        capacity: int = 1_000_000,
+        fp_rate: float = 0.01,
+    ) -> "FunctionalIterator[T]":
+        """
+        Drop values that occurred before.
+
+        By default, all distinct values (or keys) are kept in a set. If approx is True, they are
+        kept in a Bloom filter with a fixed size instead, which needs about 1.2 bytes per value
+        for the default fp_rate. Then a fraction of about fp_rate of the distinct values is
+        dropped although they didn't occur before, but no duplicate ever passes. The values
+        (or keys) must then be str, bytes, int, float, None or tuples of these.
+
+        :param key: If given, values with the same key(value) are duplicates.
+        :param approx: Whether to use a Bloom filter.
+        :param capacity: The expected number of distinct values (only if approx is True).
+        :param fp_rate: The maximum rate of wrongly dropped values for up to capacity
+            distinct values (only if approx is True).
+        :return: A functional iterator containing the first occurrence of every value.
+        """
+        if approx:
+            bloom = BloomFilter(capacity, fp_rate)
+            return self._then(
+                self._distinct_approx(key, bloom),
+                f"distinct: ~{fp_rate:g} false positives",
+                True,
+            )
+        return self._then(self._distinct(key), "distinct", True)
+
+    def _distinct(self, key: Optional[Callable[[T], Any]]) -> Iterator[T]:
+        seen = set()
+        for value in self:
+            value_key = value if key is None else key(value)
+            if value_key not in seen:
+                seen.add(value_key)
+                yield value
+
+    def _distinct_approx(
+        self, key: Optional[Callable[[T], Any]], bloom: BloomFilter
+    ) -> Iterator[T]:
+        for value in self:
+            if not bloom.add(value if key is None else key(value)):
+                yield value
+
+    def count_distinct(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        approx: bool = False,
+        precision: int = 14,
+    ) -> int:
+        """
+        Count the distinct values.
+
+        By default, all distinct values (or keys) are kept in a set. If approx is True, the
+        count is estimated using a HyperLogLog of 2 ** precision bytes instead, whose standard
+        error is about 1.04 / sqrt(2 ** precision) (0.8% by default). The values (or keys)
+        must then be str, bytes, int, float, None or tuples of these.
+
+        :param key: If given, values with the same key(value) are counted once.
+        :param approx: Whether to estimate the count.
+        :param precision: The precision of the HyperLogLog (only if approx is True).
+        :return: The (estimated) number of distinct values.
+        """
+        if approx:
+            return self._hyper_log_log(key, precision).count
+        return len(set(self if key is None else map(key, self)))
+
+    def _hyper_log_log(
+        self, key: Optional[Callable[[T], Any]], precision: int
+    ) -> HyperLogLog:
+        sketch = HyperLogLog(precision)
+        for value in self if key is None else map(key, self):
+            sketch.add(value)
+        return sketch
+
+    def sample(self, n: int, seed: Optional[int] = None) -> "FunctionalIterator[T]":
+        """
+        Draw a uniform random sample of n values (without replacement).
+
+        The values are sampled in a single pass using reservoir sampling, i.e. only the sample
+        is held in memory. For example fs.Dir(".").files.sample(100).t().map_lc() counts the
+        lines of 100 random files, while only the directory walk touches all files.
+
+        :param n: The sample size (all values are returned if there are fewer).
+        :param seed: The seed of the random number generator (None for a random seed).
+        :return: A functional iterator of the same kind as this one (e.g. a FileIterator)
+            containing the sampled values in their original order.
+        """
+        if n < 0:
+            raise HofsException(f"the sample size must not be negative, but was {n}")
+
+        def sampled() -> Iterator[T]:
+            values, _ = reservoir_sample(self, n, random.Random(seed))
+            yield from values
+
+        return self._then_same_kind(sampled(), f"sample: {n}", True)
+
+    def estimate(
+        self,
+        metric: Callable[[T], float],
+        n: int = 1000,
+        confidence: float = 0.95,
+        seed: Optional[int] = None,
+    ) -> Estimate:
+        """
+        Estimate the mean and the sum of an expensive metric from a random sample.
+
+        All values are counted, but metric is only computed for a uniform random sample of
+        n of them. For example fs.Dir(".").files.estimate(lambda f: f.t().line_count).total
+        estimates the number of lines of all files while reading only 1000 of them.
+
+        :param metric: The function computing the metric of a value.
+        :param n: The sample size.
+        :param confidence: The confidence level of the intervals (strictly between 0 and 1).
+        :param seed: The seed of the random number generator (None for a random seed).
+        :return: The estimate, which contains the mean (and the sum as total) along with
+            their confidence intervals.
+        """
+        if not 0 < confidence < 1:
+            raise HofsException(
+                f"the confidence must be strictly between 0 and 1, but was {confidence}"
+            )
+
+        values, population = reservoir_sample(self, n, random.Random(seed))
+        return estimate_from_sample(
+            [float(metric(value)) for value in values], population, confidence
+        )
+
+    def group_by(
+        self,
+        key: Callable[[T], Any],
+        name: str = "key",
+        max_groups: Optional[int] = None,
+    ) -> GroupBy:
+        """
+        Group the values by a key, call agg on the result to aggregate the groups.
+
+        :param key: The function computing the group key of a value.
+        :param name: The name of the key column of the aggregated table.
+        :param max_groups: The maximum number of groups held in memory while aggregating.
+            If there are more groups, partial aggregates are spilled to temporary files.
+            None means no limit.
+        :return: The grouped values.
+        """
+        return GroupBy(self, key, name, max_groups)
+
+    def count_by(
+        self,
+        key: Callable[[T], Any],
+        name: str = "key",
+        max_groups: Optional[int] = None,
+    ) -> Table:
+        """
+        Count the values per key.
+
+        This is equivalent to group_by(key, name, max_groups).agg(count="count").
+
+        :param key: The function computing the group key of a value.
+        :param name: The name of the key column.
+        :param max_groups: The maximum number of groups held in memory (see group_by).
+        :return: A table with the columns name and "count", sorted by key.
+        """
+        return self.group_by(key, name, max_groups).agg(count="count")
+
     def sort_asc(self) -> List[T]:
         return sorted(self)  # type: ignore
 
@@ -46,9 +748,401 @@ class FunctionalIterator(Iterator[T]):
     def sort_desc(self) -> List[T]:
         return sorted(self, reverse=True)  # type: ignore
 
-    def top_n(self, n: int) -> List[T]:
-        return heapq.nlargest(n, self)
+    def sort_by(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        reverse: bool = False,
+        max_memory_items: Optional[int] = None,
+    ) -> "FunctionalIterator[T]":
+        """
+        Sort the values by a key.
+
+        The key of every value is computed exactly once, i.e. expensive keys (like file sizes,
+        which require a stat call) aren't recomputed on every comparison. The sort is stable.
+
+        If max_memory_items is given, at most that many values are sorted in memory at once.
+        The sorted runs are spilled to temporary files and merged lazily (external merge sort),
+        which requires the values and keys to be picklable.
+
+        :param key: The function computing the key of a value (None to sort the values
+            themselves).
+        :param reverse: Whether to sort in descending order.
+        :param max_memory_items: The maximum number of values held in memory (None for no limit).
+        :return: A functional iterator containing the sorted values.
+        """
+        if max_memory_items is not None and max_memory_items < 1:
+            raise HofsException(
+                f"max_memory_items must be positive, but was {max_memory_items}"
+            )
+
+        stage = f"sort_by: {'value' if key is None else fun_name(key)}"
+        if max_memory_items is None:
+            return self._then(self._sort(key, reverse), stage)
+
+        # The spilled runs belong to the sorted iterator: they are deleted once it is
+        # exhausted or closed (e.g. by first), and at the latest when it is garbage collected
+        spill = SpillFiles()
+        result = self._then(
+            self._external_sort(key or _identity, reverse, max_memory_items, spill),
+            stage,
+        )
+        weakref.finalize(result, spill.close)
+        return result
+
+    def _sort(self, key: Optional[Callable[[T], Any]], reverse: bool) -> Iterator[T]:
+        # Sort lazily, i.e. only once the first value is requested
+        yield from sorted(self, key=key, reverse=reverse)  # type: ignore
+
+    def _external_sort(
+        self,
+        key: Callable[[T], Any],
+        reverse: bool,
+        max_memory_items: int,
+        spill: SpillFiles,
+    ) -> Iterator[T]:
+        with spill:
+            for chunk in self._chunks(max_memory_items):
+                spill.write(
+                    sorted(
+                        ((key(value), value) for value in chunk),
+                        key=operator.itemgetter(0),
+                        reverse=reverse,
+                    )
+                )
+            for _, value in spill.merge(key=operator.itemgetter(0), reverse=reverse):
+                yield value
+
+    def top_n(self, n: int, key: Optional[Callable[[T], Any]] = None) -> List[T]:
+        """
+        Get the n largest values.
+
+        :param n: The number of values.
+        :param key: If given, the values are compared by key(value), which is computed
+            exactly once per value.
+        :return: A list containing the n largest values in descending order.
+        """
+        return heapq.nlargest(n, self, key=key)  # type: ignore
+
+    def to_csv(
+        self,
+        fp: TextIO,
+        cols: List[str],
+        row: Optional[Callable[[T], Sequence[Any]]] = None,
+    ) -> int:
+        """
+        Write the values as CSV rows without building a table first.
+
+        For example fs.Dir(".").files.to_csv(f, ["path", "bytes"], lambda f: (f.path,
+        int(f.size))) writes one row per file while walking the directory.
+
+        :param fp: The text stream. Files should be opened with newline="" (see csv).
+        :param cols: The column names (written as the header row).
+        :param row: The function computing the row of a value. If None, the values must be
+            rows (e.g. lists or tuples) already.
+        :return: The number of rows written (not including the header row).
+        """
+        writer = csv.writer(fp)
+        writer.writerow(cols)
+        n_rows = 0
+        for value in self:
+            writer.writerow(value if row is None else row(value))  # type: ignore
+            n_rows += 1
+        return n_rows
 
     def for_each(self, fun: Callable[[T], None]) -> None:
         for val in self:
             fun(val)
+
+    checkpoint: Any
+    distributed: Any
+
+
+class _BatchIterator(FunctionalIterator[T]):
+    def __init__(
+        self,
+        parent: FunctionalIterator,
+        chunk_fun: Callable[[Sequence[Any]], Iterable[T]],
+        size: int,
+        stage: str,
+    ) -> None:
+        self._chunk_fun = chunk_fun
+        self._size = size
+        super().__init__(itertools.chain.from_iterable(self._batch_chunks()))
+        self._parent = parent
+        self._stage = stage
+
+    def _batch_chunks(self) -> Iterator[Iterable[T]]:
+        assert self._parent is not None
+        # The output of another batch stage may be any iterable (e.g. a generator) of any
+        # length, so it is turned into lists of the size of this stage
+        chunks: Iterator[Sequence[Any]]
+        if isinstance(self._parent, _BatchIterator):
+            chunks = _chunked(
+                itertools.chain.from_iterable(self._parent._batch_chunks()), self._size
+            )
+        else:
+            chunks = self._parent._chunks(self._size)
+
+        for chunk in chunks:
+            yield self._chunk_fun(chunk)  # type: ignore
+
+
+class _BroadcastSink:
+    # A sink of FunctionalIterator.broadcast, which runs in its own thread and is fed
+    # chunk by chunk through a bounded queue (None marks the end of the values)
+    def __init__(
+        self,
+        sink: Callable[[Any], Any],
+        same_kind: Callable[[Iterable[Any]], FunctionalIterator],
+    ) -> None:
+        self.sink = sink
+        self.same_kind = same_kind
+        self.queue: queue.Queue = queue.Queue(maxsize=_BROADCAST_QUEUE_SIZE)
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self._done = False
+
+    def _values(self) -> Iterator[Any]:
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                self._done = True
+                return
+            yield from chunk
+
+    def _run(self) -> None:
+        try:
+            self.result = self.sink(self.same_kind(self._values()))
+        except BaseException as e:
+            self.error = e
+        # Sinks might stop early, drain the queue so that the other sinks aren't blocked
+        while not self._done:
+            self._done = self.queue.get() is None
+
+    def finish(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+
+class _Aggregates:
+    # The running state of FunctionalIterator.aggregate. Only the requested aggregates are
+    # updated, so that e.g. counting or taking the minimum works for values that can't be
+    # added or converted to float
+    def __init__(
+        self, requested: Dict[str, bool], quantiles: Optional[List[float]]
+    ) -> None:
+        self.requested = requested
+        self.n = 0
+        self.total: Any = 0
+        self.low: Any = None
+        self.high: Any = None
+        # Welford's algorithm for the mean and the variance
+        self.running_mean, self.m2 = 0.0, 0.0
+        self.sketches = None if quantiles is None else list(map(P2Quantile, quantiles))
+
+        # Sum, minimum and maximum are computed per batch by the builtins, only the
+        # streaming algorithms need to look at every value in Python
+        self._updates: List[Callable[[List[Any]], None]] = []
+        if requested["sum"]:
+            self._updates.append(self._add_sum)
+        if requested["min"]:
+            self._updates.append(self._add_min)
+        if requested["max"]:
+            self._updates.append(self._add_max)
+        if requested["mean"] or requested["stdev"]:
+            self._updates.append(self._add_moments)
+        if self.sketches is not None:
+            self._updates.append(self._add_quantiles)
+
+    def _add_sum(self, values: List[Any]) -> None:
+        self.total = sum(values, self.total)
+
+    def _add_min(self, values: List[Any]) -> None:
+        low = min(values)
+        if self.low is None or low < self.low:
+            self.low = low
+
+    def _add_max(self, values: List[Any]) -> None:
+        high = max(values)
+        if self.high is None or self.high < high:
+            self.high = high
+
+    def _add_moments(self, values: List[Any]) -> None:
+        # self.n already includes the batch
+        n = self.n - len(values)
+        running_mean, m2 = self.running_mean, self.m2
+        for value in map(float, values):
+            n += 1
+            delta = value - running_mean
+            running_mean += delta / n
+            m2 += delta * (value - running_mean)
+        self.running_mean, self.m2 = running_mean, m2
+
+    def _add_quantiles(self, values: List[Any]) -> None:
+        floats = list(map(float, values))
+        for sketch in self.sketches:  # type: ignore
+            for value in floats:
+                sketch.add(value)
+
+    def add_batch(self, values: List[Any]) -> None:
+        self.n += len(values)
+        for update in self._updates:
+            update(values)
+
+    def result(self) -> Dict[str, Any]:
+        n = self.n
+        values = {
+            "count": n,
+            "sum": self.total,
+            "min": self.low,
+            "max": self.high,
+            "mean": self.running_mean if n > 0 else None,
+            "stdev": math.sqrt(self.m2 / (n - 1)) if n > 1 else None,
+        }
+        result = {name: values[name] for name, flag in self.requested.items() if flag}
+        if self.sketches is not None:
+            result["quantiles"] = {sketch.q: sketch.value for sketch in self.sketches}
+        return result
+
+
+class Cache(Generic[T]):
+    def __init__(
+        self, source: FunctionalIterator[T], max_memory_items: Optional[int] = None
+    ) -> None:
+        """
+        A lazily filled cache of the values of a functional iterator (see
+        FunctionalIterator.cache).
+
+        :param source: The functional iterator.
+        :param max_memory_items: The maximum number of values held in memory.
+        """
+        if max_memory_items is not None and max_memory_items < 1:
+            raise HofsException(
+                f"max_memory_items must be positive, but was {max_memory_items}"
+            )
+
+        self.source = source
+        self.max_memory_items = max_memory_items
+
+        # The values are stored in spilled runs of max_memory_items values each,
+        # followed by the values in memory
+        self._spill = SpillFiles()
+        self._n_spilled = 0
+        self._values: List[T] = []
+        self._exhausted = False
+        self._closed = False
+        # The spilled values are deleted at the latest when the cache is garbage collected
+        weakref.finalize(self, self._spill.close)
+
+        # The number of replays that aren't done yet if the cache is closed once they are
+        # (see FunctionalIterator.tee), None if the cache is closed explicitly
+        self._open_replays: Optional[int] = None
+
+    @property
+    def n_cached(self) -> int:
+        """
+        The number of values read from the source so far.
+        """
+        return self._n_spilled + len(self._values)
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+        try:
+            value = next(self.source)
+        except StopIteration:
+            self._exhausted = True
+            return False
+
+        self._values.append(value)
+        if (
+            self.max_memory_items is not None
+            and len(self._values) >= self.max_memory_items
+        ):
+            self._spill.write(self._values)
+            self._n_spilled += len(self._values)
+            self._values = []
+        return True
+
+    def replay(self) -> FunctionalIterator[T]:
+        """
+        Iterate over the values from the start.
+
+        Values that were requested by another replay before are taken from the cache,
+        all other values are read from the source (and cached).
+
+        :return: An iterator of the same kind as the source (e.g. a FileIterator if the
+            source is a FileIterator) containing the values.
+        """
+        return self.source._same_kind(_CacheReader(self))
+
+    def close(self) -> None:
+        """
+        Delete the cached values.
+
+        Replays that aren't done yet raise an exception when the next value is requested
+        after closing.
+        """
+        self._closed = True
+        self._spill.close()
+        self._values = []
+
+    def _replay_done(self) -> None:
+        if self._open_replays is None:
+            return
+        self._open_replays -= 1
+        if self._open_replays == 0:
+            self.close()
+
+    def __enter__(self) -> "Cache[T]":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class _CacheReader(Iterator[T]):
+    def __init__(self, cache: Cache[T]) -> None:
+        self.cache = cache
+        self.pos = 0
+        self._run: Optional[Iterator[T]] = None
+        self._done = False
+
+    def close(self) -> None:
+        self._run = None
+        if not self._done:
+            self._done = True
+            self.cache._replay_done()
+
+    def __next__(self) -> T:
+        cache = self.cache
+        if cache._closed:
+            if self._done:
+                raise StopIteration
+            raise HofsException("the cache was closed")
+        while True:
+            if self.pos < cache._n_spilled:
+                assert cache.max_memory_items is not None
+                if self._run is None:
+                    run_idx, offset = divmod(self.pos, cache.max_memory_items)
+                    self._run = itertools.islice(
+                        cache._spill.read(run_idx), offset, None
+                    )
+                value = next(self._run)
+                self.pos += 1
+                if self.pos % cache.max_memory_items == 0:
+                    self._run = None
+                return value
+
+            idx = self.pos - cache._n_spilled
+            if idx < len(cache._values):
+                self.pos += 1
+                return cache._values[idx]
+            if not cache._fill():
+                self.close()
+                raise StopIteration
+
+    def describe(self) -> str:
+        lines = self.cache.source._explain_lines()
+        return "cache of: " + " -> ".join(line.strip() for line in lines)
@@ -0,0 +1,181 @@
+import functools
+import heapq
+import itertools
+import operator
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from hofs.common.spill import SpillFiles
+from hofs.common.table import Table
+from hofs.exceptions.exceptions import HofsException
+
+
+class _Reducer(NamedTuple):
+    # Create the partial aggregate from a value, add a value to a partial aggregate,
+    # merge two partial aggregates and compute the result from a partial aggregate
+    init: Callable[[Any], Any]
+    add: Callable[[Any, Any], Any]
+    merge: Callable[[Any, Any], Any]
+    result: Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_REDUCERS = {
+    "count": _Reducer(lambda v: 1, lambda s, v: s + 1, operator.add, _identity),
+    "sum": _Reducer(_identity, operator.add, operator.add, _identity),
+    "min": _Reducer(_identity, min, min, _identity),
+    "max": _Reducer(_identity, max, max, _identity),
+    "mean": _Reducer(
+        lambda v: (v, 1),
+        lambda s, v: (s[0] + v, s[1] + 1),
+        lambda s1, s2: (s1[0] + s2[0], s1[1] + s2[1]),
+        lambda s: float(s[0]) / s[1],
+    ),
+}
+
+Aggregate = Union[str, Tuple[str, Optional[Callable[[Any], Any]]]]
+
+
+def _group_key(group: Tuple[Any, List[Any]]) -> Any:
+    return group[0]
+
+
+def merge_groups(
+    runs: Sequence[Iterable[Tuple[Any, List[Any]]]],
+    specs: List[Tuple[_Reducer, Optional[Callable[[Any], Any]]]],
+) -> Iterator[Tuple[Any, List[Any]]]:
+    """
+    Merge runs of (key, partial aggregates) pairs, each of which is sorted by key.
+
+    :param runs: The runs.
+    :param specs: The reducers (along with their value functions) of the partial aggregates.
+    :return: An iterator containing the merged (key, partial aggregates) pairs sorted by key.
+    """
+    # The partial aggregates of a group are adjacent in the merged runs
+    for group_key, partials in itertools.groupby(
+        heapq.merge(*runs, key=_group_key), key=_group_key
+    ):
+        yield group_key, functools.reduce(
+            lambda states, other: [
+                reducer.merge(state, other_state)
+                for (reducer, _), state, other_state in zip(specs, states, other)
+            ],
+            (states for _, states in partials),
+        )
+
+
+class GroupBy:
+    def __init__(
+        self,
+        iterable: Iterable[Any],
+        key: Callable[[Any], Any],
+        name: str = "key",
+        max_groups: Optional[int] = None,
+    ) -> None:
+        """
+        The values of an iterable grouped by a key (see FunctionalIterator.group_by).
+
+        :param iterable: The values.
+        :param key: The function computing the group key of a value.
+        :param name: The name of the key column of the resulting table.
+        :param max_groups: The maximum number of groups held in memory (None for no limit).
+        """
+        if max_groups is not None and max_groups < 1:
+            raise HofsException(f"max_groups must be positive, but was {max_groups}")
+
+        self.iterable = iterable
+        self.key = key
+        self.name = name
+        self.max_groups = max_groups
+
+    def agg(self, **aggregates: Aggregate) -> Table:
+        """
+        Aggregate every group in a single pass over the values (hash aggregation).
+
+        Every keyword argument is a column of the resulting table. Its value is either the
+        name of a reducer ("count", "sum", "min", "max" or "mean"), which is applied to the
+        values themselves, or a (reducer, value function) tuple, in which case the reducer
+        is applied to value_function(value).
+
+        For example group_by(lambda f: f.extension).agg(files="count",
+        lines=("sum", lambda f: f.line_count)) counts the files and lines per extension.
+
+        If there are more than max_groups groups, the partial aggregates are spilled to
+        temporary files and merged afterwards (in several passes if there are many files),
+        so the memory usage and the number of open files stay bounded.
+
+        :param aggregates: The aggregates.
+        :return: A table containing the key column followed by one column per aggregate,
+            with one row per group, sorted by key (so keys must be comparable).
+        """
+        if len(aggregates) == 0:
+            raise HofsException("at least one aggregate must be given")
+
+        specs: List[Tuple[_Reducer, Optional[Callable[[Any], Any]]]] = []
+        for col_name, aggregate in aggregates.items():
+            reducer_name, fun = (
+                (aggregate, None) if isinstance(aggregate, str) else aggregate
+            )
+            if reducer_name not in _REDUCERS:
+                raise HofsException(
+                    f"unknown reducer {reducer_name!r} for {col_name}, must be one of {list(_REDUCERS)}"
+                )
+            specs.append((_REDUCERS[reducer_name], fun))
+
+        table = Table([self.name] + list(aggregates.keys()))
+        with SpillFiles() as spill:
+            for group_key, states in self._groups(specs, spill):
+                table.add_row(
+                    [group_key]
+                    + [
+                        reducer.result(state)
+                        for (reducer, _), state in zip(specs, states)
+                    ]
+                )
+        return table
+
+    def _groups(
+        self,
+        specs: List[Tuple[_Reducer, Optional[Callable[[Any], Any]]]],
+        spill: SpillFiles,
+    ) -> Iterator[Tuple[Any, List[Any]]]:
+        groups: Dict[Any, List[Any]] = {}
+        key = self.key
+        for value in self.iterable:
+            group_key = key(value)
+            states = groups.get(group_key)
+            if states is None:
+                groups[group_key] = [
+                    reducer.init(value if fun is None else fun(value))
+                    for reducer, fun in specs
+                ]
+                if self.max_groups is not None and len(groups) >= self.max_groups:
+                    spill.write(sorted(groups.items(), key=_group_key))
+                    groups = {}
+            else:
+                for idx, (reducer, fun) in enumerate(specs):
+                    states[idx] = reducer.add(
+                        states[idx], value if fun is None else fun(value)
+                    )
+
+        if len(spill.paths) == 0:
+            yield from sorted(groups.items(), key=_group_key)
+            return
+
+        spill.write(sorted(groups.items(), key=_group_key))
+        spill.compact(lambda runs: merge_groups(runs, specs))
+        yield from merge_groups(spill.runs(), specs)
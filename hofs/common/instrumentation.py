@@ -0,0 +1,156 @@
+import io
+import time
+from typing import Any, BinaryIO, Callable, List, TypeVar
+
+# The I/O events reported to the hooks (along with an amount)
+STAT = "stat"
+OPEN = "open"
+LIST_DIR = "list_dir"
+READ_BYTES = "read_bytes"
+
+EVENTS = [STAT, OPEN, LIST_DIR, READ_BYTES]
+
+Hook = Callable[[str, int], None]
+LatencyHook = Callable[[float], None]
+
+T = TypeVar("T")
+
+# The installed hooks. Instrumented code checks whether this list is empty before
+# reporting an event, so instrumentation costs next to nothing while no hook is installed
+hooks: List[Hook] = []
+
+# The installed latency hooks. Reads from files are only timed while this list isn't empty
+latency_hooks: List[LatencyHook] = []
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Install a global instrumentation hook.
+
+    The hook is called with (event, amount) whenever hofs performs I/O, where event is one of
+    "stat" (a stat call), "open" (a file was opened), "list_dir" (a directory was listed)
+    and "read_bytes" (amount bytes were read from a file).
+
+    :param hook: The hook.
+    """
+    hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Remove a global instrumentation hook.
+
+    :param hook: The hook (it must have been installed using add_hook).
+    """
+    hooks.remove(hook)
+
+
+def emit(event: str, amount: int = 1) -> None:
+    """
+    Report an event to all installed hooks.
+
+    :param event: The event.
+    :param amount: The amount (e.g. the number of bytes for "read_bytes").
+    """
+    for hook in list(hooks):
+        hook(event, amount)
+
+
+def add_latency_hook(hook: LatencyHook) -> None:
+    """
+    Install a global latency hook.
+
+    The hook is called with the duration (in seconds) of every read from a file opened by hofs
+    while at least one hook (see add_hook) is installed.
+
+    :param hook: The latency hook.
+    """
+    latency_hooks.append(hook)
+
+
+def remove_latency_hook(hook: LatencyHook) -> None:
+    """
+    Remove a global latency hook.
+
+    :param hook: The latency hook (it must have been installed using add_latency_hook).
+    """
+    latency_hooks.remove(hook)
+
+
+def instrument(obj: Any, cls: type, name: str, value: Any) -> type:
+    """
+    Instrument a single object by swapping its class for a subclass (e.g. one whose __next__
+    reports somewhere) and attaching state for it.
+
+    Swapping the class (instead of checking a flag in the instrumented method) means that
+    objects which aren't instrumented don't pay anything.
+
+    :param obj: The object.
+    :param cls: The instrumented class (a subclass of the class of obj).
+    :param name: The name of the attribute the state is attached as.
+    :param value: The state.
+    :raises TypeError: If the class of obj can't be swapped (e.g. for built-in iterators).
+    :return: The original class of obj (pass it to uninstrument).
+    """
+    original = type(obj)
+    obj.__class__ = cls
+    setattr(obj, name, value)
+    return original
+
+
+def uninstrument(obj: Any, original: type, name: str) -> None:
+    """
+    Undo instrument.
+
+    :param obj: The instrumented object.
+    :param original: The original class of obj (as returned by instrument).
+    :param name: The name of the attribute the state was attached as.
+    """
+    obj.__class__ = original
+    delattr(obj, name)
+
+
+# The size of the chunks whole files are read in, so that every chunk is reported (and
+# e.g. throttled) before the next one is read
+_READ_CHUNK_SIZE = 1 << 20
+
+
+def _timed(read: Callable[[], T]) -> T:
+    if not latency_hooks:
+        return read()
+
+    start = time.perf_counter()
+    result = read()
+    duration = time.perf_counter() - start
+    for hook in list(latency_hooks):
+        hook(duration)
+    return result
+
+
+class _CountingFileIO(io.FileIO):
+    def readinto(self, buffer: bytearray) -> int:  # type: ignore
+        n = _timed(lambda: super(_CountingFileIO, self).readinto(buffer))
+        if n:
+            emit(READ_BYTES, n)
+        return n  # type: ignore
+
+    def readall(self) -> bytes:
+        data = bytearray()
+        buffer = bytearray(_READ_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            n = self.readinto(buffer)
+            if not n:
+                return bytes(data)
+            data += view[:n]
+
+
+def open_counted(path: str) -> BinaryIO:
+    """
+    Open a file for (binary) reading, reporting the opening and all bytes read to the hooks.
+
+    :param path: The path of the file.
+    :return: The binary stream.
+    """
+    emit(OPEN)
+    return io.BufferedReader(_CountingFileIO(path, "rb"))  # type: ignore
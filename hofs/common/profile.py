@@ -0,0 +1,189 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from hofs.common import instrumentation
+from hofs.common.table import Table
+
+_PROFILED_CLASSES: Dict[type, type] = {}
+
+
+def _profiled_class(cls: type) -> type:
+    # A subclass of cls whose __next__ reports to the profile of the iterator (see
+    # instrumentation.instrument)
+    profiled = _PROFILED_CLASSES.get(cls)
+    if profiled is not None:
+        return profiled
+
+    def __next__(self: Any) -> Any:
+        profile, stage = self._profile
+        profile._enter(stage)
+        try:
+            value = cls.__next__(self)  # type: ignore
+        finally:
+            profile._exit(stage)
+        stage.items_out += 1
+        return value
+
+    profiled = type(cls.__name__, (cls,), {"__next__": __next__})
+    profiled.__qualname__ = cls.__qualname__
+    profiled.__module__ = cls.__module__
+    _PROFILED_CLASSES[cls] = profiled
+    return profiled
+
+
+class StageProfile:
+    def __init__(self, name: str) -> None:
+        """
+        The measurements of one stage of a profiled iterator chain.
+
+        All times and I/O events are exclusive, i.e. they don't include the time spent in
+        (and the I/O performed by) the stages this stage reads from.
+
+        :param name: The name of the stage.
+        """
+        self.name = name
+        self.items_in: Optional[int] = None
+        self.items_out = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.events = {event: 0 for event in instrumentation.EVENTS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the measurements as a dictionary.
+
+        :return: A dictionary with the keys "stage", "items_in", "items_out", "wall_time",
+            "cpu_time" and one key per I/O event (see instrumentation.add_hook).
+        """
+        return {
+            "stage": self.name,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            **self.events,
+        }
+
+
+class Profile:
+    def __init__(self, iterators: List[Tuple[Any, str]]) -> None:
+        """
+        A profile of an iterator chain (see FunctionalIterator.profile).
+
+        :param iterators: The iterators of the chain along with the names of their stages,
+            starting with the source. Built-in iterators are skipped.
+        """
+        self.stages: List[StageProfile] = []
+        self._active: List[StageProfile] = []
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+        self._restore: List[Tuple[Any, type]] = []
+        for iterator, name in iterators:
+            stage = StageProfile(name)
+            try:
+                cls = instrumentation.instrument(
+                    iterator, _profiled_class(type(iterator)), "_profile", (self, stage)
+                )
+            except TypeError:
+                # Built-in iterators (like list iterators) can't be profiled separately,
+                # the time spent in them counts towards the stage reading from them
+                continue
+
+            self.stages.append(stage)
+            self._restore.append((iterator, cls))
+
+        instrumentation.add_hook(self._on_event)
+
+    def _pause(self, now_wall: float, now_cpu: float) -> None:
+        if len(self._active) != 0:
+            stage = self._active[-1]
+            stage.wall_time += now_wall - self._wall_start
+            stage.cpu_time += now_cpu - self._cpu_start
+
+    def _enter(self, stage: StageProfile) -> None:
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        self._pause(now_wall, now_cpu)
+        self._active.append(stage)
+        self._wall_start, self._cpu_start = now_wall, now_cpu
+
+    def _exit(self, stage: StageProfile) -> None:
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        self._pause(now_wall, now_cpu)
+        self._active.pop()
+        self._wall_start, self._cpu_start = now_wall, now_cpu
+
+    def _on_event(self, event: str, amount: int) -> None:
+        if len(self._active) != 0:
+            self._active[-1].events[event] += amount
+
+    def stop(self) -> None:
+        """
+        Stop profiling (the measurements are kept).
+
+        The profiled iterators can still be used afterwards, they just aren't measured anymore.
+        """
+        if len(self._restore) == 0:
+            return
+        for iterator, cls in self._restore:
+            instrumentation.uninstrument(iterator, cls, "_profile")
+        self._restore = []
+        instrumentation.remove_hook(self._on_event)
+
+    def _stage_dicts(self) -> List[Dict[str, Any]]:
+        dicts = []
+        prev_stages: List[Optional[StageProfile]] = [None]
+        prev_stages.extend(self.stages)
+        for prev_stage, stage in zip(prev_stages, self.stages):
+            stage.items_in = prev_stage.items_out if prev_stage is not None else None
+            dicts.append(stage.to_dict())
+        return dicts
+
+    def table(self) -> Table:
+        """
+        Get the measurements as a table with one row per stage (see StageProfile.to_dict).
+
+        :return: The table.
+        """
+        dicts = self._stage_dicts()
+        table = Table(list(dicts[0].keys()))
+        for row in dicts:
+            table.add_row(row)
+        return table
+
+    def to_json(self) -> str:
+        """
+        Get the measurements as JSON.
+
+        :return: A JSON array containing one object per stage (see StageProfile.to_dict).
+        """
+        return json.dumps(self._stage_dicts())
+
+    def report(self) -> str:
+        """
+        Get a human-readable report of the measurements.
+
+        :return: The report, one line per stage (times are in milliseconds).
+        """
+        table = Table(
+            ["stage", "in", "out", "wall ms", "cpu ms"] + instrumentation.EVENTS
+        )
+        for row in self._stage_dicts():
+            table.add_row(
+                [
+                    row["stage"],
+                    "-" if row["items_in"] is None else row["items_in"],
+                    row["items_out"],
+                    f"{row['wall_time'] * 1000:.1f}",
+                    f"{row['cpu_time'] * 1000:.1f}",
+                ]
+                + [row[event] for event in instrumentation.EVENTS]
+            )
+        return repr(table)
+
+    def __enter__(self) -> "Profile":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
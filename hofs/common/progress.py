@@ -0,0 +1,93 @@
+import time
+from typing import Any, Callable, Iterator, NamedTuple, Optional, TypeVar
+
+from hofs.common import instrumentation
+
+T = TypeVar("T")
+
+
+class Progress(NamedTuple):
+    # The number of values that passed the progress stage so far
+    items: int
+    # The number of directory entries the walk feeding the chain has visited and the number
+    # of directories it still has to list (None if the chain isn't fed by a walk)
+    entries_visited: Optional[int]
+    dirs_pending: Optional[int]
+    # The number of bytes read from files (by all of hofs) since the progress stage started
+    bytes_read: int
+    # The number of seconds since the progress stage started
+    elapsed: float
+    items_per_second: float
+    # The expected total number of values and the estimated number of seconds until all of
+    # them have passed (None if no total was given)
+    total: Optional[int]
+    eta: Optional[float]
+    # Whether all values have passed
+    done: bool
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+def track_progress(
+    values: Iterator[T],
+    source: Any,
+    callback: ProgressCallback,
+    interval: float,
+    total: Optional[int],
+) -> Iterator[T]:
+    """
+    Pass values through, reporting the progress at most every interval seconds.
+
+    The progress is also reported once all values have passed.
+
+    :param values: The values.
+    :param source: The source of the chain (if it is a directory walk, its state is reported).
+    :param callback: The function called with the progress.
+    :param interval: The minimum number of seconds between two reports.
+    :param total: The expected total number of values (used for estimating the ETA).
+    :return: An iterator containing the values.
+    """
+    items, bytes_read = 0, 0
+
+    def on_event(event: str, amount: int) -> None:
+        nonlocal bytes_read
+        if event == instrumentation.READ_BYTES:
+            bytes_read += amount
+
+    def report(now: float, done: bool) -> None:
+        elapsed = now - start
+        rate = items / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total is not None and rate > 0:
+            eta = max(total - items, 0) / rate
+
+        pending_dirs = getattr(source, "pending_dirs", None)
+        callback(
+            Progress(
+                items=items,
+                entries_visited=getattr(source, "entries_visited", None),
+                dirs_pending=len(pending_dirs) if pending_dirs is not None else None,
+                bytes_read=bytes_read,
+                elapsed=elapsed,
+                items_per_second=rate,
+                total=total,
+                eta=eta,
+                done=done,
+            )
+        )
+
+    start = time.monotonic()
+    next_report = start + interval
+    instrumentation.add_hook(on_event)
+    try:
+        for value in values:
+            items += 1
+            now = time.monotonic()
+            if now >= next_report:
+                report(now, False)
+                next_report = now + interval
+            yield value
+        report(time.monotonic(), True)
+    finally:
+        instrumentation.remove_hook(on_event)
@@ -0,0 +1,126 @@
+import collections
+import itertools
+import math
+import random
+import statistics
+import sys
+from typing import Iterable, List, NamedTuple, Tuple, TypeVar
+
+from hofs.exceptions.exceptions import HofsException
+
+T = TypeVar("T")
+
+
+def _random(rng: random.Random) -> float:
+    # A random number in (0, 1), so that its logarithm is defined and negative
+    return max(rng.random(), sys.float_info.min)
+
+
+def reservoir_sample(
+    values: Iterable[T], n: int, rng: random.Random
+) -> Tuple[List[T], int]:
+    """
+    Draw a uniform random sample of n values in a single pass (without replacement).
+
+    This uses Algorithm L (Li), which draws how many values to skip instead of drawing a
+    random number per value. The skipped values are passed over without running any Python
+    code, so sampling costs little more than iterating over the values.
+
+    :param values: The values.
+    :param n: The sample size.
+    :param rng: The random number generator.
+    :return: The sample (in the order of the values) and the total number of values.
+    """
+    if n < 0:
+        raise HofsException(f"the sample size must not be negative, but was {n}")
+
+    # Pair every value with its index. The counter is only advanced for existing values,
+    # so it ends up at the number of values
+    counter = itertools.count()
+    it = zip(values, counter)
+    reservoir = list(itertools.islice(it, n))
+    if n == 0:
+        collections.deque(it, maxlen=0)
+    elif len(reservoir) == n:
+        w = math.exp(math.log(_random(rng)) / n)
+        while True:
+            skip = math.floor(min(math.log(_random(rng)) / math.log1p(-w), sys.maxsize))
+            pair = next(itertools.islice(it, skip, None), None)
+            if pair is None:
+                break
+            reservoir[rng.randrange(n)] = pair
+            w *= math.exp(math.log(_random(rng)) / n)
+
+    reservoir.sort(key=lambda pair: pair[1])
+    return [value for value, _ in reservoir], next(counter)
+
+
+class Estimate(NamedTuple):
+    # The estimated mean of the metric over all values and the half-width of its confidence
+    # interval (inf if it can't be estimated because at most one value was sampled). The
+    # mean is 0 if no values were sampled
+    mean: float
+    error: float
+    # The number of sampled values, the total number of values and the confidence level
+    sample_size: int
+    population: int
+    confidence: float
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        """
+        The confidence interval of the mean.
+        """
+        return self.mean - self.error, self.mean + self.error
+
+    @property
+    def total(self) -> float:
+        """
+        The estimated sum of the metric over all values.
+        """
+        return self.mean * self.population
+
+    @property
+    def total_interval(self) -> Tuple[float, float]:
+        """
+        The confidence interval of the sum.
+        """
+        low, high = self.interval
+        return low * self.population, high * self.population
+
+
+def estimate_from_sample(
+    metrics: List[float], population: int, confidence: float
+) -> Estimate:
+    """
+    Estimate the mean of a metric from a uniform random sample.
+
+    The confidence interval uses the normal approximation, including the finite population
+    correction (the interval is empty if all values were sampled).
+
+    :param metrics: The metric of the sampled values.
+    :param population: The total number of values.
+    :param confidence: The confidence level (strictly between 0 and 1).
+    :return: The estimate.
+    """
+    if not 0 < confidence < 1:
+        raise HofsException(
+            f"the confidence must be strictly between 0 and 1, but was {confidence}"
+        )
+
+    k = len(metrics)
+    if k == 0:
+        # Without any sampled values, nothing is known about the population (if there is one)
+        error = 0.0 if population == 0 else math.inf
+        return Estimate(0.0, error, 0, population, confidence)
+
+    mean = statistics.fmean(metrics)
+    if k == population:
+        error = 0.0
+    elif k == 1:
+        error = math.inf
+    else:
+        z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        correction = math.sqrt((population - k) / (population - 1))
+        error = z * statistics.stdev(metrics) / math.sqrt(k) * correction
+    return Estimate(mean, error, k, population, confidence)
@@ -0,0 +1,272 @@
+import hashlib
+import math
+from typing import Any, List, Optional
+
+from hofs.exceptions.exceptions import HofsException
+
+
+def _encode(value: Any) -> bytes:
+    # A canonical encoding, i.e. values that are equal (like 1, 1.0 and True) have the
+    # same encoding, and it is the same in every process (unlike repr, which may include
+    # the id of an object). All values but strings start with a type tag following a
+    # 0xff byte, which never occurs in UTF-8, so they can't collide with strings
+    if isinstance(value, str):
+        return value.encode("utf-8", "surrogatepass")
+    if isinstance(value, bytes):
+        return b"\xffb" + value
+    if isinstance(value, float) and not value.is_integer():
+        return b"\xfff" + value.hex().encode()
+    if isinstance(value, (int, float)):
+        return b"\xffi" + str(int(value)).encode()
+    if isinstance(value, tuple):
+        return b"\xfft" + b"".join(
+            len(item).to_bytes(8, "little") + item for item in map(_encode, value)
+        )
+    if value is None:
+        return b"\xffn"
+    raise HofsException(
+        f"sketches only support str, bytes, int, float, None and tuples of these, "
+        f"but got a {type(value).__name__} (use a key function to map it to one of these)"
+    )
+
+
+def _hash128(value: Any) -> int:
+    # A hash that (unlike hash) is the same in every process, so that sketches built by
+    # different processes can be merged
+    data = _encode(value)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "little")
+
+
+def _exact_quantile(values: List[float], q: float) -> Optional[float]:
+    if len(values) == 0:
+        return None
+
+    values = sorted(values)
+    pos = q * (len(values) - 1)
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (pos - lower) * (values[upper] - values[lower])
+
+
+class P2Quantile:
+    def __init__(self, q: float) -> None:
+        """
+        A streaming estimate of a quantile using the P-square algorithm (Jain & Chlamtac).
+
+        The estimate uses constant memory (five markers), independently of the number of values.
+        For up to five values the quantile is exact.
+
+        :param q: The quantile to estimate (strictly between 0 and 1).
+        """
+        if not 0 < q < 1:
+            raise HofsException(
+                f"the quantile must be strictly between 0 and 1, but was {q}"
+            )
+
+        self.q = q
+        self.count = 0
+
+        # The marker heights, actual positions, desired positions and position increments
+        self._heights: List[float] = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        :param value: The value.
+        """
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self._positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            self._adjust(i)
+
+    def _adjust(self, i: int) -> None:
+        heights, positions = self._heights, self._positions
+        d = self._desired[i] - positions[i]
+        if (d >= 1 and positions[i + 1] - positions[i] > 1) or (
+            d <= -1 and positions[i - 1] - positions[i] < -1
+        ):
+            step = 1 if d > 0 else -1
+
+            # Try the piecewise-parabolic prediction, fall back to linear interpolation
+            height = heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+                (positions[i] - positions[i - 1] + step)
+                * (heights[i + 1] - heights[i])
+                / (positions[i + 1] - positions[i])
+                + (positions[i + 1] - positions[i] - step)
+                * (heights[i] - heights[i - 1])
+                / (positions[i] - positions[i - 1])
+            )
+            if not heights[i - 1] < height < heights[i + 1]:
+                height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                    positions[i + step] - positions[i]
+                )
+
+            heights[i] = height
+            positions[i] += step
+
+    @property
+    def value(self) -> Optional[float]:
+        """
+        The current estimate of the quantile (None if no values were added).
+        """
+        if self.count <= 5:
+            return _exact_quantile(self._heights, self.q)
+        return self._heights[2]
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float = 0.01) -> None:
+        """
+        A set of values with a fixed memory footprint, which may report values it doesn't
+        contain (but never misses a value it contains).
+
+        The number of bits and hash functions is chosen such that the rate of such false
+        positives stays below fp_rate for up to capacity values (e.g. 1.2 MB for 1M values
+        with a rate of 1%). Values are hashed using BLAKE2b, so filters built in different
+        processes can be merged. Values must be str, bytes, int, float, None or tuples of
+        these, where equal numbers (like 1 and 1.0) are the same value.
+
+        :param capacity: The expected number of distinct values.
+        :param fp_rate: The maximum rate of false positives (strictly between 0 and 1).
+        """
+        if capacity < 1:
+            raise HofsException(f"capacity must be positive, but was {capacity}")
+        if not 0 < fp_rate < 1:
+            raise HofsException(
+                f"fp_rate must be strictly between 0 and 1, but was {fp_rate}"
+            )
+
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.n_bits = max(
+            8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+        )
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+
+    def _indices(self, value: Any) -> List[int]:
+        # Derive all indices from two 64-bit hashes (Kirsch & Mitzenmacher)
+        h = _hash128(value)
+        h1, h2 = h & 0xFFFFFFFFFFFFFFFF, h >> 64
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def add(self, value: Any) -> bool:
+        """
+        Add a value.
+
+        :param value: The value.
+        :return: True if the value was (probably) contained already, False otherwise.
+        """
+        bits = self._bits
+        contained = True
+        for idx in self._indices(value):
+            mask = 1 << (idx & 7)
+            if not bits[idx >> 3] & mask:
+                contained = False
+                bits[idx >> 3] |= mask
+        return contained
+
+    def __contains__(self, value: Any) -> bool:
+        bits = self._bits
+        return all(bits[idx >> 3] & (1 << (idx & 7)) for idx in self._indices(value))
+
+    def merge(self, other: "BloomFilter") -> None:
+        """
+        Add all values of another filter with the same capacity and rate of false positives.
+
+        :param other: The other filter.
+        """
+        if (other.n_bits, other.n_hashes) != (self.n_bits, self.n_hashes):
+            raise HofsException("only Bloom filters of the same size can be merged")
+        self._bits = bytearray(a | b for a, b in zip(self._bits, other._bits))
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 14) -> None:
+        """
+        An estimate of the number of distinct values using the HyperLogLog algorithm
+        (Flajolet et al.).
+
+        The estimate uses 2 ** precision bytes of memory (16 KB by default), independently
+        of the number of values. Its standard error is about 1.04 / sqrt(2 ** precision)
+        (0.8% by default). Values are hashed using BLAKE2b, so estimates built in different
+        processes can be merged. Values must be str, bytes, int, float, None or tuples of
+        these (see BloomFilter).
+
+        :param precision: The number of bits used for selecting a register (4 to 18).
+        """
+        if not 4 <= precision <= 18:
+            raise HofsException(
+                f"precision must be between 4 and 18, but was {precision}"
+            )
+
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """
+        Add a value.
+
+        :param value: The value.
+        """
+        h = _hash128(value) & 0xFFFFFFFFFFFFFFFF
+        idx = h >> (64 - self.precision)
+        # The position of the first 1 bit of the remaining bits
+        rank = (
+            64
+            - self.precision
+            - (h & ((1 << (64 - self.precision)) - 1)).bit_length()
+            + 1
+        )
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Add all values of another estimate with the same precision.
+
+        :param other: The other estimate.
+        """
+        if other.precision != self.precision:
+            raise HofsException("only HyperLogLogs of the same precision can be merged")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    @property
+    def count(self) -> int:
+        """
+        The estimated number of distinct values.
+        """
+        m = len(self._registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0**-register for register in self._registers)
+
+        # Use linear counting for small cardinalities
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros != 0:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
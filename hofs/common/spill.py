@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from hofs.exceptions.exceptions import HofsException
+
+
+class SpillFiles:
+    def __init__(self, chunk_size: int = 1024, max_fan_in: int = 64) -> None:
+        """
+        A set of temporary files ("runs") for values that don't fit into memory.
+
+        Every run is written at once and read back lazily. The values must be picklable.
+        The temporary files are deleted when closing.
+
+        :param chunk_size: The number of values pickled at once.
+        :param max_fan_in: The maximum number of runs merged (i.e. open) at once.
+        """
+        if max_fan_in < 2:
+            raise HofsException(f"max_fan_in must be at least 2, but was {max_fan_in}")
+
+        self.chunk_size = chunk_size
+        self.max_fan_in = max_fan_in
+        self.paths: List[str] = []
+        self._n_written = 0
+        self._dir: Optional[tempfile.TemporaryDirectory] = None
+
+    def write(self, values: Iterable[Any]) -> None:
+        """
+        Write a run.
+
+        :param values: The values of the run.
+        """
+        if self._dir is None:
+            self._dir = tempfile.TemporaryDirectory(prefix="hofs-spill-")
+
+        path = os.path.join(self._dir.name, f"run-{self._n_written}")
+        self._n_written += 1
+        it = iter(values)
+        with open(path, "wb") as f:
+            while True:
+                chunk = list(itertools.islice(it, self.chunk_size))
+                if len(chunk) == 0:
+                    break
+                pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+        self.paths.append(path)
+
+    def read(self, idx: int) -> Iterator[Any]:
+        """
+        Read a run back lazily.
+
+        :param idx: The index of the run (runs are numbered in the order they were written).
+        :return: An iterator containing the values of the run.
+        """
+        return self._read_path(self.paths[idx])
+
+    def _read_path(self, path: str) -> Iterator[Any]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                yield from chunk
+
+    def runs(self) -> List[Iterator[Any]]:
+        """
+        Read the runs back.
+
+        :return: One lazy iterator per run, in the order the runs were written.
+        """
+        return [self.read(idx) for idx in range(len(self.paths))]
+
+    def compact(self, merge: Callable[[List[Iterator[Any]]], Iterable[Any]]) -> None:
+        """
+        Merge consecutive runs in passes until there are at most max_fan_in runs left.
+
+        Every pass replaces groups of max_fan_in consecutive runs by a single run, so that
+        no more than max_fan_in runs are ever open at once and the order of the runs is kept.
+
+        :param merge: The function merging a list of runs into the values of a single run.
+        """
+        while len(self.paths) > self.max_fan_in:
+            paths, self.paths = self.paths, []
+            for start in range(0, len(paths), self.max_fan_in):
+                end = start + self.max_fan_in
+                group = paths[start:end]
+                if len(group) == 1:
+                    self.paths.append(group[0])
+                    continue
+                self.write(merge([self._read_path(path) for path in group]))
+                for path in group:
+                    os.remove(path)
+
+    def merge(
+        self, key: Optional[Callable[[Any], Any]] = None, reverse: bool = False
+    ) -> Iterator[Any]:
+        """
+        Merge the runs, each of which must be sorted.
+
+        Only one chunk per run is held in memory at a time. If there are more than max_fan_in
+        runs, they are compacted first (see compact). The merge is stable, i.e. equal values
+        are returned in the order of the runs they come from.
+
+        :param key: The key the runs are sorted by.
+        :param reverse: Whether the runs are sorted in descending order.
+        :return: An iterator containing the values of all runs in sorted order.
+        """
+        self.compact(lambda runs: heapq.merge(*runs, key=key, reverse=reverse))
+        return heapq.merge(*self.runs(), key=key, reverse=reverse)
+
+    def close(self) -> None:
+        """
+        Delete the temporary files.
+        """
+        if self._dir is not None:
+            self._dir.cleanup()
+            self._dir = None
+        self.paths = []
+
+    def __enter__(self) -> "SpillFiles":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
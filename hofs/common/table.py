@@ -1,14 +1,131 @@
-from typing import Dict, List, Union
+import csv
+import io
+import itertools
+import json
+import sys
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from hofs.exceptions.exceptions import HofsException
 
+# The column types. int and float columns are stored as arrays of 64-bit values, str
+# columns as lists of interned strings
+COL_TYPES = ["int", "float", "str"]
+_TYPECODES = {"int": "q", "float": "d"}
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _to_int64(value: Any) -> int:
+    # Unlike int, this doesn't truncate floats, and it checks the range before the value
+    # reaches the array (which would raise OverflowError)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{value!r} is not an integer")
+    result = int(value)
+    if not _INT64_MIN <= result <= _INT64_MAX:
+        raise ValueError(f"{result} doesn't fit into 64 bits")
+    return result
+
+
+_CONVERTERS: Dict[Optional[str], Callable[[Any], Any]] = {
+    None: lambda value: value,
+    "int": _to_int64,
+    "float": float,
+    "str": lambda value: sys.intern(str(value)),
+}
+
+Column = Union[List[Any], "array[Any]"]
+
+# The number of rows Table.render formats before writing them at once
+_RENDER_CHUNK_ROWS = 1024
+
+
+def _new_column(col_type: Optional[str], values: Iterable[Any] = ()) -> Column:
+    if col_type in _TYPECODES:
+        return array(_TYPECODES[col_type], values)
+    return list(values)
+
+
+def _check_render_args(max_rows: Optional[int], page_size: Optional[int]) -> None:
+    if max_rows is not None and max_rows < 0:
+        raise HofsException(f"max_rows must not be negative, but was {max_rows}")
+    if page_size is not None and page_size < 1:
+        raise HofsException(f"page_size must be positive, but was {page_size}")
+
+
+def _aligned_lines(
+    rows: Iterable[Tuple[str, ...]],
+    widths: List[int],
+    header: str,
+    page_size: Optional[int],
+) -> Iterator[str]:
+    for row_idx, row in enumerate(rows):
+        if page_size is not None and row_idx != 0 and row_idx % page_size == 0:
+            yield "\n" + header
+        yield "".join(map(str.ljust, row, widths)) + "\n"
+
+
+def _write_chunked(fp: TextIO, lines: Iterator[str]) -> None:
+    # Write the lines in chunks of _RENDER_CHUNK_ROWS, so that neither every line is
+    # written on its own nor the whole text is held in memory
+    while True:
+        chunk = list(itertools.islice(lines, _RENDER_CHUNK_ROWS))
+        if len(chunk) == 0:
+            return
+        fp.write("".join(chunk))
+
 
 class Table:
-    def __init__(self, cols: List[str]) -> None:
+    def __init__(self, cols: List[str], types: Optional[Dict[str, str]] = None) -> None:
+        """
+        A table with named columns.
+
+        Columns are untyped by default, i.e. they hold any values as they are. Typed columns
+        convert every value when it is added. The values of "int" and "float" columns are
+        stored as 64-bit numbers in arrays (8 bytes per value instead of a Python object),
+        the values of "str" columns are interned (every distinct string is stored once).
+        Values that don't fit into their column (like 3.9 or 2 ** 70 in an "int" column)
+        are rejected instead of being truncated.
+
+        :param cols: The column names.
+        :param types: The types ("int", "float" or "str") of the typed columns.
+        """
         if len(cols) == 0:
             raise HofsException("table must have at least one column")
 
-        self._cols: Dict[str, List[str]] = {col: [] for col in cols}
+        types = types if types is not None else {}
+        unknown_cols = set(types.keys()).difference(cols)
+        if len(unknown_cols) != 0:
+            raise HofsException(
+                f"types were given for unknown columns {unknown_cols!r}"
+            )
+        for col, col_type in types.items():
+            if col_type not in COL_TYPES:
+                raise HofsException(
+                    f"the type of column {col} must be one of {COL_TYPES!r}, "
+                    f"but was {col_type!r}"
+                )
+
+        self._types: Dict[str, Optional[str]] = {col: types.get(col) for col in cols}
+        self._cols: Dict[str, Column] = {
+            col: _new_column(col_type) for col, col_type in self._types.items()
+        }
+
+    def _with_cols(self, cols: Dict[str, Column]) -> "Table":
+        table = Table(self.col_names)
+        table._types = dict(self._types)
+        table._cols = cols
+        return table
 
     def col_name(self, idx: int) -> str:
         """
@@ -26,7 +143,14 @@ class Table:
         """
         return list(self._cols.keys())
 
-    def col(self, idx: int) -> List[str]:
+    @property
+    def col_types(self) -> Dict[str, Optional[str]]:
+        """
+        The types of the table columns (None for untyped columns).
+        """
+        return dict(self._types)
+
+    def col(self, idx: int) -> List[Any]:
         """
         Get a column by index.
 
@@ -37,16 +161,20 @@ class Table:
         """
         return self.col_by_name(self.col_name(idx))
 
-    def col_by_name(self, name: str) -> List[str]:
+    def col_by_name(self, name: str) -> List[Any]:
         """
         Get a column by name.
 
+        The column is copied (for all column types), so changing the returned list doesn't
+        change the table. Use value or value_by_name to read single values without copying.
+
         :param name: The column name.
         :return: A list containing the values of the column.
         """
-        return self._cols[name]
+        col = self._cols[name]
+        return list(col) if isinstance(col, list) else col.tolist()
 
-    def value(self, row_idx: int, col_idx: int) -> str:
+    def value(self, row_idx: int, col_idx: int) -> Any:
         """
         Get a value from the table.
 
@@ -54,9 +182,9 @@ class Table:
         :param col_idx: The index of the column.
         :return: The value residing at row with index row_idx and column with index col_index.
         """
-        return self.col(col_idx)[row_idx]
+        return self._cols[self.col_name(col_idx)][row_idx]
 
-    def value_by_name(self, row_idx: int, col_name: str) -> str:
+    def value_by_name(self, row_idx: int, col_name: str) -> Any:
         """
         Get a value from the table.
 
@@ -64,27 +192,25 @@ class Table:
         :param col_name: The name of the column.
         :return: The value residing at row with index row_idx and column with name col_name.
         """
-        return self.col_by_name(col_name)[row_idx]
+        return self._cols[col_name][row_idx]
 
-    def row(self, idx: int) -> List[str]:
+    def row(self, idx: int) -> List[Any]:
         """
         Get a row.
 
         :param idx: The row index.
         :return: A list containing the row values.
         """
-        return list(self.row_dict(idx).values())
+        return [col[idx] for col in self._cols.values()]
 
-    def row_dict(self, idx: int) -> Dict[str, str]:
+    def row_dict(self, idx: int) -> Dict[str, Any]:
         """
         Get a row.
 
         :param idx: The row index.
         :return: A dictionary containing the columns along with their values for the respective row.
         """
-        return {
-            col_name: self.value_by_name(idx, col_name) for col_name in self.col_names
-        }
+        return {col_name: col[idx] for col_name, col in self._cols.items()}
 
     @property
     def n_rows(self) -> int:
@@ -93,17 +219,16 @@ class Table:
         """
         assert self.n_cols != 0
 
-        first_col = self.col(0)
-        return len(first_col)
+        return len(next(iter(self._cols.values())))
 
     @property
     def n_cols(self) -> int:
         """
         The number of columns.
         """
-        return len(self.col_names)
+        return len(self._cols)
 
-    def add_row(self, row: Union[Dict[str, str], List[str]]) -> None:
+    def add_row(self, row: Union[Dict[str, Any], List[Any]]) -> None:
         """
         Add a row to the table.
 
@@ -133,51 +258,236 @@ class Table:
                 f"the row keys must be the column names, but the following keys differed: {cols_diff!r}"
             )
 
-        for k, v in row_dict.items():
-            self._cols[k].append(v)
+        # Convert all values before adding any, so that a failed conversion leaves the
+        # table unchanged
+        converted = {}
+        for col_name, value in row_dict.items():
+            col_type = self._types[col_name]
+            try:
+                converted[col_name] = _CONVERTERS[col_type](value)
+            except (TypeError, ValueError, OverflowError):
+                raise HofsException(
+                    f"{value!r} can't be stored in the {col_type} column {col_name}"
+                )
+
+        for col_name, value in converted.items():
+            self._cols[col_name].append(value)
+
+    def _col(self, name: str) -> Column:
+        if name not in self._cols:
+            raise HofsException(f"the table has no column {name}")
+        return self._cols[name]
+
+    def col_sum(self, name: str) -> Any:
+        """
+        Get the sum of a column.
+
+        :param name: The column name.
+        :return: The sum of the column values (0 if there are no rows).
+        """
+        col = self._col(name)
+        if self._types[name] == "str":
+            raise HofsException(f"the str column {name} can't be summed")
+        return sum(col, 0)
+
+    def col_mean(self, name: str) -> Optional[float]:
+        """
+        Get the mean of a column.
+
+        :param name: The column name.
+        :return: The mean of the column values (None if there are no rows).
+        """
+        n_rows = len(self._col(name))
+        return self.col_sum(name) / n_rows if n_rows != 0 else None
+
+    def sort_by(self, name: str, reverse: bool = False) -> "Table":
+        """
+        Sort the rows by a column.
+
+        The sort is stable, i.e. rows with equal values keep their order.
 
-    def __getitem__(self, i: int) -> Dict[str, str]:
+        :param name: The column name.
+        :param reverse: Whether to sort in descending order.
+        :return: A new table containing the sorted rows.
+        """
+        key_col = self._col(name)
+        order = sorted(range(len(key_col)), key=key_col.__getitem__, reverse=reverse)
+        return self._with_cols(
+            {
+                col_name: _new_column(
+                    self._types[col_name], map(col.__getitem__, order)
+                )
+                for col_name, col in self._cols.items()
+            }
+        )
+
+    def filter(self, name: str, fun: Callable[[Any], bool]) -> "Table":
+        """
+        Keep the rows for which fun returns True for the value of a column.
+
+        :param name: The column name.
+        :param fun: The filter function.
+        :return: A new table containing the remaining rows.
+        """
+        mask = list(map(fun, self._col(name)))
+        return self._with_cols(
+            {
+                col_name: _new_column(
+                    self._types[col_name], itertools.compress(col, mask)
+                )
+                for col_name, col in self._cols.items()
+            }
+        )
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
         return self.row_dict(i)
 
     def __len__(self) -> int:
         return self.n_rows
 
-    def __header(self, col_ljust_vals: Dict[str, int]) -> str:
-        return (
-            "".join(
-                [
-                    str(col_name).ljust(col_ljust_vals[col_name])
-                    for col_name in self.col_names
-                ]
-            )
-            + "\n"
-        )
+    def render(
+        self,
+        fp: TextIO,
+        max_rows: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ) -> None:
+        """
+        Write the table to a text stream, one line per row with aligned columns.
 
-    def __col_str(self, col_ljust_vals: Dict[str, int], row_idx: int) -> str:
-        return (
-            "".join(
-                [
-                    str(col).ljust(col_ljust_vals[col_name])
-                    for col_name, col in self[row_idx].items()
-                ]
+        The column widths are computed in one pass over the columns, then the rows are
+        formatted and written in chunks, so the whole text is never held in memory.
+
+        :param fp: The text stream, e.g. sys.stdout or a file opened for writing.
+        :param max_rows: If given, only the first max_rows rows are written, followed by
+            a line stating the number of omitted rows.
+        :param page_size: If given, the header is repeated (after an empty line) every
+            page_size rows.
+        """
+        _check_render_args(max_rows, page_size)
+
+        n_rows = self.n_rows if max_rows is None else min(max_rows, self.n_rows)
+        widths = self._render_widths(n_rows)
+        header = "".join(map(str.ljust, map(str, self._cols.keys()), widths)) + "\n"
+
+        rows = zip(
+            *[map(str, itertools.islice(col, n_rows)) for col in self._cols.values()]
+        )
+        lines = itertools.chain(
+            [header], _aligned_lines(rows, widths, header, page_size)
+        )
+        if n_rows < self.n_rows:
+            lines = itertools.chain(lines, [f"... {self.n_rows - n_rows} more rows\n"])
+        _write_chunked(fp, lines)
+
+    def _render_widths(self, n_rows: int) -> List[int]:
+        # The width of every column: its longest value (among the first n_rows) or name,
+        # plus a space
+        return [
+            max(
+                len(str(col_name)),
+                max(map(len, map(str, itertools.islice(col, n_rows))), default=0),
             )
-            + "\n"
+            + 1
+            for col_name, col in self._cols.items()
+        ]
+
+    def to_csv(self, fp: TextIO) -> None:
+        """
+        Write the table as CSV (with a header row).
+
+        :param fp: The text stream. Files should be opened with newline="" (see csv).
+        """
+        writer = csv.writer(fp)
+        writer.writerow(self.col_names)
+        writer.writerows(zip(*self._cols.values()))
+
+    def to_jsonl(self, fp: TextIO) -> None:
+        """
+        Write the table as JSON Lines, i.e. one JSON object per row.
+
+        Values that aren't JSON types are written as strings.
+
+        :param fp: The text stream.
+        """
+        col_names = self.col_names
+        _write_chunked(
+            fp,
+            (
+                json.dumps(dict(zip(col_names, row)), default=str) + "\n"
+                for row in zip(*self._cols.values())
+            ),
         )
 
-    def __repr__(self) -> str:
-        col_ljust_vals = {}
-        for col_name, col in self._cols.items():
-            values = self.col_by_name(col_name) + [col_name]
-            col_ljust_vals[col_name] = len(max(values, key=len)) + 1
+    @classmethod
+    def from_csv(cls, fp: TextIO, types: Optional[Dict[str, str]] = None) -> "Table":
+        """
+        Read a table from CSV (see to_csv).
+
+        The first row contains the column names. All values are strings unless the column
+        is typed. Empty lines are skipped.
 
-        s = self.__header(col_ljust_vals)
-        for row_idx in range(len(self)):
-            s += self.__col_str(col_ljust_vals, row_idx)
-        return s
+        :param fp: The text stream.
+        :param types: The types of the typed columns (see __init__).
+        :return: The table.
+        """
+        rows = (row for row in csv.reader(fp) if len(row) != 0)
+        header = next(rows, None)
+        if header is None:
+            raise HofsException("the CSV has no header row")
+
+        table = cls(header, types)
+        table._add_list_rows(rows)
+        return table
+
+    @classmethod
+    def from_jsonl(cls, fp: TextIO, types: Optional[Dict[str, str]] = None) -> "Table":
+        """
+        Read a table from JSON Lines (see to_jsonl).
+
+        The keys of the first object are the column names, all other objects must have
+        the same keys.
+
+        :param fp: The text stream.
+        :param types: The types of the typed columns (see __init__).
+        :return: The table.
+        """
+        rows = (json.loads(line) for line in fp if not line.isspace())
+        first = next(rows, None)
+        if first is None:
+            raise HofsException("the JSON Lines contain no rows")
+
+        table = cls(list(first.keys()), types)
+        table.add_row(first)
+        for row in rows:
+            table.add_row(row)
+        return table
+
+    def _add_list_rows(self, rows: Iterable[List[Any]]) -> None:
+        # Add many rows given as lists without building a dictionary per row
+        cols = list(self._cols.values())
+        converters = [_CONVERTERS[col_type] for col_type in self._types.values()]
+        for row in rows:
+            if len(row) != len(cols):
+                raise HofsException(
+                    "the number of row values must be equal to the number of columns"
+                )
+            try:
+                values = [convert(value) for convert, value in zip(converters, row)]
+            except (TypeError, ValueError, OverflowError) as e:
+                raise HofsException(f"the row {row!r} can't be stored: {e}")
+            for col, value in zip(cols, values):
+                col.append(value)
+
+    def __repr__(self) -> str:
+        out = io.StringIO()
+        self.render(out)
+        return out.getvalue()
 
 
-def table_from_rows(cols: List[str], rows: List[List[str]]) -> Table:
-    table = Table(cols)
+def table_from_rows(
+    cols: List[str], rows: List[List[Any]], types: Optional[Dict[str, str]] = None
+) -> Table:
+    table = Table(cols, types)
     for row in rows:
         table.add_row(row)
     return table
@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Any, Optional
+
+from hofs.common import instrumentation
+from hofs.exceptions.exceptions import HofsException
+
+# The weight of a new read latency in the moving average, and the bounds and steps of
+# the factor the rates are scaled with in adaptive mode (it is halved at most once per
+# _BACKOFF_SECONDS while the reads are slow and slowly grows back otherwise)
+_LATENCY_WEIGHT = 0.2
+_MIN_FACTOR = 1 / 64
+_FACTOR_STEP = 0.05
+_BACKOFF_SECONDS = 1.0
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, amount: float, factor: float) -> float:
+        # Take amount tokens and return how long to wait for them. The tokens may become
+        # negative, the caller then waits until the debt is paid off
+        now = time.monotonic()
+        rate = self.rate * factor
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        self.tokens -= amount
+        return -self.tokens / rate if self.tokens < 0 else 0.0
+
+
+class Throttle:
+    def __init__(
+        self,
+        bytes_per_second: Optional[float] = None,
+        ops_per_second: Optional[float] = None,
+        adaptive: bool = False,
+        target_latency: float = 0.01,
+    ) -> None:
+        """
+        An I/O budget for everything hofs reads in this process.
+
+        While the throttle is installed (see install), reads from files, stat calls, file
+        openings and directory listings of all threads are slowed down such that they stay
+        within the budget. Every budget is a token bucket, i.e. short bursts (of up to one
+        second worth of I/O) are allowed.
+
+        :param bytes_per_second: The maximum number of bytes read per second (None for no limit).
+        :param ops_per_second: The maximum number of stat calls, openings and directory
+            listings per second (None for no limit).
+        :param adaptive: If True, the budgets shrink while reads take longer than
+            target_latency on average (e.g. because other processes use the disk) and grow
+            back once they are fast again.
+        :param target_latency: The average read latency (in seconds) the adaptive mode aims for.
+        """
+        if bytes_per_second is None and ops_per_second is None:
+            raise HofsException("a throttle needs a byte or an operation budget")
+        for name, rate in [
+            ("bytes_per_second", bytes_per_second),
+            ("ops_per_second", ops_per_second),
+        ]:
+            if rate is not None and rate <= 0:
+                raise HofsException(f"{name} must be positive, but was {rate}")
+
+        self._bytes = (
+            _TokenBucket(bytes_per_second, bytes_per_second)
+            if bytes_per_second is not None
+            else None
+        )
+        self._ops = (
+            _TokenBucket(ops_per_second, ops_per_second)
+            if ops_per_second is not None
+            else None
+        )
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+
+        # The factor all rates are scaled with (below 1 while the adaptive mode backs off)
+        # and the moving average of the read latency
+        self.factor = 1.0
+        self.latency: Optional[float] = None
+        self._backed_off: Optional[float] = None
+        # The total number of seconds I/O was delayed
+        self.waited = 0.0
+
+        self._lock = threading.Lock()
+        self._installed = False
+
+    def _on_event(self, event: str, amount: int) -> None:
+        # All other events (stat calls, openings and listings) are operations
+        bucket = self._bytes if event == instrumentation.READ_BYTES else self._ops
+        if bucket is None:
+            return
+
+        with self._lock:
+            wait = bucket.take(amount, self.factor)
+            self.waited += wait
+        # Sleep without holding the lock, the debt already delays the following callers
+        if wait > 0:
+            time.sleep(wait)
+
+    def _on_latency(self, duration: float) -> None:
+        with self._lock:
+            if self.latency is None:
+                self.latency = duration
+            else:
+                self.latency += _LATENCY_WEIGHT * (duration - self.latency)
+
+            if self.latency <= self.target_latency:
+                self.factor = min(1.0, self.factor + _FACTOR_STEP)
+                return
+
+            # Give the smaller rates some time to take effect before backing off further
+            now = time.monotonic()
+            if self._backed_off is None or now - self._backed_off >= _BACKOFF_SECONDS:
+                self.factor = max(_MIN_FACTOR, self.factor / 2)
+                self._backed_off = now
+
+    def install(self) -> None:
+        """
+        Start throttling the I/O of hofs.
+        """
+        if self._installed:
+            return
+        instrumentation.add_hook(self._on_event)
+        if self.adaptive:
+            instrumentation.add_latency_hook(self._on_latency)
+        self._installed = True
+
+    def remove(self) -> None:
+        """
+        Stop throttling the I/O of hofs.
+        """
+        if not self._installed:
+            return
+        instrumentation.remove_hook(self._on_event)
+        if self.adaptive:
+            instrumentation.remove_latency_hook(self._on_latency)
+        self._installed = False
+
+    def __enter__(self) -> "Throttle":
+        self.install()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.remove()
@@ -1,8 +1,20 @@
+import hofs.filelike.scan  # noqa: F401 (adds FileIterator.scan_literals)
+from hofs.filelike.archive import ArchiveDir, ArchiveFile, ArchiveTextFile
+from hofs.filelike.checkpoint import Checkpoint
+from hofs.filelike.distributed import Distributed
 from hofs.filelike.file_like import FileLike
 from hofs.filelike.file_likes import Dir, File, FileIterator
 from hofs.filelike.text_file import TextFile, TextFileIterator
 
 __all__ = [
+    # archive
+    "ArchiveDir",
+    "ArchiveFile",
+    "ArchiveTextFile",
+    # checkpoint
+    "Checkpoint",
+    # distributed
+    "Distributed",
     # file_like
     "FileLike",
     # file_likes
@@ -0,0 +1,232 @@
+import datetime
+import os
+import posixpath
+import tarfile
+import zipfile
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
+
+from hofs.exceptions.exceptions import HofsException
+from hofs.filelike.compression import HEAD_LEN, detect_compression
+from hofs.filelike.file_like import FileLike
+from hofs.filelike.file_likes import File, FileIterator
+from hofs.filelike.text_file import TextFile
+from hofs.filesize.file_size import FileSize
+from hofs.paths.paths import file_exists
+
+_Member = Union[zipfile.ZipInfo, tarfile.TarInfo]
+
+
+def _member_order_key(name: str) -> List[Tuple[int, str]]:
+    # Mirror the order of Dir.files: the files of a directory (sorted by name) come
+    # before its subdirectories (which are again sorted by name)
+    parts = name.split("/")
+    return [(1, part) for part in parts[:-1]] + [(0, parts[-1])]
+
+
+def _member_name(name: str) -> str:
+    # Like tar, strip leading "/" and ".." components, so that no member lies outside
+    # of the archive root
+    parts = posixpath.normpath(name).lstrip("/").split("/")
+    while len(parts) > 1 and parts[0] == "..":
+        parts.pop(0)
+    return "/".join(parts)
+
+
+class ArchiveFile(File):
+    def __init__(
+        self,
+        archive: "ArchiveDir",
+        member: _Member,
+        member_name: str,
+        size: int,
+        mod_time: datetime.datetime,
+    ) -> None:
+        # Archive members don't exist on disk, so we skip the existence check of File
+        FileLike.__init__(self, os.path.join(archive.path, *member_name.split("/")))
+
+        self.archive = archive
+        self.member_name = member_name
+        self._member = member
+        self._size = size
+        self._mod_time = mod_time
+
+    def _open(self) -> BinaryIO:
+        return self.archive._open_member(self._member)
+
+    @property
+    def dir(self) -> "ArchiveDir":  # type: ignore
+        """
+        The archive containing this file.
+
+        :return: An ArchiveDir object representing the archive.
+        """
+        return self.archive
+
+    @property
+    def size(self) -> FileSize:
+        """
+        The (uncompressed) size of this file as recorded in the archive.
+
+        :return: A FileSize object representing the size of this file (in bytes).
+        """
+        return FileSize(self._size)
+
+    @property
+    def access_time(self) -> datetime.datetime:
+        """
+        Archives don't record access times, so this always raises a HofsException.
+        """
+        raise HofsException("archive members have no access time")
+
+    atime = access_time
+
+    @property
+    def mod_time(self) -> datetime.datetime:
+        """
+        The last modification time of this file as recorded in the archive.
+
+        :return: A datetime object representing the last modification time.
+        """
+        return self._mod_time
+
+    mtime = mod_time
+
+    def text_file(self, encoding: str = "utf-8") -> "ArchiveTextFile":
+        """
+        Get a TextFile object for this archive member.
+
+        :param encoding: The encoding to use.
+        :return: The obtained ArchiveTextFile object.
+        """
+        return ArchiveTextFile(
+            self.archive,
+            self._member,
+            self.member_name,
+            self._size,
+            self._mod_time,
+            encoding,
+        )
+
+    t = text_file
+
+    def __repr__(self) -> str:
+        return f'ArchiveFile("{self.path}")'
+
+
+class ArchiveTextFile(ArchiveFile, TextFile):
+    def __init__(
+        self,
+        archive: "ArchiveDir",
+        member: _Member,
+        member_name: str,
+        size: int,
+        mod_time: datetime.datetime,
+        encoding: str = "utf-8",
+    ) -> None:
+        super().__init__(archive, member, member_name, size, mod_time)
+
+        self.encoding = encoding
+
+    def __repr__(self) -> str:
+        return f"ArchiveTextFile({self.path})"
+
+
+class ArchiveDir(FileLike):
+    def __init__(self, path: str) -> None:
+        if not file_exists(path):
+            raise HofsException(f"There is no archive at {path}")
+
+        super(ArchiveDir, self).__init__(path)
+
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        # Whether the members must be read in archive order (see files)
+        self._sequential = False
+        if zipfile.is_zipfile(self.path):
+            self._zip = zipfile.ZipFile(self.path)
+        elif tarfile.is_tarfile(self.path):
+            self._tar = tarfile.open(self.path)
+            with open(self.path, "rb") as f:
+                self._sequential = detect_compression(f.read(HEAD_LEN)) is not None
+        else:
+            raise HofsException(f"There is no zip or tar archive at {path}")
+
+    def _members(self) -> List[ArchiveFile]:
+        # Listing only reads the central directory (zip) or the member headers (tar),
+        # the member contents are not touched
+        members: List[Tuple[_Member, str, int, datetime.datetime]] = []
+        if self._zip is not None:
+            for info in self._zip.infolist():
+                if not info.is_dir():
+                    mod_time = datetime.datetime(*info.date_time)
+                    members.append((info, info.filename, info.file_size, mod_time))
+        else:
+            assert self._tar is not None
+            for tar_info in self._tar.getmembers():
+                if tar_info.isfile():
+                    mod_time = datetime.datetime.fromtimestamp(tar_info.mtime)
+                    members.append((tar_info, tar_info.name, tar_info.size, mod_time))
+
+        files = [
+            ArchiveFile(self, member, _member_name(name), size, mtime)
+            for member, name, size, mtime in members
+        ]
+        if self._sequential:
+            return files
+        return sorted(files, key=lambda file: _member_order_key(file.member_name))
+
+    def _open_member(self, member: _Member) -> BinaryIO:
+        if self._zip is not None:
+            return self._zip.open(member)  # type: ignore
+        assert self._tar is not None
+        return self._tar.extractfile(member)  # type: ignore
+
+    def file(self, member_name: str) -> ArchiveFile:
+        """
+        The file with the given name located in this archive.
+
+        :param member_name: The name of the member (relative to the archive root,
+            using "/" as separator).
+        :return: An ArchiveFile object representing the given member.
+        """
+        for file in self._members():
+            if file.member_name == member_name:
+                return file
+        raise HofsException(f"There is no file {member_name} in {self.path}")
+
+    @property
+    def files(self) -> FileIterator:
+        """
+        An iterator of (regular) files present in this archive.
+
+        The files are returned in the same order as Dir.files would return them
+        if the archive was extracted. The only exception are compressed tar archives
+        (like .tar.gz), whose files are returned in archive order: they can only be read
+        front to back, so reading a member that comes before the previous one decompresses
+        the archive again from the start. Member contents are read directly from the archive
+        when accessed, nothing is extracted to disk.
+
+        Leading "/" and ".." components of member names are stripped (like tar does), so all
+        paths lie inside the archive.
+
+        :return: The iterator.
+        """
+        return FileIterator(self._members())
+
+    def close(self) -> None:
+        """
+        Close the underlying archive.
+        """
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def __enter__(self) -> "ArchiveDir":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'ArchiveDir("{self.path}")'
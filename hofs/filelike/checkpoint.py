@@ -0,0 +1,188 @@
+import os
+import pickle
+import time
+from typing import Any, Callable, Dict, Optional
+
+from hofs.common import instrumentation
+from hofs.common.functional import FunctionalIterator
+from hofs.common.table import Table
+from hofs.exceptions.exceptions import HofsException
+from hofs.filelike.file_like import FileLike
+from hofs.filelike.file_likes import FileIterator, _FileTreeWalkIterator
+
+
+class _CheckpointedWalk(_FileTreeWalkIterator):
+    # The walk of a running checkpointed chain. When the walk is asked for the next file,
+    # all values derived from the previous files have been consumed by the terminal, so the
+    # state of the walk and the accumulator match and can be saved (see
+    # instrumentation.instrument)
+    _checkpoint: "Checkpoint"
+
+    def __next__(self) -> FileLike:
+        self._checkpoint._on_next_file()
+        return _FileTreeWalkIterator.__next__(self)
+
+
+class Checkpoint:
+    def __init__(
+        self, it: FunctionalIterator, path: str, interval: float = 60.0
+    ) -> None:
+        """
+        An iterator chain whose progress is saved to a file (see FunctionalIterator.checkpoint).
+
+        :param it: The last iterator of the chain.
+        :param path: The path of the checkpoint file.
+        :param interval: The minimum number of seconds between two saves.
+        """
+        if interval < 0:
+            raise HofsException(f"interval must not be negative, but was {interval}")
+
+        first = it._chain()[0]
+        walker = first._source_iterator()
+        if not isinstance(walker, _FileTreeWalkIterator) or walker.started:
+            raise HofsException(
+                "Only chains fed by a directory walk that hasn't started yet can be checkpointed"
+            )
+        # Fix the plan, so that a resumed walk is filtered exactly like the original one
+        if isinstance(first, FileIterator):
+            first._start()
+
+        self.it = it
+        self.path = path
+        self.interval = interval
+        self._walker = walker
+        self._terminal = ""
+        self._acc: Any = None
+        self._next_save = 0.0
+
+        self._saved: Optional[Dict[str, Any]] = None
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self._saved = pickle.load(f)
+
+    @property
+    def resumed(self) -> bool:
+        """
+        Whether the chain continues from a checkpoint file left by an earlier run.
+        """
+        return self._saved is not None
+
+    def _on_next_file(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_save:
+            self.save()
+            self._next_save = now + self.interval
+
+    def save(self) -> None:
+        """
+        Save the state of the walk and the accumulator of the running terminal.
+
+        The file is replaced atomically, so a crash while saving leaves the previous
+        checkpoint intact. This is called automatically while a terminal runs.
+        """
+        state = {
+            "terminal": self._terminal,
+            "walk": self._walker.state(),
+            "acc": self._acc,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def _run(self, terminal: str, fun: Callable[[Any, Any], Any], start: Any) -> Any:
+        self._terminal, self._acc = terminal, start
+        if self._saved is not None:
+            if self._saved["terminal"] != terminal:
+                raise HofsException(
+                    f"The checkpoint at {self.path} belongs to {self._saved['terminal']}, "
+                    f"not to {terminal}"
+                )
+            self._walker.restore(self._saved["walk"])
+            self._acc = self._saved["acc"]
+
+        walk_class = instrumentation.instrument(
+            self._walker, _CheckpointedWalk, "_checkpoint", self
+        )
+        self._next_save = time.monotonic() + self.interval
+        try:
+            for value in self.it:
+                self._acc = fun(self._acc, value)
+        finally:
+            instrumentation.uninstrument(self._walker, walk_class, "_checkpoint")
+
+        # The work is done, so the next run starts from scratch
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._saved = None
+        return self._acc
+
+    def reduce(self, fun: Callable[[Any, Any], Any], start: Any) -> Any:
+        """
+        Reduce the values (see FunctionalIterator.reduce).
+
+        The accumulator is saved along with the walk, so it must be picklable.
+
+        :param fun: The function combining the accumulator and a value.
+        :param start: The initial accumulator (ignored when resuming).
+        :return: The final accumulator.
+        """
+        return self._run("reduce", fun, start)
+
+    def len(self) -> int:
+        return self._run("len", lambda n, _: n + 1, 0)
+
+    def sum(self) -> Any:
+        return self._run("sum", lambda total, value: total + value, 0)
+
+    def count_by(self, key: Callable[[Any], Any], name: str = "key") -> Table:
+        """
+        Count the values per key (see FunctionalIterator.count_by).
+
+        :param key: The function computing the key of a value.
+        :param name: The name of the key column.
+        :return: A table with the columns name and "count", sorted by key.
+        """
+
+        def count(counts: Dict[Any, int], value: Any) -> Dict[Any, int]:
+            value_key = key(value)
+            counts[value_key] = counts.get(value_key, 0) + 1
+            return counts
+
+        counts = self._run(f"count_by({name!r})", count, {})
+        table = Table([name, "count"])
+        for value_key in sorted(counts):
+            table.add_row([value_key, counts[value_key]])
+        return table
+
+
+# Add attributes to FunctionalIterator
+
+
+def checkpoint(
+    self: FunctionalIterator, path: str, interval: float = 60.0
+) -> Checkpoint:
+    """
+    Save the progress of this iterator chain to a file, so that a run that dies can be resumed.
+
+    While a terminal of the returned object runs, the state of the directory walk feeding
+    the chain (the directories that still have to be listed and the position in the listing
+    of the current directory) and the accumulator of the terminal are saved to path every
+    interval seconds. If path exists, the next run continues from there instead of starting
+    over. Once the terminal finishes, the file is removed.
+
+    For example fs.Dir(".").files.t().map_lc().checkpoint("lc.ckpt").sum() can simply be
+    rerun after it was killed.
+
+    The chain must be fed by a directory walk that hasn't started yet. Stages that read
+    ahead of the terminal (like batch or broadcast) must not be used, since their buffered
+    values would be lost when resuming.
+
+    :param path: The path of the checkpoint file.
+    :param interval: The minimum number of seconds between two saves.
+    :return: The checkpointed chain, which offers the terminals len, sum, reduce and count_by.
+    """
+    return Checkpoint(self, path, interval)
+
+
+setattr(FunctionalIterator, "checkpoint", checkpoint)
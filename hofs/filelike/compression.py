@@ -0,0 +1,87 @@
+import bz2
+import gzip
+import lzma
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+_COMPRESSION_MAGIC = [
+    ("gzip", b"\x1f\x8b"),
+    ("xz", b"\xfd7zXZ\x00"),
+]
+
+# The number of leading bytes needed to detect any of the supported formats
+MAGIC_LEN = 6
+
+# The number of leading bytes that are test-decompressed to confirm a detected format
+# (plain text may happen to start with a magic number, e.g. "BZh9 notes")
+HEAD_LEN = 4096
+
+# The errors raised when reading corrupt or truncated compressed data
+DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error, lzma.LZMAError)
+
+_DECOMPRESSORS: Dict[str, Callable[[], Any]] = {
+    "gzip": lambda: zlib.decompressobj(wbits=31),
+    "bz2": bz2.BZ2Decompressor,
+    "xz": lzma.LZMADecompressor,
+}
+
+
+def _decompresses(compression: str, head: bytes) -> bool:
+    try:
+        _DECOMPRESSORS[compression]().decompress(head, HEAD_LEN)
+    except DECOMPRESSION_ERRORS:
+        return False
+    return True
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """
+    Detect the compression format of a file from its first bytes.
+
+    A format guessed from the magic number is confirmed by decompressing the given bytes,
+    so pass up to HEAD_LEN bytes to reliably tell compressed files from plain text.
+
+    :param head: The first (at least MAGIC_LEN) bytes of the file.
+    :return: "gzip", "bz2" or "xz" if the bytes start with the respective magic number
+        and can be decompressed, None otherwise.
+    """
+    compression = _guess_compression(head)
+    if compression is None or not _decompresses(compression, head):
+        return None
+    return compression
+
+
+def _guess_compression(head: bytes) -> Optional[str]:
+    for compression, magic in _COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+
+    # bzip2 streams start with "BZh" followed by the block size digit
+    if head[:3] == b"BZh" and head[3:4].isdigit() and head[3:4] != b"0":
+        return "bz2"
+
+    return None
+
+
+def open_decompressed(stream: BinaryIO) -> BinaryIO:
+    """
+    Wrap a binary stream so that reading from it yields decompressed bytes.
+
+    The compression is detected from the bytes at the start of the stream (see
+    detect_compression).
+    Decompression happens incrementally while reading, i.e. the stream is never
+    fully materialized in memory.
+    Note that closing the returned stream does not close the underlying stream.
+
+    :param stream: A binary stream supporting peek (e.g. a buffered file).
+    :return: A binary stream of the decompressed content (or the stream itself
+        if the content is not compressed).
+    """
+    compression = detect_compression(stream.peek(HEAD_LEN)[:HEAD_LEN])  # type: ignore
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream)  # type: ignore
+    if compression == "bz2":
+        return bz2.BZ2File(stream)  # type: ignore
+    if compression == "xz":
+        return lzma.LZMAFile(stream)  # type: ignore
+    return stream
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from hofs.common.functional import FunctionalIterator
+from hofs.common.grouping import GroupBy, merge_groups
+from hofs.common.spill import SpillFiles
+from hofs.common.table import Table
+from hofs.exceptions.exceptions import HofsException
+from hofs.filelike.file_likes import FileIterator, _FileTreeWalkIterator
+
+# The number of shards per worker (more shards balance the load better, but every shard
+# costs a process start) and the maximum depth up to which the tree is split
+_SHARDS_PER_WORKER = 4
+_MAX_SHARD_DEPTH = 3
+
+# A shard is a directory along with whether only its files (instead of its whole subtree)
+# belong to the shard
+_Shard = Tuple[str, bool]
+
+# The job of the worker processes, which inherit it when they are forked
+_job: Optional[Tuple[FunctionalIterator, List[_Shard], Callable[[Any], Any]]] = None
+
+
+def _sub_dirs(path: str, prune: Optional[Callable[[str], bool]]) -> List[str]:
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return []
+    return [
+        entry.path
+        for entry in entries
+        if entry.is_dir()
+        and not entry.is_symlink()
+        and (prune is None or not prune(entry.path))
+    ]
+
+
+def _shards(walker: _FileTreeWalkIterator, n_shards: int) -> List[_Shard]:
+    # Split the tree level by level until there are enough subtrees. The files of the
+    # directories that were split become shards of their own
+    files_only: List[str] = []
+    sub_trees = [walker.path]
+    for _ in range(_MAX_SHARD_DEPTH):
+        if len(sub_trees) >= n_shards:
+            break
+        files_only.extend(sub_trees)
+        sub_trees = [
+            sub_dir for path in sub_trees for sub_dir in _sub_dirs(path, walker.prune)
+        ]
+    return [(path, True) for path in files_only] + [(path, False) for path in sub_trees]
+
+
+def _walker(it: FunctionalIterator) -> Optional[_FileTreeWalkIterator]:
+    source = it._chain()[0]._source_iterator()
+    if not isinstance(source, _FileTreeWalkIterator) or source.started:
+        return None
+    return source
+
+
+# The following function runs in the worker processes
+
+
+def _run_shard(idx: int) -> Any:  # pragma: no cover
+    assert _job is not None
+    it, shards, partial = _job
+    walker = _walker(it)
+    assert walker is not None
+
+    path, files_only = shards[idx]
+    walker.pending_dirs = [path]
+    walker.files_only = {path} if files_only else set()
+    return partial(it)
+
+
+def _fork_shards(workers: int, n_shards: int) -> List[Any]:  # pragma: no cover
+    # Every shard gets a freshly forked process, which inherits the unused chain. This only
+    # runs on platforms that can fork, the rest of the distribution is tested on all
+    # platforms by running the shards in this process instead
+    context = multiprocessing.get_context("fork")
+    with context.Pool(workers, maxtasksperchild=1) as pool:
+        return pool.map(_run_shard, range(n_shards), chunksize=1)
+
+
+# The function running the shards of _job (given the number of workers and shards) and
+# returning their results, None if the platform can't fork processes
+_shard_runner: Optional[Callable[[int, int], List[Any]]] = (
+    _fork_shards if "fork" in multiprocessing.get_all_start_methods() else None
+)
+
+
+def _extremum(fun: Callable[..., Any]) -> Callable[[FunctionalIterator], List[Any]]:
+    # The partial of min or max: a shard without values sends an empty list
+    def partial(it: FunctionalIterator) -> List[Any]:
+        missing = object()
+        value = fun(it, default=missing)
+        return [] if value is missing else [value]
+
+    return partial
+
+
+class Distributed:
+    def __init__(self, it: FunctionalIterator, workers: Optional[int] = None) -> None:
+        """
+        An iterator chain that is executed by several processes (see
+        FunctionalIterator.distributed).
+
+        :param it: The last iterator of the chain.
+        :param workers: The number of worker processes (None for the number of CPUs).
+        """
+        if workers is not None and workers < 1:
+            raise HofsException(f"workers must be positive, but was {workers}")
+
+        self.it = it
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+
+    def _run(self, partial: Callable[[FunctionalIterator], Any]) -> List[Any]:
+        global _job
+
+        walker = _walker(self.it)
+        shard_runner = _shard_runner
+        if (
+            walker is None
+            or self.workers == 1
+            or any(it._sequential for it in self.it._chain())
+            or shard_runner is None
+        ):
+            return [partial(self.it)]
+
+        # Push the filters into the walk before splitting it, so that the shards don't
+        # include pruned directories (and the workers inherit the fixed plan)
+        first = self.it._chain()[0]
+        if isinstance(first, FileIterator):
+            first._start()
+
+        shards = _shards(walker, self.workers * _SHARDS_PER_WORKER)
+        _job = self.it, shards, partial
+        try:
+            return shard_runner(self.workers, len(shards))
+        finally:
+            _job = None
+            self.it.close()
+
+    def len(self) -> int:
+        return sum(self._run(lambda it: it.len()))
+
+    def sum(self) -> Any:
+        return sum(self._run(lambda it: it.sum()), 0)
+
+    def min(self) -> Any:
+        # Like FunctionalIterator.min, this fails if there are no values at all
+        return min(itertools.chain.from_iterable(self._run(_extremum(min))))
+
+    def max(self) -> Any:
+        return max(itertools.chain.from_iterable(self._run(_extremum(max))))
+
+    def count_distinct(
+        self,
+        key: Optional[Callable[[Any], Any]] = None,
+        approx: bool = False,
+        precision: int = 14,
+    ) -> int:
+        """
+        Count the distinct values (see FunctionalIterator.count_distinct).
+
+        If approx is True, every shard sends a HyperLogLog of 2 ** precision bytes, which
+        are merged. Otherwise, every shard sends its distinct values.
+
+        :param key: If given, values with the same key(value) are counted once.
+        :param approx: Whether to estimate the count.
+        :param precision: The precision of the HyperLogLog (only if approx is True).
+        :return: The (estimated) number of distinct values.
+        """
+        if not approx:
+            partials = self._run(lambda it: set(it if key is None else map(key, it)))
+            return len(set().union(*partials))
+
+        sketches = self._run(lambda it: it._hyper_log_log(key, precision))
+        for sketch in sketches[1:]:
+            sketches[0].merge(sketch)
+        return sketches[0].count
+
+    def top_n(self, n: int, key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        """
+        Get the n largest values (see FunctionalIterator.top_n).
+
+        Every shard sends only its n largest values, which are then merged.
+
+        :param n: The number of values.
+        :param key: If given, the values are compared by key(value).
+        :return: A list containing the n largest values in descending order.
+        """
+        partials = self._run(lambda it: it.top_n(n, key))
+        return heapq.nlargest(n, itertools.chain.from_iterable(partials), key=key)
+
+    def group_by(
+        self,
+        key: Callable[[Any], Any],
+        name: str = "key",
+        max_groups: Optional[int] = None,
+    ) -> GroupBy:
+        """
+        Group the values by a key (see FunctionalIterator.group_by).
+
+        Every shard aggregates its values, only the partial aggregates are merged.
+
+        :param key: The function computing the group key of a value.
+        :param name: The name of the key column of the aggregated table.
+        :param max_groups: The maximum number of groups held in memory by each shard.
+        :return: The grouped values, call agg to aggregate them.
+        """
+        return _DistributedGroupBy(self, key, name, max_groups)
+
+    def count_by(
+        self,
+        key: Callable[[Any], Any],
+        name: str = "key",
+        max_groups: Optional[int] = None,
+    ) -> Table:
+        return self.group_by(key, name, max_groups).agg(count="count")
+
+
+class _DistributedGroupBy(GroupBy):
+    def __init__(
+        self,
+        distributed: Distributed,
+        key: Callable[[Any], Any],
+        name: str,
+        max_groups: Optional[int],
+    ) -> None:
+        super().__init__([], key, name, max_groups)
+        self.distributed = distributed
+
+    def _groups(self, specs: Any, spill: SpillFiles) -> Iterator[Tuple[Any, Any]]:
+        def partial(it: FunctionalIterator) -> List[Tuple[Any, Any]]:
+            group_by = GroupBy(it, self.key, self.name, self.max_groups)
+            with SpillFiles() as shard_spill:
+                return list(group_by._groups(specs, shard_spill))
+
+        return merge_groups(self.distributed._run(partial), specs)
+
+
+# Add attributes to FunctionalIterator
+
+
+def distributed(self: FunctionalIterator, workers: Optional[int] = None) -> Distributed:
+    """
+    Execute this iterator chain in several processes.
+
+    The directory walk feeding the chain is split into shards (subtrees and the files
+    of single directories). Every shard is processed by its own (forked) process, which runs
+    the whole chain, including filters and maps, and reduces the values of its shard locally.
+    Only the partial results are sent back and merged, i.e. the values themselves never
+    pass through this process.
+
+    For example fs.Dir(".").files.filter_ext("py").t().map_lc().distributed(64).sum()
+    counts the lines of all py files using 64 processes.
+
+    The chain must be fed by a directory walk that hasn't started yet, and it can't be used
+    afterwards. If that's not the case, if the chain contains a stage that depends on the
+    values before the current one (take, skip, take_while, sample, distinct, batch or join),
+    or if the platform can't fork processes, the chain is executed in this process instead.
+    The partial results must be picklable.
+
+    :param workers: The number of worker processes (None for the number of CPUs).
+    :return: The distributed chain, which offers the terminals len, sum, min, max,
+        count_distinct, top_n, group_by and count_by.
+    """
+    return Distributed(self, workers)
+
+
+setattr(FunctionalIterator, "distributed", distributed)
@@ -1,28 +1,80 @@
+import copy
 import datetime
 import os
 import re
+from concurrent.futures import Executor
 from enum import Enum
-from typing import Any, Iterator, List, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from hofs.common.functional import FunctionalIterator
+from hofs.common import instrumentation
+from hofs.common.async_functional import AsyncFunctionalIterator
+from hofs.common.functional import FunctionalIterator, describe_source, fun_name
 from hofs.exceptions.exceptions import HofsException
 from hofs.filelike.file_like import FileLike
 from hofs.filesize.file_size import FileSize
-from hofs.paths.matches import (
-    path_matches_base,
-    path_matches_compiled_regex,
-    path_matches_glob,
-)
-from hofs.paths.paths import dir_exists, file_exists
+from hofs.paths.matches import path_matches_compiled_regex, path_matches_glob
+from hofs.paths.paths import dir_exists, expand_paths, file_exists, file_like_name
+
+
+def _extension(path: str) -> str:
+    _, ext = os.path.splitext(path)
+    return ext[1:] if len(ext) > 0 else ext
+
+
+def _in_base_paths(path: str, base_paths: List[str]) -> bool:
+    for base_path in base_paths:
+        if os.path.commonpath([path, base_path]) == base_path:
+            return True
+    return False
 
 
 class File(FileLike):
+    # Files shared between several consumers (see FunctionalIterator.broadcast)
+    # call stat at most once and remember the result. Files derived from a shared file
+    # (like its text file) use the stat result of their source
+    _shares_stat = False
+    _stat_result: Optional[os.stat_result] = None
+    _stat_source: Optional["File"] = None
+
     def __init__(self, path: str) -> None:
+        if instrumentation.hooks:
+            instrumentation.emit(instrumentation.STAT)
         if not file_exists(path):
             raise HofsException(f"There is no (regular) file at {path}")
 
         super(File, self).__init__(path)
 
+    def _stat(self) -> os.stat_result:
+        if self._stat_result is not None:
+            return self._stat_result
+        if self._stat_source is not None:
+            return self._stat_source._stat()
+
+        if instrumentation.hooks:
+            instrumentation.emit(instrumentation.STAT)
+        stat_result = os.stat(self.path)
+        if self._shares_stat:
+            self._stat_result = stat_result
+        return stat_result
+
+    def _with_shared_stat(self) -> "File":
+        file = copy.copy(self)
+        file._shares_stat = True
+        file._stat_result = None
+        return file
+
     @property
     def bytes(self) -> bytes:
         """
@@ -30,9 +82,14 @@ class File(FileLike):
 
         :return: The content bytes.
         """
-        with open(self.path, "rb") as file:
+        with self._open() as file:
             return file.read()
 
+    def _open(self) -> BinaryIO:
+        if instrumentation.hooks:
+            return instrumentation.open_counted(self.path)
+        return open(self.path, "rb")
+
     @property
     def dir(self) -> "Dir":
         """
@@ -51,8 +108,7 @@ class File(FileLike):
             returned. Otherwise, the extension *without* the preceding dot will be returned
             (e.g. "txt", *not* ".txt").
         """
-        _, ext = os.path.splitext(self.path)
-        return ext[1:] if len(ext) > 0 else ext
+        return _extension(self.path)
 
     ext = extension
 
@@ -63,7 +119,7 @@ class File(FileLike):
 
         :return: A FileSize object representing the size of this file (in bytes).
         """
-        return FileSize(os.path.getsize(self.path))
+        return FileSize(self._stat().st_size)
 
     @property
     def access_time(self) -> datetime.datetime:
@@ -72,7 +128,7 @@ class File(FileLike):
 
         :return: A datetime object representing the last access time.
         """
-        atime = os.path.getatime(self.path)
+        atime = self._stat().st_atime
         return datetime.datetime.fromtimestamp(atime)
 
     atime = access_time
@@ -84,11 +140,18 @@ class File(FileLike):
 
         :return: A datetime object representing the last modification time.
         """
-        mtime = os.path.getmtime(self.path)
+        mtime = self._stat().st_mtime
         return datetime.datetime.fromtimestamp(mtime)
 
     mtime = mod_time
 
+    @classmethod
+    def _unchecked(cls, path: str) -> "File":
+        # Used by the walker, which already knows that there is a regular file at path
+        file = cls.__new__(cls)
+        FileLike.__init__(file, path)
+        return file
+
     def __lt__(self, other: "File") -> bool:
         return self.size < other.size
 
@@ -107,37 +170,141 @@ class _FileTreeWalkIteratorKind(Enum):
 
 class _FileTreeWalkIterator(Iterator):
     def __init__(self, path: str, kind: _FileTreeWalkIteratorKind) -> None:
-        self.it = os.walk(path)
         self.path = path
-
         self.kind = kind
 
-        self.sub_dir_path, _, file_names = next(self.it)
-        self.sub_dir_processed = False
-        self.file_names = sorted(file_names)
+        # Predicates pushed down into the walk by FileIterator before the walk starts.
+        # Files whose path doesn't pass path_filter are skipped before a File object is created
+        # and directories for which prune returns True are not listed at all.
+        self.path_filter: Optional[Callable[[str], bool]] = None
+        self.prune: Optional[Callable[[str], bool]] = None
 
-    def __next__(self) -> FileLike:
-        if not self.sub_dir_processed and (
-            self.kind == _FileTreeWalkIteratorKind.BOTH
-            or self.kind == _FileTreeWalkIteratorKind.DIRS_ONLY
-        ):
-            self.sub_dir_processed = True
-            return Dir(self.sub_dir_path)
+        # The walk state: a stack of the directories that still have to be listed,
+        # the directory that was listed last and its (sorted) file names along with
+        # the index of the next file name
+        self.pending_dirs = [path]
+        self.sub_dir_path = path
+        self.file_names: List[str] = []
+        self.file_idx = 0
+        self.started = False
 
-        if len(self.file_names) != 0 and (
-            self.kind == _FileTreeWalkIteratorKind.BOTH
-            or self.kind == _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY
-        ):
-            file_name, *self.file_names = self.file_names
-            return File(os.path.join(self.sub_dir_path, file_name))
+        # The number of directory entries seen so far (for progress reports)
+        self.entries_visited = 0
+
+        # Directories whose files are listed but whose subdirectories are not walked
+        # (used for splitting a walk into shards, see FunctionalIterator.distributed)
+        self.files_only: Set[str] = set()
+
+    def describe(self) -> str:
+        return f"walk {self.path}"
+
+    def can_push_down(self) -> bool:
+        return not self.started and self.path_filter is None and self.prune is None
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Get the state of the walk (see restore).
 
+        :return: A dictionary containing the directories that still have to be listed and
+            the position in the listing of the current directory.
+        """
+        return {
+            "path": self.path,
+            "pending_dirs": list(self.pending_dirs),
+            "sub_dir_path": self.sub_dir_path,
+            "file_names": list(self.file_names),
+            "file_idx": self.file_idx,
+            "entries_visited": self.entries_visited,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Continue a walk of the same directory from a state returned by state.
+
+        :param state: The state.
+        """
+        if state["path"] != self.path:
+            raise HofsException(
+                f"The state belongs to a walk of {state['path']}, not of {self.path}"
+            )
+        self.pending_dirs = list(state["pending_dirs"])
+        self.sub_dir_path = state["sub_dir_path"]
+        self.file_names = list(state["file_names"])
+        self.file_idx = state["file_idx"]
+        self.entries_visited = state["entries_visited"]
+
+    def close(self) -> None:
+        # Forget everything that is left to walk
+        self.started = True
+        self.pending_dirs = []
+        self.file_names = []
+        self.file_idx = 0
+
+    def _scan(self, dir_path: str) -> Optional[List[os.DirEntry]]:
+        if instrumentation.hooks:
+            instrumentation.emit(instrumentation.LIST_DIR)
+
+        # Like os.walk, directories that can't be listed are skipped silently
         try:
-            self.sub_dir_path, _, file_names = next(self.it)
-            self.file_names = sorted(file_names)
-            self.sub_dir_processed = False
-            return next(self)
-        except StopIteration:
-            raise StopIteration
+            with os.scandir(dir_path) as it:
+                return sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return None
+
+    def _walks_into(self, entry: os.DirEntry) -> bool:
+        # Like os.walk, symbolic links to directories are not followed
+        return not entry.is_symlink() and (
+            self.prune is None or not self.prune(entry.path)
+        )
+
+    def _yields_file(self, entry: os.DirEntry) -> bool:
+        return (
+            self.kind != _FileTreeWalkIteratorKind.DIRS_ONLY
+            and entry.is_file()
+            and (self.path_filter is None or self.path_filter(entry.path))
+        )
+
+    def _list_dir(self, dir_path: str) -> bool:
+        entries = self._scan(dir_path)
+        if entries is None:
+            return False
+        self.entries_visited += len(entries)
+
+        sub_dir_paths, file_names = [], []
+        descend = dir_path not in self.files_only
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:  # pragma: no cover
+                is_dir = False
+
+            if is_dir:
+                if descend and self._walks_into(entry):
+                    sub_dir_paths.append(entry.path)
+            elif self._yields_file(entry):
+                file_names.append(entry.name)
+
+        self.sub_dir_path = dir_path
+        self.file_names = file_names
+        self.file_idx = 0
+        self.pending_dirs.extend(reversed(sub_dir_paths))
+        return True
+
+    def __next__(self) -> FileLike:
+        self.started = True
+        while True:
+            if self.file_idx < len(self.file_names):
+                file_name = self.file_names[self.file_idx]
+                self.file_idx += 1
+                return File._unchecked(os.path.join(self.sub_dir_path, file_name))
+
+            if len(self.pending_dirs) == 0:
+                raise StopIteration
+
+            if self._list_dir(self.pending_dirs.pop()) and (
+                self.kind != _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY
+            ):
+                return Dir(self.sub_dir_path)
 
 
 class Dir(FileLike):
@@ -183,6 +350,23 @@ class Dir(FileLike):
             )
         )
 
+    def afiles(
+        self, executor: Optional[Executor] = None, chunk_size: int = 64
+    ) -> AsyncFunctionalIterator["File"]:
+        """
+        An asynchronous iterator of (regular) files present in this directory and all
+        subdirectories.
+
+        The directory is walked in an executor, so the walk doesn't block the event loop.
+        This is equivalent to files.aiter(executor, chunk_size), use the latter to push
+        path-based filters into the walk (e.g. files.exclude(".git").aiter()).
+
+        :param executor: The executor. If None, the default executor of the event loop is used.
+        :param chunk_size: The number of files read at once.
+        :return: The asynchronous iterator.
+        """
+        return self.files.aiter(executor, chunk_size)
+
     @property
     def dirs(self) -> FunctionalIterator["Dir"]:
         """
@@ -197,8 +381,245 @@ class Dir(FileLike):
     def __repr__(self) -> str:
         return f'Dir("{self.path}")'
 
+    build_text_index: Any
+    build_trigram_index: Any
+
+
+def _compile_regexes(regexes: Union[str, List[str]]) -> List[re.Pattern]:
+    if isinstance(regexes, str):
+        regexes = [regexes]
+    return [re.compile(regex) for regex in regexes]
+
+
+class _FilePredicate:
+    def __init__(
+        self,
+        description: str,
+        fun: Callable[[Any], bool],
+        on_path: bool,
+        prune: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        self.description = description
+        self.fun = fun
+        # Whether fun takes the path of a file (and therefore never needs a stat call)
+        # instead of the File object
+        self.on_path = on_path
+        # Optionally a function telling whether no file below a directory can pass
+        self.prune = prune
+
+    def __call__(self, file: File) -> bool:
+        return self.fun(file.path if self.on_path else file)
+
+
+def _fuse(funs: List[Callable[[Any], bool]]) -> Callable[[Any], bool]:
+    if len(funs) == 1:
+        return funs[0]
+
+    def fused(value: Any) -> bool:
+        for fun in funs:
+            if not fun(value):
+                return False
+        return True
+
+    return fused
+
+
+_Plan = Tuple[List[_FilePredicate], List[_FilePredicate]]
+
+
+def _walk_keyed(files: Iterable["File"], root: str) -> Iterator[Tuple[Any, "File"]]:
+    # Pair the files with keys that increase in walk order. Within a directory, files come
+    # before subdirectories, so a file name is keyed (0, name) and a directory name (1, name)
+    prefix_len = len(os.path.join(root, ""))
+    for file in files:
+        parts = file.path[prefix_len:].split(os.sep)
+        yield tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),), file
+
+
+def _merge_join(
+    left: Iterator[Tuple[Any, "File"]], right: Iterator[Tuple[Any, "File"]], how: str
+) -> Iterator[Tuple[Optional["File"], Optional["File"]]]:
+    end: Tuple[Any, Any] = (None, None)
+    left_key, left_file = next(left, end)
+    right_key, right_file = next(right, end)
+    while left_file is not None and right_file is not None:
+        if left_key == right_key:
+            yield left_file, right_file
+            left_key, left_file = next(left, end)
+            right_key, right_file = next(right, end)
+        elif left_key < right_key:
+            if how != "inner":
+                yield left_file, None
+            left_key, left_file = next(left, end)
+        else:
+            if how == "outer":
+                yield None, right_file
+            right_key, right_file = next(right, end)
+
+    yield from _emit_unmatched(how != "inner", left_file, left, is_left=True)
+    yield from _emit_unmatched(how == "outer", right_file, right, is_left=False)
+
+
+def _emit_unmatched(
+    keep: bool,
+    first: Optional["File"],
+    rest: Iterator[Tuple[Any, "File"]],
+    is_left: bool,
+) -> Iterator[Tuple[Optional["File"], Optional["File"]]]:
+    # Pair the files left over on one side of a merge join (first and all files of rest)
+    # with None if the join keeps them
+    if not keep or first is None:
+        return
+    yield (first, None) if is_left else (None, first)
+    for _, file in rest:
+        yield (file, None) if is_left else (None, file)
+
 
 class FileIterator(FunctionalIterator["File"]):
+    def __init__(
+        self,
+        iterable: Iterable["File"],
+        predicates: Optional[List[_FilePredicate]] = None,
+    ) -> None:
+        """
+        An iterator of files.
+
+        Filters on a file iterator are not applied one by one. Instead they are collected
+        and optimized when the first file is requested: path-based filters (which need no
+        stat calls) run before all other filters, all filters are fused into a single
+        function and if the files come from a directory walk, path-based filters are pushed
+        into the walk (see explain).
+
+        :param iterable: The files.
+        :param predicates: The filters that have not been applied to iterable yet.
+        """
+        super().__init__([])
+        self._source = iterable
+        self._predicates = predicates if predicates is not None else []
+        self._parent = iterable if isinstance(iterable, FunctionalIterator) else None
+        self._executed_plan: Optional[_Plan] = None
+
+    def _plan(self) -> _Plan:
+        if self._executed_plan is not None:
+            return self._executed_plan
+
+        # Path predicates never need a stat call, so they come first (sorting is stable,
+        # i.e. the predicates are otherwise kept in the order in which they were given)
+        predicates = sorted(
+            self._predicates, key=lambda predicate: not predicate.on_path
+        )
+
+        pushed: List[_FilePredicate] = []
+        if (
+            isinstance(self._source, _FileTreeWalkIterator)
+            and self._source.can_push_down()
+        ):
+            pushed = [predicate for predicate in predicates if predicate.on_path]
+        remaining = [predicate for predicate in predicates if predicate not in pushed]
+        return pushed, remaining
+
+    def _execute(self, plan: _Plan) -> Iterator["File"]:
+        pushed, remaining = plan
+        if len(pushed) != 0:
+            assert isinstance(self._source, _FileTreeWalkIterator)
+            self._source.path_filter = _fuse([predicate.fun for predicate in pushed])
+
+            prunes = [predicate.prune for predicate in pushed if predicate.prune]
+            if len(prunes) != 0:
+                self._source.prune = lambda path: any(prune(path) for prune in prunes)
+
+        it = iter(self._source)
+        if len(remaining) != 0:
+            it = filter(_fuse(remaining), it)  # type: ignore
+        return it
+
+    def _start(self) -> None:
+        # Fix the plan (i.e. push the filters into the walk) without requesting any files
+        self._executed_plan = self._plan()
+        self.it = self._execute(self._executed_plan)
+
+    def __next__(self) -> "File":
+        if self._executed_plan is None:
+            self._start()
+        return next(self.it)
+
+    def close(self) -> None:
+        if self._executed_plan is None:
+            self._executed_plan = [], []
+        self.it = iter([])
+
+        close = getattr(self._source, "close", None)
+        if close is not None:
+            close()
+
+    def _same_kind(self, iterable: Iterable["File"]) -> "FileIterator":
+        return FileIterator(iterable)
+
+    def _share_chunk(self, chunk: List["File"]) -> List["File"]:
+        return [file._with_shared_stat() for file in chunk]
+
+    def _source_iterator(self) -> Any:
+        return self._source
+
+    def _plan_lines(self) -> List[str]:
+        pushed, remaining = self._plan()
+
+        lines = []
+        prunes = [predicate.description for predicate in pushed if predicate.prune]
+        if len(prunes) != 0:
+            lines.append("  prune directories: " + ", ".join(prunes))
+        if len(pushed) != 0:
+            lines.append(
+                "  filter paths: "
+                + " AND ".join(predicate.description for predicate in pushed)
+            )
+        if len(remaining) != 0:
+            lines.append(
+                "filter: "
+                + " AND ".join(predicate.description for predicate in remaining)
+            )
+        return lines
+
+    def _explain_lines(self) -> List[str]:
+        if self._parent is not None:
+            lines = self._parent._explain_lines()
+        else:
+            lines = [describe_source(self._source)]
+        if self._stage is not None:
+            lines.append(self._stage)
+        return lines + self._plan_lines()
+
+    def _stage_name(self) -> str:
+        lines = ([self._stage] if self._stage is not None else []) + self._plan_lines()
+        if len(lines) == 0:
+            return "FileIterator"
+        return "; ".join(line.strip() for line in lines)
+
+    def _with(self, predicate: _FilePredicate) -> "FileIterator":
+        if self._executed_plan is not None:
+            # The plan of this iterator is fixed already, so we can only filter its output
+            return FileIterator(self, [predicate])
+        result = FileIterator(self._source, self._predicates + [predicate])
+        result._parent, result._stage = self._parent, self._stage
+        return result
+
+    def _with_path(
+        self,
+        description: str,
+        fun: Callable[[str], bool],
+        prune: Optional[Callable[[str], bool]] = None,
+    ) -> "FileIterator":
+        return self._with(_FilePredicate(description, fun, True, prune))
+
+    def filter(self, fun: Callable[["File"], bool]) -> "FileIterator":
+        """
+        Filter the files.
+
+        :param fun: The filter function.
+        :return: A file iterator containing the files for which fun returns True.
+        """
+        return self._with(_FilePredicate(fun_name(fun), fun, False))
+
     def filter_extension(self, extension: str) -> "FileIterator":
         """
         Filter the files by extension.
@@ -208,25 +629,28 @@ class FileIterator(FunctionalIterator["File"]):
         :param extension: The extension (must be given without the preceding dot).
         :return: A file iterator containing the files that have the given extension.
         """
-        return FileIterator(self.filter(lambda file: file.extension == extension))
+        return self._with_path(
+            f"filter_extension({extension!r})",
+            lambda path: _extension(path) == extension,
+        )
 
     def filter_path_regex(self, regex: str) -> "FileIterator":
         compiled_regex = re.compile(regex)
-        return FileIterator(
-            self.filter(
-                lambda file: path_matches_compiled_regex(file.path, compiled_regex)
-            )
+        return self._with_path(
+            f"filter_path_regex({regex!r})",
+            lambda path: path_matches_compiled_regex(path, compiled_regex),
         )
 
     def filter_path_glob(self, glob: str) -> "FileIterator":
-        return FileIterator(
-            self.filter(lambda file: path_matches_glob(file.path, glob))
+        return self._with_path(
+            f"filter_path_glob({glob!r})", lambda path: path_matches_glob(path, glob)
         )
 
     def filter_name(self, regex: str) -> "FileIterator":
         compiled_regex = re.compile(regex)
-        return FileIterator(
-            self.filter(lambda file: bool(compiled_regex.fullmatch(file.name)))
+        return self._with_path(
+            f"filter_name({regex!r})",
+            lambda path: bool(compiled_regex.fullmatch(file_like_name(path))),
         )
 
     filter_ext = filter_extension
@@ -256,8 +680,17 @@ class FileIterator(FunctionalIterator["File"]):
         :param file_likes: The list of file-like objects.
         :return: A file iterator containing the included files.
         """
-        return FileIterator(
-            self.filter(lambda file: path_matches_base(file.path, file_likes))
+        base_paths = expand_paths(
+            [file_likes] if isinstance(file_likes, str) else file_likes
+        )
+        return self._with_path(
+            f"include({file_likes!r})",
+            lambda path: _in_base_paths(path, base_paths),
+            # Directories that are neither below nor above an included path can be skipped
+            lambda path: not any(
+                _in_base_paths(path, [base_path]) or _in_base_paths(base_path, [path])
+                for base_path in base_paths
+            ),
         )
 
     def exclude(self, file_likes: Union[str, List[str]]) -> "FileIterator":
@@ -267,8 +700,13 @@ class FileIterator(FunctionalIterator["File"]):
         :param file_likes: The list of file-like objects.
         :return: A file iterator containing the non-excluded files.
         """
-        return FileIterator(
-            self.filter(lambda file: not path_matches_base(file.path, file_likes))
+        base_paths = expand_paths(
+            [file_likes] if isinstance(file_likes, str) else file_likes
+        )
+        return self._with_path(
+            f"exclude({file_likes!r})",
+            lambda path: not _in_base_paths(path, base_paths),
+            lambda path: _in_base_paths(path, base_paths),
         )
 
     def include_or_exclude(
@@ -294,8 +732,9 @@ class FileIterator(FunctionalIterator["File"]):
         :param patterns: The list of globs.
         :return: A file iterator containing the included files.
         """
-        return FileIterator(
-            self.filter(lambda file: path_matches_glob(file.path, patterns))
+        return self._with_path(
+            f"include_glob({patterns!r})",
+            lambda path: path_matches_glob(path, patterns),
         )
 
     def exclude_glob(self, patterns: Union[str, List[str]]) -> "FileIterator":
@@ -305,8 +744,9 @@ class FileIterator(FunctionalIterator["File"]):
         :param patterns: The list of globs.
         :return: A file iterator containing the non-excluded files.
         """
-        return FileIterator(
-            self.filter(lambda file: not path_matches_glob(file.path, patterns))
+        return self._with_path(
+            f"exclude_glob({patterns!r})",
+            lambda path: not path_matches_glob(path, patterns),
         )
 
     def include_or_exclude_glob(
@@ -328,11 +768,10 @@ class FileIterator(FunctionalIterator["File"]):
         :param regexes: The list of regexes.
         :return: A file iterator containing the included files.
         """
-        compiled_regexes = [re.compile(regex) for regex in regexes]
-        return FileIterator(
-            self.filter(
-                lambda file: path_matches_compiled_regex(file.path, compiled_regexes)
-            )
+        compiled_regexes = _compile_regexes(regexes)
+        return self._with_path(
+            f"include_regex({regexes!r})",
+            lambda path: path_matches_compiled_regex(path, compiled_regexes),
         )
 
     def exclude_regex(self, regexes: Union[str, List[str]]) -> "FileIterator":
@@ -342,13 +781,10 @@ class FileIterator(FunctionalIterator["File"]):
         :param regexes: The list of regexes.
         :return: A file iterator containing the non-excluded files.
         """
-        compiled_regexes = [re.compile(regex) for regex in regexes]
-        return FileIterator(
-            self.filter(
-                lambda file: not path_matches_compiled_regex(
-                    file.path, compiled_regexes
-                )
-            )
+        compiled_regexes = _compile_regexes(regexes)
+        return self._with_path(
+            f"exclude_regex({regexes!r})",
+            lambda path: not path_matches_compiled_regex(path, compiled_regexes),
         )
 
     def include_or_exclude_regex(
@@ -363,5 +799,51 @@ class FileIterator(FunctionalIterator["File"]):
         """
         return self.include_regex(regexes) if include else self.exclude_regex(regexes)
 
+    def _walk_root(self) -> str:
+        source = self._chain()[0]._source_iterator()
+        if not isinstance(source, _FileTreeWalkIterator):
+            raise HofsException(
+                "Only file iterators fed by a directory walk can be joined"
+            )
+        return source.path
+
+    def join(
+        self, other: "FileIterator", on: str = "relpath", how: str = "inner"
+    ) -> FunctionalIterator[Tuple[Optional["File"], Optional["File"]]]:
+        """
+        Join the files of two directory walks by their paths relative to the walked directories.
+
+        For example fs.Dir("src").files.join(fs.Dir("backup").files, how="outer") pairs every
+        file in src with its copy in backup.
+
+        Both walks return the files in the same order (the files of a directory sorted by name,
+        followed by its subdirectories sorted by name), so this is a streaming merge join. It
+        holds only the current file of every walk in memory.
+
+        :param other: The other file iterator (it must be fed by a directory walk).
+        :param on: What to join on (only "relpath" is supported).
+        :param how: "inner" for pairs of matching files only, "left" to also pair files of this
+            iterator without a match with None, "outer" to also pair files of the other
+            iterator without a match with None (as the second and first value respectively).
+        :return: A functional iterator containing the pairs of files in walk order.
+        """
+        if on != "relpath":
+            raise HofsException(f'Files can only be joined on "relpath", not on {on!r}')
+        if how not in ["inner", "left", "outer"]:
+            raise HofsException(
+                f'how must be "inner", "left" or "outer", but was {how!r}'
+            )
+
+        return self._then(
+            _merge_join(
+                _walk_keyed(self, self._walk_root()),
+                _walk_keyed(other, other._walk_root()),
+                how,
+            ),
+            f"join: {how} on {on}",
+            True,
+        )
+
+    scan_literals: Any
     text_file_iterator: Any
     t: Any
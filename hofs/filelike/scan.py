@@ -0,0 +1,79 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from hofs.common.aho_corasick import AhoCorasick
+from hofs.common.functional import FunctionalIterator
+from hofs.filelike.file_likes import File, FileIterator
+
+_Match = Tuple[str, int, Union[str, bytes]]
+
+# The automaton of a worker process (set once per worker by the pool initializer)
+_worker_automaton: Optional[AhoCorasick] = None
+
+
+def _scan_file(automaton: AhoCorasick, file: File) -> List[_Match]:
+    with file._open() as stream:
+        return [
+            (file.path, offset, pattern) for offset, pattern in automaton.scan(stream)
+        ]
+
+
+# The following functions run in the worker processes
+
+
+def _init_worker(patterns: Sequence[Union[str, bytes]]) -> None:  # pragma: no cover
+    global _worker_automaton
+    _worker_automaton = AhoCorasick(patterns)
+
+
+def _scan_path(path: str) -> List[_Match]:  # pragma: no cover
+    assert _worker_automaton is not None
+    return _scan_file(_worker_automaton, File(path))
+
+
+def _scan_parallel(
+    files: FileIterator, patterns: Sequence[Union[str, bytes]], workers: int
+) -> Iterator[_Match]:
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(list(patterns),)
+    ) as executor:
+        # Submit the files in batches so that a huge iterator isn't listed all at once
+        paths = files.map_path()
+        batch = list(itertools.islice(paths, workers * 16))
+        while len(batch) != 0:
+            for matches in executor.map(_scan_path, batch):
+                yield from matches
+            batch = list(itertools.islice(paths, workers * 16))
+
+
+# Add attributes to FileIterator
+
+
+def scan_literals(
+    self: FileIterator,
+    patterns: Sequence[Union[str, bytes]],
+    workers: Optional[int] = None,
+) -> FunctionalIterator[_Match]:
+    """
+    Find all occurrences of a list of literal strings in the raw bytes of the files.
+
+    All patterns are matched at once using an Aho-Corasick automaton, i.e. every file is read
+    exactly once, independently of the number of patterns.
+
+    :param patterns: The literals to look for. Strings are encoded as UTF-8.
+    :param workers: If given, the files are scanned by this many worker processes.
+        Note that workers re-open the files by path, so this only works for regular files.
+    :return: A functional iterator containing (path, offset, pattern) tuples, where offset is
+        the byte offset of the occurrence. The files are in the same order as in this iterator.
+    """
+    if workers is not None:
+        return FunctionalIterator(_scan_parallel(self, patterns, workers))
+
+    automaton = AhoCorasick(patterns)
+    return FunctionalIterator(
+        match for file in self for match in _scan_file(automaton, file)
+    )
+
+
+setattr(FileIterator, "scan_literals", scan_literals)
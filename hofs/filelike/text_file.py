@@ -1,4 +1,9 @@
+import io
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, TextIO
+
 from hofs.common.functional import FunctionalIterator
+from hofs.filelike.compression import HEAD_LEN, detect_compression, open_decompressed
 from hofs.filelike.file_likes import File, FileIterator
 
 
@@ -8,6 +13,32 @@ class TextFile(File):
 
         self.encoding = encoding
 
+    @contextmanager
+    def _open_text(self) -> Iterator[TextIO]:
+        with self._open() as raw:
+            with io.TextIOWrapper(
+                open_decompressed(raw), encoding=self.encoding
+            ) as file:
+                yield file
+
+    def _iter_lines(self) -> Iterator[str]:
+        with self._open_text() as file:
+            yield from file
+
+    @property
+    def compression(self) -> Optional[str]:
+        """
+        The compression format of this file.
+
+        The format is detected from the bytes at the start of the file (and not from the
+        extension). Compressed files are transparently decompressed by all properties
+        of this class.
+
+        :return: "gzip", "bz2" or "xz" for compressed files, None for uncompressed files.
+        """
+        with self._open() as raw:
+            return detect_compression(raw.read(HEAD_LEN))
+
     @property
     def content(self) -> str:
         """
@@ -15,7 +46,7 @@ class TextFile(File):
 
         :return: The content.
         """
-        with open(str(self.path), "r", encoding=self.encoding) as file:
+        with self._open_text() as file:
             return file.read()
 
     @property
@@ -23,19 +54,20 @@ class TextFile(File):
         """
         The lines of this file.
 
-        :return: A list of lines.
+        The lines are read lazily, i.e. only one line is held in memory at a time.
+
+        :return: An iterator of lines.
         """
-        with open(str(self.path), "r", encoding=self.encoding) as file:
-            return FunctionalIterator(file.readlines())
+        return FunctionalIterator(self._iter_lines())
 
     @property
     def words(self) -> FunctionalIterator[str]:
         """
         The words of this file. It is assumed that words are separated by whitespace.
 
-        :return: A list of words.
+        :return: An iterator of words.
         """
-        return FunctionalIterator(self.content.split())
+        return FunctionalIterator(word for line in self.lines for word in line.split())
 
     @property
     def char_count(self) -> int:
@@ -44,7 +76,7 @@ class TextFile(File):
 
         :return: The number of characters.
         """
-        return len(self.content)
+        return self.lines.map(len).sum()
 
     cc = char_count
 
@@ -75,6 +107,12 @@ class TextFile(File):
 
 
 class TextFileIterator(FunctionalIterator[TextFile]):
+    def _same_kind(self, iterable: Iterable[TextFile]) -> "TextFileIterator":
+        return TextFileIterator(iterable)
+
+    def _share_chunk(self, chunk: List[TextFile]) -> List[TextFile]:
+        return [file._with_shared_stat() for file in chunk]  # type: ignore
+
     def map_char_count(self) -> FunctionalIterator[int]:
         """
         Map the files to their character counts.
@@ -128,7 +166,15 @@ def text_file(self: File, encoding: str = "utf-8") -> "TextFile":
     :param encoding: The encoding to use.
     :return: The obtained TextFile object.
     """
-    return TextFile(self.path, encoding)
+    if not self._shares_stat:
+        return TextFile(self.path, encoding)
+
+    # The file is shared by the sinks of a broadcast, so it is known to exist and its
+    # stat result is shared with the text file
+    file = TextFile._unchecked(self.path)
+    file.encoding = encoding  # type: ignore
+    file._stat_source = self
+    return file  # type: ignore
 
 
 setattr(File, "text_file", text_file)
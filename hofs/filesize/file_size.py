@@ -22,6 +22,9 @@ class FileSize:
     def __int__(self) -> int:
         return self.size_bytes
 
+    def __float__(self) -> float:
+        return float(self.size_bytes)
+
     def __add__(self, other: Any) -> "FileSize":
         return FileSize(int(self) + int(other))
 
@@ -0,0 +1,15 @@
+from hofs.index.file_index import FileIndex
+from hofs.index.text_index import TextIndex, tokenize_lines
+from hofs.index.trigram_index import TrigramIndex, regex_trigram_query, trigrams
+
+__all__ = [
+    # file_index
+    "FileIndex",
+    # text_index
+    "TextIndex",
+    "tokenize_lines",
+    # trigram_index
+    "TrigramIndex",
+    "regex_trigram_query",
+    "trigrams",
+]
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from hofs.exceptions.exceptions import HofsException
+from hofs.filelike.file_likes import Dir
+from hofs.paths.paths import expand_path
+
+_FILES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+IndexT = TypeVar("IndexT", bound="FileIndex")
+
+
+class FileIndex(ABC):
+    """
+    Base class for persistent (SQLite-backed) indexes over the files of a directory.
+
+    The index stores the size and modification time of every indexed file.
+    When refreshing, only files that are new or whose size or modification time changed
+    are re-indexed, and files that no longer exist are removed from the index.
+    """
+
+    _schema: str
+
+    def __init__(self, index_path: str, dir_path: str) -> None:
+        self.index_path = expand_path(index_path)
+        self.dir_path = Dir(dir_path).path
+
+        self._conn = sqlite3.connect(self.index_path)
+        self._conn.executescript(_FILES_SCHEMA + self._schema)
+
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'dir_path'"
+        ).fetchone()
+        if row is None:
+            self._conn.execute(
+                "INSERT INTO meta VALUES ('dir_path', ?)", (self.dir_path,)
+            )
+            self._conn.commit()
+        elif row[0] != self.dir_path:
+            raise HofsException(
+                f"the index at {self.index_path} was built for {row[0]}, not for {self.dir_path}"
+            )
+
+    @staticmethod
+    @abstractmethod
+    def _extract(path: str) -> Any:
+        """
+        Extract the data to index from a file.
+
+        This is called in worker processes, so it must be a picklable (i.e. module-level)
+        function and the result must be picklable as well.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    def _store(self, file_id: int, data: Any) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    @abstractmethod
+    def _delete(self, file_id: int) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def _changed_files(self) -> Tuple[List[Tuple[str, int, int]], List[int]]:
+        stored: Dict[str, Tuple[int, int, int]] = {
+            path: (file_id, size, mtime_ns)
+            for file_id, path, size, mtime_ns in self._conn.execute(
+                "SELECT id, path, size, mtime_ns FROM files"
+            )
+        }
+
+        changed = []
+        for path in Dir(self.dir_path).files.map_path():
+            stat = os.stat(path)
+            stored_file = stored.pop(path, None)
+            if stored_file is None or stored_file[1:] != (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                changed.append((path, stat.st_size, stat.st_mtime_ns))
+
+        removed = [file_id for file_id, _, _ in stored.values()]
+        return changed, removed
+
+    def refresh(self, workers: Optional[int] = None) -> None:
+        """
+        Bring the index up to date with the directory.
+
+        :param workers: The number of worker processes used for extracting the data from
+            new and changed files. If None, the number of CPUs is used. If 1, everything
+            happens in the current process.
+        """
+        changed, removed = self._changed_files()
+        paths = [path for path, _, _ in changed]
+
+        extract: Callable[[str], Any] = type(self)._extract
+        if workers == 1 or len(paths) <= 1:
+            results: Iterator[Any] = map(extract, paths)
+            self._update(changed, removed, results)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(extract, paths, chunksize=64)
+                self._update(changed, removed, results)
+
+    def _update(
+        self,
+        changed: List[Tuple[str, int, int]],
+        removed: List[int],
+        results: Iterator[Any],
+    ) -> None:
+        with self._conn:
+            for file_id in removed:
+                self._delete(file_id)
+                self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+            for (path, size, mtime_ns), data in zip(changed, results):
+                row = self._conn.execute(
+                    "SELECT id FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if row is None:
+                    cursor = self._conn.execute(
+                        "INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                        (path, size, mtime_ns),
+                    )
+                    file_id = cursor.lastrowid  # type: ignore
+                else:
+                    file_id = row[0]
+                    self._delete(file_id)
+                    self._conn.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                        (size, mtime_ns, file_id),
+                    )
+                self._store(file_id, data)
+
+    @property
+    def n_files(self) -> int:
+        """
+        The number of indexed files.
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Close the index.
+        """
+        self._conn.close()
+
+    def __enter__(self: IndexT) -> IndexT:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
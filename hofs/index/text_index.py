@@ -0,0 +1,124 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from hofs.common.functional import FunctionalIterator
+from hofs.filelike.compression import DECOMPRESSION_ERRORS
+from hofs.filelike.file_likes import Dir
+from hofs.filelike.text_file import TextFile, TextFileIterator
+from hofs.index.file_index import FileIndex
+from hofs.paths.paths import file_exists
+
+_TOKEN_REGEX = re.compile(r"\w+")
+
+
+def tokenize_lines(path: str, encoding: str = "utf-8") -> Dict[str, List[int]]:
+    """
+    Get the tokens of a text file along with the (1-based) numbers of the lines they occur in.
+
+    Tokens are maximal runs of word characters (letters, digits and underscores), i.e. a line
+    like "foo(bar_baz)" contains the tokens "foo" and "bar_baz".
+    Files that can't be read (e.g. corrupt compressed files) or decoded using the given
+    encoding have no tokens, so a single broken file doesn't abort an index refresh.
+
+    :param path: The path of the text file.
+    :param encoding: The encoding to use.
+    :return: A dictionary mapping every token to the sorted line numbers it occurs in.
+    """
+    tokens: Dict[str, List[int]] = {}
+    try:
+        for line_no, line in enumerate(TextFile(path, encoding).lines, start=1):
+            for token in set(_TOKEN_REGEX.findall(line)):
+                tokens.setdefault(token, []).append(line_no)
+    except (UnicodeDecodeError, *DECOMPRESSION_ERRORS):
+        return {}
+    return tokens
+
+
+class TextIndex(FileIndex):
+    _schema = """
+    CREATE TABLE IF NOT EXISTS postings (
+        token TEXT NOT NULL,
+        file_id INTEGER NOT NULL,
+        lines TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS postings_token ON postings (token);
+    CREATE INDEX IF NOT EXISTS postings_file_id ON postings (file_id);
+    """
+
+    @staticmethod
+    def _extract(path: str) -> Dict[str, List[int]]:
+        return tokenize_lines(path)
+
+    def _store(self, file_id: int, data: Dict[str, List[int]]) -> None:
+        self._conn.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?)",
+            [
+                (token, file_id, ",".join(map(str, line_nos)))
+                for token, line_nos in data.items()
+            ],
+        )
+
+    def _delete(self, file_id: int) -> None:
+        self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+
+    def _postings(self, token: str) -> List[Tuple[str, str]]:
+        return [
+            (path, line_nos)
+            for path, line_nos in self._conn.execute(
+                "SELECT files.path, postings.lines FROM postings "
+                "JOIN files ON files.id = postings.file_id "
+                "WHERE postings.token = ? ORDER BY files.path",
+                (token,),
+            )
+            if file_exists(path)
+        ]
+
+    def query(self, token: str) -> TextFileIterator:
+        """
+        Get the text files containing a token.
+
+        Note that this only looks at the index, call refresh first if the directory
+        might have changed since the index was built.
+
+        :param token: The token.
+        :return: A text file iterator containing the files the token occurs in.
+        """
+        return TextFileIterator([TextFile(path) for path, _ in self._postings(token)])
+
+    def query_lines(self, token: str) -> FunctionalIterator[Tuple[TextFile, int]]:
+        """
+        Get the lines containing a token.
+
+        :param token: The token.
+        :return: A functional iterator containing (text file, line number) tuples.
+        """
+        return FunctionalIterator(
+            [
+                (TextFile(path), int(line_no))
+                for path, line_nos in self._postings(token)
+                for line_no in line_nos.split(",")
+            ]
+        )
+
+
+# Add attributes to Dir
+
+
+def build_text_index(
+    self: Dir, index_path: str, workers: Optional[int] = None
+) -> TextIndex:
+    """
+    Build (or refresh) a persistent inverted index of the tokens of all files in this directory.
+
+    If there already is an index at index_path, only new and changed files are re-indexed.
+
+    :param index_path: The path of the index file.
+    :param workers: The number of worker processes used for tokenizing the files.
+    :return: The text index.
+    """
+    index = TextIndex(index_path, self.path)
+    index.refresh(workers)
+    return index
+
+
+setattr(Dir, "build_text_index", build_text_index)
@@ -0,0 +1,228 @@
+import re
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from hofs.common.functional import FunctionalIterator
+from hofs.filelike.compression import DECOMPRESSION_ERRORS
+from hofs.filelike.file_likes import Dir
+from hofs.filelike.text_file import TextFile, TextFileIterator
+from hofs.index.file_index import FileIndex
+from hofs.paths.paths import file_exists
+
+try:
+    import re._parser as _regex_parser  # type: ignore
+except ImportError:  # pragma: no cover
+    import sre_parse as _regex_parser  # Python < 3.11
+
+# SQLite limits the number of parameters of a statement (to 999 in older versions)
+_MAX_SQL_PARAMS = 500
+
+# A trigram query is either None (matches every file) or a tuple of the form
+# ("tri", trigram), ("and", [queries]) or ("or", [queries])
+_Query = Optional[Tuple[str, Any]]
+
+
+def _line_trigrams(line: str) -> Set[str]:
+    return {a + b + c for a, b, c in zip(line, line[1:], line[2:])}
+
+
+def trigrams(path: str, encoding: str = "utf-8") -> Set[str]:
+    """
+    Get the trigrams (i.e. substrings of length 3) occurring in the lines of a text file.
+
+    Files that can't be read (e.g. corrupt compressed files) or decoded using the given
+    encoding have no trigrams.
+
+    :param path: The path of the text file.
+    :param encoding: The encoding to use.
+    :return: The set of trigrams.
+    """
+    result: Set[str] = set()
+    try:
+        for line in TextFile(path, encoding).lines:
+            result.update(_line_trigrams(line.rstrip("\n")))
+    except (UnicodeDecodeError, *DECOMPRESSION_ERRORS):
+        return set()
+    return result
+
+
+def _and(queries: List[_Query]) -> _Query:
+    queries = [query for query in queries if query is not None]
+    if len(queries) == 0:
+        return None
+    return queries[0] if len(queries) == 1 else ("and", queries)
+
+
+def _literal_query(literal: str) -> _Query:
+    # Lines are indexed without their line terminator, so no trigram spans a newline
+    literal_trigrams = set().union(*map(_line_trigrams, literal.split("\n")))
+    return _and([("tri", trigram) for trigram in sorted(literal_trigrams)])
+
+
+def _sequence_query(items: Any) -> _Query:
+    queries: List[_Query] = []
+    literal = ""
+    for op, av in items:
+        op = str(op)
+        if op == "LITERAL":
+            literal += chr(av)
+            continue
+
+        queries.append(_literal_query(literal))
+        literal = ""
+        if op == "SUBPATTERN":
+            _, add_flags, _, sub_items = av
+            if not add_flags & re.IGNORECASE:
+                queries.append(_sequence_query(sub_items))
+        elif op == "BRANCH":
+            branches = [_sequence_query(branch) for branch in av[1]]
+            if None not in branches:
+                queries.append(("or", branches))
+        elif op in ["MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"]:
+            min_count, _, sub_items = av
+            if min_count >= 1:
+                queries.append(_sequence_query(sub_items))
+    queries.append(_literal_query(literal))
+    return _and(queries)
+
+
+def regex_trigram_query(regex: str) -> _Query:
+    """
+    Translate a regular expression into a trigram query.
+
+    Every string matched by the regular expression contains the trigrams required by the query.
+    The translation is conservative, i.e. constructs it doesn't understand (like character
+    classes or case-insensitive matching) don't restrict the query.
+
+    :param regex: The regular expression.
+    :return: None if the regular expression doesn't require any trigrams. Otherwise, a tuple
+        ("tri", trigram), ("and", [queries]) or ("or", [queries]).
+    """
+    parsed = _regex_parser.parse(regex)
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    return _sequence_query(parsed)
+
+
+class TrigramIndex(FileIndex):
+    _schema = """
+    CREATE TABLE IF NOT EXISTS trigrams (
+        trigram TEXT NOT NULL,
+        file_id INTEGER NOT NULL,
+        PRIMARY KEY (trigram, file_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS trigrams_file_id ON trigrams (file_id);
+    """
+
+    @staticmethod
+    def _extract(path: str) -> Set[str]:
+        return trigrams(path)
+
+    def _store(self, file_id: int, data: Set[str]) -> None:
+        self._conn.executemany(
+            "INSERT INTO trigrams VALUES (?, ?)",
+            [(trigram, file_id) for trigram in data],
+        )
+
+    def _delete(self, file_id: int) -> None:
+        self._conn.execute("DELETE FROM trigrams WHERE file_id = ?", (file_id,))
+
+    def _file_ids(self, query: _Query) -> Optional[Set[int]]:
+        if query is None:
+            return None
+
+        kind, value = query
+        if kind == "tri":
+            return {
+                file_id
+                for file_id, in self._conn.execute(
+                    "SELECT file_id FROM trigrams WHERE trigram = ?", (value,)
+                )
+            }
+
+        file_id_sets = [self._file_ids(sub_query) for sub_query in value]
+        if kind == "and":
+            return set.intersection(*file_id_sets)  # type: ignore
+        return set.union(*file_id_sets)  # type: ignore
+
+    def _paths(self, file_ids: Optional[Set[int]]) -> List[str]:
+        if file_ids is None:
+            return [
+                path
+                for path, in self._conn.execute("SELECT path FROM files ORDER BY path")
+            ]
+
+        # Only select the candidates (in batches to stay below the parameter limit)
+        ids = sorted(file_ids)
+        paths: List[str] = []
+        for start in range(0, len(ids), _MAX_SQL_PARAMS):
+            end = start + _MAX_SQL_PARAMS
+            batch = ids[start:end]
+            placeholders = ", ".join("?" * len(batch))
+            paths.extend(
+                path
+                for path, in self._conn.execute(
+                    f"SELECT path FROM files WHERE id IN ({placeholders})", batch
+                )
+            )
+        return sorted(paths)
+
+    def candidates(self, regex: str) -> TextFileIterator:
+        """
+        Get the text files that might contain a match of a regular expression.
+
+        Note that this only looks at the index, call refresh first if the directory
+        might have changed since the index was built.
+
+        :param regex: The regular expression.
+        :return: A text file iterator containing the candidate files.
+        """
+        paths = self._paths(self._file_ids(regex_trigram_query(regex)))
+        return TextFileIterator([TextFile(path) for path in paths if file_exists(path)])
+
+    def search(self, regex: str) -> FunctionalIterator[Tuple[TextFile, int, str]]:
+        """
+        Search the lines of all files for a regular expression.
+
+        The index is used to narrow down the candidate files, only the candidates are
+        actually searched.
+
+        :param regex: The regular expression.
+        :return: A functional iterator containing (text file, line number, line) tuples for
+            every line containing a match.
+        """
+        compiled_regex = re.compile(regex)
+        candidates = self.candidates(regex)
+
+        def matches() -> Iterator[Tuple[TextFile, int, str]]:
+            for text_file in candidates:
+                try:
+                    for line_no, line in enumerate(text_file.lines, start=1):
+                        if compiled_regex.search(line):
+                            yield text_file, line_no, line
+                except (UnicodeDecodeError, *DECOMPRESSION_ERRORS):
+                    continue
+
+        return FunctionalIterator(matches())
+
+
+# Add attributes to Dir
+
+
+def build_trigram_index(
+    self: Dir, index_path: str, workers: Optional[int] = None
+) -> TrigramIndex:
+    """
+    Build (or refresh) a persistent trigram index of all files in this directory.
+
+    If there already is an index at index_path, only new and changed files are re-indexed.
+
+    :param index_path: The path of the index file.
+    :param workers: The number of worker processes used for extracting the trigrams.
+    :return: The trigram index.
+    """
+    index = TrigramIndex(index_path, self.path)
+    index.refresh(workers)
+    return index
+
+
+setattr(Dir, "build_trigram_index", build_trigram_index)
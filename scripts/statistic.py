@@ -37,34 +37,36 @@ files = (
     .text_file_iterator()
 )
 
-table = fs.Table(cols=["Path", "Total lines", "Source lines", "Blank lines"])
-
-total_lines_all, source_lines_all, blank_lines_all = 0, 0, 0
+table = fs.Table(
+    cols=["Path", "Total lines", "Source lines", "Blank lines"],
+    types={
+        "Path": "str",
+        "Total lines": "int",
+        "Source lines": "int",
+        "Blank lines": "int",
+    },
+)
 
 for file in files:
     total_lines = file.line_count
     blank_lines = file.lines.filter(lambda line: line == "" or line.isspace()).len()
-    source_lines = total_lines - blank_lines
-
-    total_lines_all += total_lines
-    blank_lines_all += blank_lines
-    source_lines_all += source_lines
 
     table.add_row(
         {
             "Path": fs.relative_path(file.path, project_dir),
-            "Total lines": str(total_lines),
-            "Source lines": str(source_lines),
-            "Blank lines": str(blank_lines),
+            "Total lines": total_lines,
+            "Source lines": total_lines - blank_lines,
+            "Blank lines": blank_lines,
         }
     )
 
+table = table.sort_by("Total lines", reverse=True)
 table.add_row(
     {
         "Path": "TOTAL",
-        "Total lines": str(total_lines_all),
-        "Source lines": str(source_lines_all),
-        "Blank lines": str(blank_lines_all),
+        "Total lines": table.col_sum("Total lines"),
+        "Source lines": table.col_sum("Source lines"),
+        "Blank lines": table.col_sum("Blank lines"),
     }
 )
 
@@ -0,0 +1,34 @@
+import io
+from unittest import TestCase
+
+import hofs as fs
+
+
+class TestAhoCorasick(TestCase):
+    def test_scan(self) -> None:
+        automaton = fs.AhoCorasick(["he", "she", "his", "hers"])
+        self.assertEqual(
+            list(automaton.scan(io.BytesIO(b"ushers"))),
+            [(1, "she"), (2, "he"), (2, "hers")],
+        )
+
+    def test_scan_chunks(self) -> None:
+        automaton = fs.AhoCorasick(["abab", "ba"])
+        self.assertEqual(
+            list(automaton.scan(io.BytesIO(b"xababab"), chunk_size=1)),
+            [(2, "ba"), (1, "abab"), (4, "ba"), (3, "abab")],
+        )
+
+    def test_scan_bytes_and_utf8(self) -> None:
+        automaton = fs.AhoCorasick([b"\xff\x00", "ä"])
+        self.assertEqual(
+            list(automaton.scan(io.BytesIO(b"\xff\x00\xc3\xa4"))),
+            [(0, b"\xff\x00"), (2, "ä")],
+        )
+
+    def test_scan_no_match(self) -> None:
+        automaton = fs.AhoCorasick(["xyz"])
+        self.assertEqual(list(automaton.scan(io.BytesIO(b"xyxy"))), [])
+
+    def test_empty_pattern_exception(self) -> None:
+        self.assertRaises(fs.HofsException, fs.AhoCorasick, ["a", ""])
@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from test.test_fs_values import A_TXT_PATH, BASE_DIR_PATH, SUB_DIR_PATH
+from typing import List
+from unittest import IsolatedAsyncioTestCase
+
+import hofs as fs
+
+
+class TestAsyncFunctional(IsolatedAsyncioTestCase):
+    async def test_list(self) -> None:
+        result = await fs.FunctionalIterator([1, 2, 3]).aiter(chunk_size=2).list()
+        self.assertEqual(result, [1, 2, 3])
+
+    async def test_len(self) -> None:
+        result = await fs.FunctionalIterator(range(100)).aiter(chunk_size=7).len()
+        self.assertEqual(result, 100)
+
+    async def test_sum(self) -> None:
+        result = await fs.FunctionalIterator([1, 2, 3]).aiter().sum()
+        self.assertEqual(result, 6)
+
+    async def test_map_filter(self) -> None:
+        result = (
+            await fs.FunctionalIterator(range(10))
+            .aiter()
+            .filter(lambda v: v % 2 == 0)
+            .map(lambda v: v * 10)
+            .list()
+        )
+        self.assertEqual(result, [0, 20, 40, 60, 80])
+
+    async def test_amap_afilter(self) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = (
+                await fs.FunctionalIterator(range(10))
+                .aiter(executor=executor)
+                .afilter(lambda v: v % 3 == 0, concurrency=4)
+                .amap(str, concurrency=2)
+                .list()
+            )
+        self.assertEqual(result, ["0", "3", "6", "9"])
+
+    async def test_map_async_bounded_concurrency(self) -> None:
+        running, max_running = 0, 0
+
+        async def work(value: int) -> int:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001 * (value % 3))
+            running -= 1
+            return value * 2
+
+        result = (
+            await fs.FunctionalIterator(range(20))
+            .aiter()
+            .map_async(work, concurrency=3)
+            .list()
+        )
+        self.assertEqual(result, [value * 2 for value in range(20)])
+        self.assertEqual(max_running, 3)
+
+    async def test_map_async_concurrency_not_positive(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).aiter().map_async(asyncio.sleep, concurrency=0)
+
+    async def test_first(self) -> None:
+        async def identity(file: fs.File) -> fs.File:
+            return file
+
+        files = fs.Dir(BASE_DIR_PATH).files
+        first = await files.aiter(chunk_size=2).map_async(identity).first()
+        self.assertEqual(first, fs.File(A_TXT_PATH))
+        self.assertEqual(files.list(), [])
+
+    async def test_first_empty(self) -> None:
+        result = await fs.FunctionalIterator([]).aiter().first(default=0)
+        self.assertEqual(result, 0)
+
+    async def test_afiles(self) -> None:
+        paths = await fs.Dir(SUB_DIR_PATH).afiles().map(lambda f: f.path).list()
+        self.assertEqual(paths, fs.Dir(SUB_DIR_PATH).files.map_path().list())
+
+    async def test_afiles_content(self) -> None:
+        contents: List[str] = (
+            await fs.Dir(BASE_DIR_PATH)
+            .afiles(chunk_size=1)
+            .filter(lambda f: f.path == A_TXT_PATH)
+            .amap(lambda f: f.t().content, concurrency=4)
+            .list()
+        )
+        self.assertEqual(contents, ["line 1"])
+
+    async def test_aclose_waits_for_read_ahead(self) -> None:
+        values = fs.FunctionalIterator(range(100)).aiter(chunk_size=1)
+        self.assertEqual(await values.__anext__(), 0)
+        await values.aclose()
+        self.assertEqual(await values.list(), [])
+
+    async def test_custom_async_iterable(self) -> None:
+        class Countdown:
+            def __init__(self, n: int) -> None:
+                self.n = n
+
+            def __aiter__(self) -> "Countdown":
+                return self
+
+            async def __anext__(self) -> int:
+                if self.n == 0:
+                    raise StopAsyncIteration
+                self.n -= 1
+                return self.n
+
+        self.assertEqual(
+            await fs.AsyncFunctionalIterator(Countdown(3)).list(), [2, 1, 0]
+        )
+        self.assertEqual(await fs.AsyncFunctionalIterator(Countdown(3)).first(), 2)
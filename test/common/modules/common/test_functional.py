@@ -1,4 +1,14 @@
-from unittest import TestCase
+import functools
+import gc
+import inspect
+import io
+import os
+import random
+import statistics
+import tempfile
+from test.test_fs_values import BASE_DIR_PATH
+from typing import List, Sequence
+from unittest import TestCase, mock
 
 import hofs as fs
 
@@ -28,6 +38,182 @@ class TestFunctional(TestCase):
         result = fs.FunctionalIterator([1, 2, 3, 4]).sum()
         self.assertEqual(result, 10)
 
+    def test_len_empty(self) -> None:
+        result = fs.FunctionalIterator([]).len()
+        self.assertEqual(result, 0)
+
+    def test_sum_file_sizes(self) -> None:
+        result = fs.FunctionalIterator([fs.FileSize(1), fs.FileSize(2)]).sum()
+        self.assertEqual(int(result), 3)
+
+    def test_distinct(self) -> None:
+        result = fs.FunctionalIterator([3, 1, 3, 2, 1]).distinct().list()
+        self.assertEqual(result, [3, 1, 2])
+
+    def test_distinct_key(self) -> None:
+        result = fs.FunctionalIterator(["a", "bb", "c", "dd", "eee"])
+        self.assertEqual(result.distinct(key=len).list(), ["a", "bb", "eee"])
+
+    def test_distinct_approx(self) -> None:
+        values = [value % 500 for value in range(2000)]
+        result = fs.FunctionalIterator(values).distinct(approx=True, capacity=500)
+        distinct = result.list()
+        self.assertEqual(len(set(distinct)), len(distinct))
+        self.assertGreater(len(distinct), 480)
+        self.assertEqual(distinct[:10], list(range(10)))
+
+    def test_distinct_approx_key(self) -> None:
+        result = fs.FunctionalIterator(["a", "bb", "c", "dd"]).distinct(
+            key=len, approx=True
+        )
+        self.assertEqual(result.list(), ["a", "bb"])
+        self.assertEqual(result._stage, "distinct: ~0.01 false positives")
+
+    def test_distinct_approx_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).distinct(approx=True, fp_rate=0)
+
+    def test_count_distinct(self) -> None:
+        result = fs.FunctionalIterator([3, 1, 3, 2, 1]).count_distinct()
+        self.assertEqual(result, 3)
+
+    def test_count_distinct_approx(self) -> None:
+        values = fs.FunctionalIterator(range(10000)).map(lambda value: value % 3000)
+        self.assertAlmostEqual(values.count_distinct(approx=True), 3000, delta=60)
+
+    def test_count_distinct_key(self) -> None:
+        values = ["a", "bb", "c", "dd", "eee"]
+        self.assertEqual(fs.FunctionalIterator(values).count_distinct(key=len), 3)
+        self.assertEqual(
+            fs.FunctionalIterator(values).count_distinct(key=len, approx=True), 3
+        )
+
+    def test_sample(self) -> None:
+        result = fs.FunctionalIterator(range(100)).sample(5, seed=1)
+        self.assertEqual(result._stage, "sample: 5")
+        values = result.list()
+        self.assertEqual(len(values), 5)
+        self.assertEqual(values, sorted(set(values)))
+        self.assertEqual(
+            fs.FunctionalIterator(range(100)).sample(5, seed=1).list(), values
+        )
+
+    def test_sample_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator(range(5)).sample(-1)
+
+    def test_estimate(self) -> None:
+        estimate = fs.FunctionalIterator(range(1000)).estimate(
+            lambda value: value % 10, n=200, seed=3
+        )
+        self.assertEqual(estimate.population, 1000)
+        self.assertEqual(estimate.sample_size, 200)
+        low, high = estimate.interval
+        self.assertLess(low, 4.5)
+        self.assertGreater(high, 4.5)
+        self.assertLess(high - low, 1)
+
+    def test_estimate_all_sampled(self) -> None:
+        estimate = fs.FunctionalIterator([1, 2, 3]).estimate(float)
+        self.assertEqual(estimate.total, 6)
+        self.assertEqual(estimate.error, 0)
+
+    def test_estimate_invalid_confidence(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1, 2, 3]).estimate(float, confidence=0)
+
+    def test_to_csv(self) -> None:
+        out = io.StringIO()
+        n = fs.FunctionalIterator(["a", "bb"]).to_csv(
+            out, ["value", "length"], lambda value: (value, len(value))
+        )
+        self.assertEqual(n, 2)
+        self.assertEqual(out.getvalue(), "value,length\r\na,1\r\nbb,2\r\n")
+
+    def test_to_csv_rows(self) -> None:
+        out = io.StringIO()
+        self.assertEqual(fs.FunctionalIterator([[1, 2]]).to_csv(out, ["a", "b"]), 1)
+        self.assertEqual(
+            fs.Table.from_csv(io.StringIO(out.getvalue())).row(0), ["1", "2"]
+        )
+
+    def test_aggregate(self) -> None:
+        result = fs.FunctionalIterator([2, 1, 4, 3]).aggregate(
+            count=True, sum=True, min=True, max=True, mean=True, stdev=True
+        )
+        self.assertEqual(result["count"], 4)
+        self.assertEqual(result["sum"], 10)
+        self.assertEqual(result["min"], 1)
+        self.assertEqual(result["max"], 4)
+        self.assertAlmostEqual(result["mean"], 2.5)
+        self.assertAlmostEqual(result["stdev"], statistics.stdev([2, 1, 4, 3]))
+
+    def test_aggregate_batches(self) -> None:
+        values = [3, 1, 4, 1, 5, 9, 2, 6, 5]
+        with mock.patch("hofs.common.functional._AGGREGATE_BATCH_SIZE", 2):
+            result = fs.FunctionalIterator(values).aggregate(
+                count=True, sum=True, min=True, max=True, mean=True, stdev=True
+            )
+        self.assertEqual(result["count"], 9)
+        self.assertEqual(result["sum"], 36)
+        self.assertEqual(result["min"], 1)
+        self.assertEqual(result["max"], 9)
+        self.assertAlmostEqual(result["mean"], 4)
+        self.assertAlmostEqual(result["stdev"], statistics.stdev(values))
+
+    def test_aggregate_only_requested(self) -> None:
+        result = fs.FunctionalIterator([2, 1, 4, 3]).aggregate(count=True, max=True)
+        self.assertEqual(result, {"count": 4, "max": 4})
+
+    def test_aggregate_count_only(self) -> None:
+        result = fs.Dir(BASE_DIR_PATH).files.aggregate(count=True)
+        self.assertEqual(result, {"count": 9})
+
+    def test_aggregate_min_max_non_numeric(self) -> None:
+        result = fs.FunctionalIterator(["b", "a", "c"]).aggregate(min=True, max=True)
+        self.assertEqual(result, {"min": "a", "max": "c"})
+
+    def test_aggregate_key(self) -> None:
+        result = fs.FunctionalIterator(["a", "bbb", "cc"]).aggregate(
+            sum=True, max=True, key=len
+        )
+        self.assertEqual(result, {"sum": 6, "max": 3})
+
+    def test_aggregate_quantiles(self) -> None:
+        values = list(range(1001))
+        random.Random(0).shuffle(values)
+        result = fs.FunctionalIterator(values).aggregate(quantiles=[0.1, 0.5, 0.9])
+        self.assertAlmostEqual(result["quantiles"][0.1], 100, delta=10)
+        self.assertAlmostEqual(result["quantiles"][0.5], 500, delta=10)
+        self.assertAlmostEqual(result["quantiles"][0.9], 900, delta=10)
+
+    def test_aggregate_empty(self) -> None:
+        result = fs.FunctionalIterator([]).aggregate(
+            count=True, sum=True, min=True, mean=True, stdev=True, quantiles=[0.5]
+        )
+        self.assertEqual(
+            result,
+            {
+                "count": 0,
+                "sum": 0,
+                "min": None,
+                "mean": None,
+                "stdev": None,
+                "quantiles": {0.5: None},
+            },
+        )
+
+    def test_aggregate_file_sizes(self) -> None:
+        sizes = [fs.FileSize(1000), fs.FileSize(3000)]
+        result = fs.FunctionalIterator(sizes).aggregate(sum=True, max=True, mean=True)
+        self.assertEqual(int(result["sum"]), 4000)
+        self.assertEqual(int(result["max"]), 3000)
+        self.assertAlmostEqual(result["mean"], 2000.0)
+
+    def test_aggregate_nothing_requested(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).aggregate()
+
     def test_min(self) -> None:
         result = fs.FunctionalIterator([2, 1, 4, 3]).max()
         self.assertEqual(result, 4)
@@ -56,7 +242,360 @@ class TestFunctional(TestCase):
         result = fs.FunctionalIterator([2, 1, 4, 3]).top_n(2)
         self.assertEqual(result, [4, 3])
 
+    def test_top_n_key(self) -> None:
+        calls: List[str] = []
+
+        def key(value: str) -> int:
+            calls.append(value)
+            return len(value)
+
+        result = fs.FunctionalIterator(["aa", "a", "aaaa", "aaa"]).top_n(2, key=key)
+        self.assertEqual(result, ["aaaa", "aaa"])
+        self.assertEqual(calls, ["aa", "a", "aaaa", "aaa"])
+
+    def test_sort_by(self) -> None:
+        result = fs.FunctionalIterator([2, 1, 4, 3]).sort_by().list()
+        self.assertEqual(result, [1, 2, 3, 4])
+
+    def test_sort_by_key_computed_once(self) -> None:
+        calls: List[int] = []
+
+        def key(value: int) -> int:
+            calls.append(value)
+            return -value
+
+        result = fs.FunctionalIterator([2, 1, 4, 3]).sort_by(key).list()
+        self.assertEqual(result, [4, 3, 2, 1])
+        self.assertEqual(sorted(calls), [1, 2, 3, 4])
+
+    def test_sort_by_lazy(self) -> None:
+        it = fs.FunctionalIterator([2, 1]).sort_by(lambda v: v)
+        self.assertEqual(
+            it.explain(), "list_iterator\nsort_by: TestFunctional.test_sort_by_lazy"
+        )
+        self.assertEqual(it.list(), [1, 2])
+
+    def test_sort_by_stable(self) -> None:
+        values = [("b", 1), ("a", 2), ("b", 3), ("a", 4), ("a", 5)]
+        for max_memory_items in [None, 1, 2, 10]:
+            for reverse in [False, True]:
+                result = (
+                    fs.FunctionalIterator(values)
+                    .sort_by(
+                        lambda v: v[0],
+                        reverse=reverse,
+                        max_memory_items=max_memory_items,
+                    )
+                    .list()
+                )
+                self.assertEqual(
+                    result, sorted(values, key=lambda v: v[0], reverse=reverse)
+                )
+
+    def test_sort_by_external(self) -> None:
+        values = [(i * 7919) % 1000 for i in range(1000)]
+        result = fs.FunctionalIterator(values).sort_by(max_memory_items=64).list()
+        self.assertEqual(result, sorted(values))
+
+    def test_sort_by_external_many_runs(self) -> None:
+        values = [(i * 7919) % 100 for i in range(1000)]
+        result = (
+            fs.FunctionalIterator(enumerate(values))
+            .sort_by(lambda pair: pair[1], max_memory_items=4)
+            .list()
+        )
+        self.assertEqual(result, sorted(enumerate(values), key=lambda pair: pair[1]))
+
+    def test_sort_by_external_cleanup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_tempdir, tempfile.tempdir = tempfile.tempdir, tmp_dir
+            try:
+                it = fs.FunctionalIterator([3, 1, 2]).sort_by(max_memory_items=1)
+                self.assertEqual(it.first(), 1)
+                self.assertEqual(os.listdir(tmp_dir), [])
+
+                it = fs.FunctionalIterator([3, 1, 2]).sort_by(max_memory_items=1)
+                self.assertEqual(next(it), 1)
+                self.assertEqual(len(os.listdir(tmp_dir)), 1)
+                del it
+                gc.collect()
+                self.assertEqual(os.listdir(tmp_dir), [])
+            finally:
+                tempfile.tempdir = old_tempdir
+
+    def test_sort_by_external_empty(self) -> None:
+        result: List[int] = (
+            fs.FunctionalIterator([]).sort_by(max_memory_items=64).list()
+        )
+        self.assertEqual(result, [])
+
+    def test_sort_by_max_memory_items_not_positive(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).sort_by(max_memory_items=0)
+
     def test_for_each(self) -> None:
         values = []
         fs.FunctionalIterator([2, 1, 4, 3]).for_each(lambda x: values.append(x * 2))
         self.assertEqual(values, [4, 2, 8, 6])
+
+    def test_explain(self) -> None:
+        result = (
+            fs.FunctionalIterator([1, 2, 3, 4])
+            .filter(lambda x: x % 2 == 0)
+            .map(str)
+            .map(functools.partial(int, base=10))
+            .explain()
+        )
+        self.assertEqual(
+            result.split("\n")[:3],
+            ["list_iterator", "filter: TestFunctional.test_explain", "map: str"],
+        )
+        self.assertTrue(result.split("\n")[3].startswith("map: functools.partial("))
+
+    def test_explain_wrapped(self) -> None:
+        result = fs.FunctionalIterator(fs.FunctionalIterator([1]).map(str)).explain()
+        self.assertEqual(result, "list_iterator\nmap: str")
+
+    def test_batch(self) -> None:
+        result = fs.FunctionalIterator([1, 2, 3, 4, 5]).batch(2).list()
+        self.assertEqual(result, [[1, 2], [3, 4], [5]])
+
+    def test_map_batch(self) -> None:
+        result = (
+            fs.FunctionalIterator([1, 2, 3, 4, 5])
+            .map_batch(lambda chunk: [x * 2 for x in chunk], size=2)
+            .list()
+        )
+        self.assertEqual(result, [2, 4, 6, 8, 10])
+
+    def test_filter_batch(self) -> None:
+        result = (
+            fs.FunctionalIterator([1, 2, 3, 4, 5])
+            .filter_batch(lambda chunk: [x % 2 == 1 for x in chunk], size=2)
+            .list()
+        )
+        self.assertEqual(result, [1, 3, 5])
+
+    def test_batch_chain(self) -> None:
+        chunks = []
+
+        def double(chunk: Sequence[int]) -> List[int]:
+            chunks.append(list(chunk))
+            return [x * 2 for x in chunk]
+
+        result = (
+            fs.FunctionalIterator([1, 2, 3, 4, 5])
+            .filter_batch(lambda chunk: [x != 3 for x in chunk], size=3)
+            .map_batch(double, size=1)
+            .map(str)
+            .list()
+        )
+        self.assertEqual(result, ["2", "4", "8", "10"])
+        # The chunks of the filter stage are re-chunked to the size of the map stage
+        self.assertEqual(chunks, [[1], [2], [4], [5]])
+
+    def test_batch_chain_generators(self) -> None:
+        result = (
+            fs.FunctionalIterator(range(6))
+            .map_batch(lambda chunk: (x * 2 for x in chunk), size=4)
+            .filter_batch(lambda chunk: [x > 2 for x in chunk], size=3)
+            .list()
+        )
+        self.assertEqual(result, [4, 6, 8, 10])
+
+        result = (
+            fs.FunctionalIterator(range(5))
+            .map_batch(lambda chunk: map(str, chunk), size=2)
+            .map_batch(lambda chunk: map(len, chunk), size=3)
+            .list()
+        )
+        self.assertEqual(result, [1] * 5)
+
+    def test_explain_batch(self) -> None:
+        result = fs.FunctionalIterator([1]).batch(2).map_batch(list).explain()
+        self.assertEqual(result, "list_iterator\nbatch: 2\nmap_batch: list")
+
+    def test_cache_replay(self) -> None:
+        cache = fs.FunctionalIterator([1, 2, 3]).cache()
+        self.assertEqual(cache.replay().list(), [1, 2, 3])
+        self.assertEqual(cache.replay().sum(), 6)
+
+    def test_cache_lazy(self) -> None:
+        source = fs.FunctionalIterator(iter([1, 2, 3]))
+        cache = source.cache()
+        self.assertEqual(cache.n_cached, 0)
+        first, second = cache.replay(), cache.replay()
+        self.assertEqual(next(first), 1)
+        self.assertEqual(cache.n_cached, 1)
+        self.assertEqual(second.list(), [1, 2, 3])
+        self.assertEqual(first.list(), [2, 3])
+
+    def test_cache_spilled(self) -> None:
+        with fs.FunctionalIterator(range(10)).cache(max_memory_items=3) as cache:
+            first, second = cache.replay(), cache.replay()
+            self.assertEqual([next(first), next(first)], [0, 1])
+            self.assertEqual(second.list(), list(range(10)))
+            self.assertEqual(first.list(), list(range(2, 10)))
+            self.assertEqual(cache.replay().list(), list(range(10)))
+
+    def test_cache_spilled_interleaved(self) -> None:
+        with fs.FunctionalIterator(range(7)).cache(max_memory_items=2) as cache:
+            first, second = cache.replay(), cache.replay()
+            result = [(a, b) for a, b in zip(first, second)]
+            self.assertEqual(result, [(i, i) for i in range(7)])
+
+    def test_cache_spilled_garbage_collected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_tempdir, tempfile.tempdir = tempfile.tempdir, tmp_dir
+            try:
+                cache = fs.FunctionalIterator(range(7)).cache(max_memory_items=2)
+                self.assertEqual(cache.replay().list(), list(range(7)))
+                self.assertEqual(cache.replay().list(), list(range(7)))
+                self.assertEqual(len(os.listdir(tmp_dir)), 1)
+                del cache
+                gc.collect()
+                self.assertEqual(os.listdir(tmp_dir), [])
+            finally:
+                tempfile.tempdir = old_tempdir
+
+    def test_cache_read_after_close(self) -> None:
+        cache = fs.FunctionalIterator(range(7)).cache(max_memory_items=2)
+        done, reading = cache.replay(), cache.replay()
+        self.assertEqual(done.list(), list(range(7)))
+        self.assertEqual([next(reading), next(reading), next(reading)], [0, 1, 2])
+        cache.close()
+        with self.assertRaises(fs.HofsException):
+            next(reading)
+        with self.assertRaises(fs.HofsException):
+            cache.replay().list()
+        self.assertEqual(done.list(), [])
+
+    def test_cache_max_memory_items_not_positive(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).cache(max_memory_items=0)
+
+    def test_tee(self) -> None:
+        first, second, third = fs.FunctionalIterator([1, 2, 3]).map(str).tee(3)
+        self.assertEqual(first.list(), ["1", "2", "3"])
+        self.assertEqual(second.list(), ["1", "2", "3"])
+        self.assertEqual(third.explain(), "cache of: list_iterator -> map: str")
+
+    def test_tee_spilled_cleanup(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_tempdir, tempfile.tempdir = tempfile.tempdir, tmp_dir
+            try:
+                first, second = fs.FunctionalIterator(range(7)).tee(max_memory_items=2)
+                self.assertEqual(first.list(), list(range(7)))
+                # Closing an exhausted iterator doesn't count twice
+                first.close()
+                self.assertEqual(len(os.listdir(tmp_dir)), 1)
+                self.assertEqual(second.first(), 0)
+                self.assertEqual(os.listdir(tmp_dir), [])
+            finally:
+                tempfile.tempdir = old_tempdir
+
+    def test_broadcast(self) -> None:
+        result = fs.FunctionalIterator(range(1000)).broadcast(
+            lambda it: it.len(),
+            lambda it: it.sum(),
+            lambda it: it.filter(lambda v: v % 2 == 0).list()[:3],
+            chunk_size=7,
+        )
+        self.assertEqual(result, [1000, 499500, [0, 2, 4]])
+
+    def test_broadcast_sink_stops_early(self) -> None:
+        result = fs.FunctionalIterator(range(1000)).broadcast(
+            lambda it: next(it), lambda it: it.max(), chunk_size=1
+        )
+        self.assertEqual(result, [0, 999])
+
+    def test_broadcast_sink_exception(self) -> None:
+        def fail(it: fs.FunctionalIterator[int]) -> None:
+            raise ValueError("sink failed")
+
+        results: List[int] = []
+        with self.assertRaises(ValueError):
+            fs.FunctionalIterator(range(100)).broadcast(
+                fail, lambda it: results.append(it.len()), chunk_size=1
+            )
+        self.assertEqual(results, [100])
+
+    def test_broadcast_no_sinks(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator([1]).broadcast()
+
+    def test_first(self) -> None:
+        self.assertEqual(fs.FunctionalIterator([2, 1]).first(), 2)
+
+    def test_first_empty(self) -> None:
+        self.assertIsNone(fs.FunctionalIterator([]).first())
+        self.assertEqual(fs.FunctionalIterator([]).first(default=0), 0)
+
+    def test_first_closes(self) -> None:
+        values = (value for value in [1, 2, 3])
+        it = fs.FunctionalIterator(values).map(lambda v: v * 2)
+        self.assertEqual(it.first(), 2)
+        self.assertEqual(inspect.getgeneratorstate(values), inspect.GEN_CLOSED)
+        self.assertEqual(it.list(), [])
+
+    def test_find(self) -> None:
+        it = fs.FunctionalIterator([1, 2, 3, 4])
+        self.assertEqual(it.find(lambda v: v % 2 == 0), 2)
+        self.assertEqual(it.list(), [])
+
+    def test_find_none(self) -> None:
+        result = fs.FunctionalIterator([1, 3]).find(lambda v: v % 2 == 0, default=-1)
+        self.assertEqual(result, -1)
+
+    def test_any(self) -> None:
+        self.assertTrue(fs.FunctionalIterator([0, 1]).any())
+        self.assertFalse(fs.FunctionalIterator([0, 0]).any())
+        self.assertTrue(fs.FunctionalIterator([1, 2]).any(lambda v: v > 1))
+        self.assertFalse(fs.FunctionalIterator([]).any(lambda v: v > 1))
+
+    def test_any_stops_early(self) -> None:
+        seen: List[int] = []
+        fs.FunctionalIterator(range(100)).map(seen.append).any(lambda v: True)
+        self.assertEqual(len(seen), 1)
+
+    def test_all(self) -> None:
+        self.assertTrue(fs.FunctionalIterator([1, 2]).all())
+        self.assertFalse(fs.FunctionalIterator([1, 0]).all())
+        self.assertTrue(fs.FunctionalIterator([]).all(lambda v: v > 1))
+        self.assertFalse(fs.FunctionalIterator([1, 2]).all(lambda v: v > 1))
+
+    def test_take(self) -> None:
+        values = (value for value in range(10))
+        it = fs.FunctionalIterator(values)
+        self.assertEqual(it.take(3).list(), [0, 1, 2])
+        self.assertEqual(inspect.getgeneratorstate(values), inspect.GEN_CLOSED)
+
+    def test_take_more_than_available(self) -> None:
+        self.assertEqual(fs.FunctionalIterator([1, 2]).take(5).list(), [1, 2])
+
+    def test_take_0(self) -> None:
+        it = fs.FunctionalIterator([1, 2])
+        self.assertEqual(it.take(0).list(), [])
+        self.assertEqual(it.list(), [])
+
+    def test_take_while(self) -> None:
+        it = fs.FunctionalIterator([1, 2, 5, 1])
+        self.assertEqual(it.take_while(lambda v: v < 3).list(), [1, 2])
+        self.assertEqual(it.list(), [])
+
+    def test_take_while_all(self) -> None:
+        result = fs.FunctionalIterator([1, 2]).take_while(lambda v: v < 3).list()
+        self.assertEqual(result, [1, 2])
+
+    def test_skip(self) -> None:
+        it = fs.FunctionalIterator([1, 2, 3]).skip(2)
+        self.assertEqual(it.explain(), "list_iterator\nskip: 2")
+        self.assertEqual(it.list(), [3])
+
+    def test_close_batch_chain(self) -> None:
+        values = (value for value in range(10))
+        it = fs.FunctionalIterator(values).map_batch(lambda chunk: chunk, size=2)
+        self.assertEqual(next(it), 0)
+        it.close()
+        self.assertEqual(inspect.getgeneratorstate(values), inspect.GEN_CLOSED)
+        self.assertEqual(it.list(), [])
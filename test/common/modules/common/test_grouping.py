@@ -0,0 +1,99 @@
+from typing import List, Tuple
+from unittest import TestCase
+
+import hofs as fs
+
+VALUES: List[Tuple[str, int]] = [
+    ("b", 3),
+    ("a", 1),
+    ("c", 4),
+    ("a", 5),
+    ("b", 2),
+    ("a", 6),
+]
+
+
+class TestGrouping(TestCase):
+    def test_count_by(self) -> None:
+        table = fs.FunctionalIterator("abracadabra").count_by(lambda c: c)
+        self.assertEqual(table.col_names, ["key", "count"])
+        self.assertEqual(table.col(0), ["a", "b", "c", "d", "r"])
+        self.assertEqual(table.col(1), [5, 2, 1, 1, 2])
+
+    def test_count_by_name(self) -> None:
+        table = fs.FunctionalIterator(VALUES).count_by(lambda v: v[0], name="letter")
+        self.assertEqual(table.col_names, ["letter", "count"])
+
+    def test_count_by_empty(self) -> None:
+        table = fs.FunctionalIterator([]).count_by(lambda v: v)
+        self.assertEqual(len(table), 0)
+
+    def test_agg(self) -> None:
+        table = (
+            fs.FunctionalIterator(VALUES)
+            .group_by(lambda v: v[0])
+            .agg(
+                n="count",
+                total=("sum", lambda v: v[1]),
+                low=("min", lambda v: v[1]),
+                high=("max", lambda v: v[1]),
+                mean=("mean", lambda v: v[1]),
+            )
+        )
+        self.assertEqual(table.col_names, ["key", "n", "total", "low", "high", "mean"])
+        self.assertEqual(table.row(0), ["a", 3, 12, 1, 6, 4.0])
+        self.assertEqual(table.row(1), ["b", 2, 5, 2, 3, 2.5])
+        self.assertEqual(table.row(2), ["c", 1, 4, 4, 4, 4.0])
+
+    def test_agg_without_value_function(self) -> None:
+        table = (
+            fs.FunctionalIterator([3, 1, 4, 1, 5, 9, 2, 6])
+            .group_by(lambda v: v % 2)
+            .agg(total="sum", high=("max", None))
+        )
+        self.assertEqual(table.row(0), [0, 12, 6])
+        self.assertEqual(table.row(1), [1, 19, 9])
+
+    def test_agg_spilled(self) -> None:
+        for max_groups in [1, 2, 3]:
+            table = (
+                fs.FunctionalIterator(VALUES)
+                .group_by(lambda v: v[0], max_groups=max_groups)
+                .agg(
+                    n="count",
+                    total=("sum", lambda v: v[1]),
+                    low=("min", lambda v: v[1]),
+                    mean=("mean", lambda v: v[1]),
+                )
+            )
+            self.assertEqual(table.row(0), ["a", 3, 12, 1, 4.0])
+            self.assertEqual(table.row(1), ["b", 2, 5, 2, 2.5])
+            self.assertEqual(table.row(2), ["c", 1, 4, 4, 4.0])
+
+    def test_agg_spilled_many_groups(self) -> None:
+        table = fs.FunctionalIterator(range(10000)).count_by(
+            lambda v: v % 1000, max_groups=100
+        )
+        self.assertEqual(table.col(0), list(range(1000)))
+        self.assertEqual(set(table.col(1)), {10})
+
+    def test_agg_file_sizes(self) -> None:
+        table = (
+            fs.FunctionalIterator([fs.FileSize(1), fs.FileSize(2), fs.FileSize(4)])
+            .group_by(lambda size: int(size) > 1)
+            .agg(size="sum", mean="mean")
+        )
+        self.assertEqual([int(size) for size in table.col(1)], [1, 6])
+        self.assertEqual(table.col(2), [1.0, 3.0])
+
+    def test_agg_no_aggregates(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator(VALUES).group_by(lambda v: v[0]).agg()
+
+    def test_agg_unknown_reducer(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator(VALUES).group_by(lambda v: v[0]).agg(x="median")
+
+    def test_max_groups_not_positive(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator(VALUES).group_by(lambda v: v[0], max_groups=0)
@@ -0,0 +1,124 @@
+import json
+import os
+from test.test_fs_values import A_TXT_PATH, SUB_DIR_PATH
+from typing import List, Tuple
+from unittest import TestCase
+
+import hofs as fs
+from hofs.common import instrumentation
+
+
+class TestProfile(TestCase):
+    def test_profile_stages(self) -> None:
+        it = fs.FunctionalIterator([1, 2, 3, 4]).filter(lambda v: v % 2 == 0).map(str)
+        with it.profile() as profile:
+            self.assertEqual(it.list(), ["2", "4"])
+
+        stages = [stage.to_dict() for stage in profile.stages]
+        self.assertEqual(
+            [stage["stage"] for stage in stages],
+            [
+                "FunctionalIterator",
+                "filter: TestProfile.test_profile_stages",
+                "map: str",
+            ],
+        )
+        self.assertEqual(
+            [
+                (stage["items_in"], stage["items_out"])
+                for stage in profile._stage_dicts()
+            ],
+            [(None, 4), (4, 2), (2, 2)],
+        )
+        for stage in profile.stages:
+            self.assertGreaterEqual(stage.wall_time, 0)
+            self.assertGreaterEqual(stage.cpu_time, 0)
+
+    def test_profile_files(self) -> None:
+        files = fs.Dir(SUB_DIR_PATH).files.filter(lambda f: int(f.size) > 0)
+        line_counts = files.filter_ext("txt").t().map_lc()
+        with line_counts.profile() as profile:
+            self.assertEqual(line_counts.list(), [3, 4])
+
+        rows = json.loads(profile.to_json())
+        self.assertEqual(rows[0]["stage"], f"walk {SUB_DIR_PATH}")
+        self.assertEqual(rows[0]["list_dir"], 1)
+        self.assertEqual(rows[0]["items_out"], 3)
+        self.assertTrue(rows[1]["stage"].startswith("filter paths: filter_extension"))
+        self.assertEqual(rows[1]["stat"], 3)
+        self.assertEqual(rows[-1]["open"], 2)
+        self.assertEqual(
+            rows[-1]["read_bytes"],
+            sum(
+                os.path.getsize(file.path)
+                for file in fs.Dir(SUB_DIR_PATH).files.filter_ext("txt")
+            ),
+        )
+
+    def test_profile_table_and_report(self) -> None:
+        it = fs.FunctionalIterator(["a", "b"]).map(str.upper)
+        profile = it.profile()
+        it.list()
+        profile.stop()
+
+        table = profile.table()
+        self.assertEqual(
+            table.col_by_name("stage"), ["FunctionalIterator", "map: str.upper"]
+        )
+        self.assertEqual(table.col_by_name("items_out"), [2, 2])
+
+        report = profile.report().splitlines()
+        self.assertEqual(
+            report[0].split(),
+            ["stage", "in", "out", "wall", "ms", "cpu", "ms"] + instrumentation.EVENTS,
+        )
+        self.assertEqual(report[2].split()[:4], ["map:", "str.upper", "2", "2"])
+
+    def test_profile_file_list(self) -> None:
+        files = fs.FileIterator([fs.File(A_TXT_PATH)])
+        with files.profile() as profile:
+            fs.File(A_TXT_PATH)
+            files.list()
+        self.assertEqual([stage.name for stage in profile.stages], ["FileIterator"])
+        self.assertEqual(profile.stages[0].events["stat"], 0)
+
+    def test_stop(self) -> None:
+        it = fs.FunctionalIterator([1, 2]).map(str)
+        profile = it.profile()
+        self.assertEqual(type(it).__name__, "FunctionalIterator")
+        self.assertIsNot(type(it), fs.FunctionalIterator)
+        profile.stop()
+        profile.stop()
+        self.assertIs(type(it), fs.FunctionalIterator)
+        self.assertEqual(it.list(), ["1", "2"])
+        self.assertEqual(profile.stages[-1].items_out, 0)
+        self.assertEqual(instrumentation.hooks, [])
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self) -> None:
+        self.events: List[Tuple[str, int]] = []
+        instrumentation.add_hook(self.hook)
+
+    def tearDown(self) -> None:
+        instrumentation.remove_hook(self.hook)
+
+    def hook(self, event: str, amount: int) -> None:
+        self.events.append((event, amount))
+
+    def test_file_events(self) -> None:
+        file = fs.File(A_TXT_PATH)
+        self.assertEqual(int(file.size), 6)
+        self.assertEqual(file.bytes, b"line 1")
+        self.assertEqual(
+            self.events,
+            [("stat", 1), ("stat", 1), ("open", 1), ("read_bytes", 6)],
+        )
+
+    def test_text_file_events(self) -> None:
+        self.assertEqual(fs.TextFile(A_TXT_PATH).content, "line 1")
+        self.assertIn(("read_bytes", 6), self.events)
+
+    def test_walk_events(self) -> None:
+        fs.Dir(SUB_DIR_PATH).files.list()
+        self.assertEqual(self.events, [("list_dir", 1)])
@@ -0,0 +1,78 @@
+from test.test_fs_values import BASE_DIR_PATH, SUB_DIR_PATH
+from typing import List
+from unittest import TestCase, mock
+
+import hofs as fs
+from hofs.common import instrumentation
+
+
+class TestProgress(TestCase):
+    def setUp(self) -> None:
+        self.reports: List[fs.Progress] = []
+
+    def test_progress(self) -> None:
+        it = fs.FunctionalIterator([1, 2, 3]).progress(self.reports.append, interval=0)
+        self.assertEqual(it.list(), [1, 2, 3])
+        self.assertEqual([report.items for report in self.reports], [1, 2, 3, 3])
+        self.assertEqual([report.done for report in self.reports], [False] * 3 + [True])
+
+        last = self.reports[-1]
+        self.assertIsNone(last.entries_visited)
+        self.assertIsNone(last.dirs_pending)
+        self.assertIsNone(last.total)
+        self.assertIsNone(last.eta)
+        self.assertEqual(last.bytes_read, 0)
+        self.assertGreaterEqual(last.items_per_second, 0)
+
+    def test_progress_interval(self) -> None:
+        fs.FunctionalIterator(range(1000)).progress(
+            self.reports.append, interval=3600
+        ).list()
+        self.assertEqual(len(self.reports), 1)
+        self.assertEqual(self.reports[0].items, 1000)
+        self.assertTrue(self.reports[0].done)
+
+    def test_progress_eta(self) -> None:
+        # One value per second (the clock is read once at the start and once per value)
+        with mock.patch("hofs.common.progress.time") as fake_time:
+            fake_time.monotonic.side_effect = [0.0, 1.0, 2.0, 3.0, 4.0, 4.0]
+            fs.FunctionalIterator(range(4)).progress(
+                self.reports.append, interval=0, total=8
+            ).list()
+        self.assertEqual(self.reports[-1].total, 8)
+        self.assertEqual(
+            [report.eta for report in self.reports], [7.0, 6.0, 5.0, 4.0, 4.0]
+        )
+
+    def test_progress_empty(self) -> None:
+        fs.FunctionalIterator([]).progress(self.reports.append, total=10).list()
+        self.assertEqual(len(self.reports), 1)
+        self.assertEqual(self.reports[0].items, 0)
+        self.assertIsNone(self.reports[0].eta)
+
+    def test_progress_walk(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files.progress(self.reports.append, interval=0)
+        assert isinstance(files, fs.FileIterator)
+        self.assertEqual(files.filter_ext("txt").t().map_lc().list(), [1, 2, 3, 4, 0])
+
+        first, last = self.reports[0], self.reports[-1]
+        self.assertEqual(first.entries_visited, 6)
+        self.assertEqual(first.dirs_pending, 1)
+        self.assertEqual(last.items, 9)
+        self.assertEqual(last.dirs_pending, 0)
+        self.assertGreater(last.bytes_read, 0)
+        self.assertEqual(instrumentation.hooks, [])
+
+    def test_progress_explain(self) -> None:
+        files = fs.Dir(SUB_DIR_PATH).files.progress(print, interval=5)
+        assert isinstance(files, fs.FileIterator)
+        self.assertEqual(
+            files.filter_ext("txt").explain(),
+            "\n".join(
+                [
+                    f"walk {SUB_DIR_PATH}",
+                    "progress: every 5s",
+                    "filter: filter_extension('txt')",
+                ]
+            ),
+        )
@@ -0,0 +1,84 @@
+import collections
+import math
+import random
+from unittest import TestCase
+
+import hofs as fs
+from hofs.common.sampling import estimate_from_sample, reservoir_sample
+
+
+class TestReservoirSample(TestCase):
+    def test_sample(self) -> None:
+        sample, count = reservoir_sample(range(1000), 10, random.Random(0))
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(len(set(sample)), 10)
+        self.assertEqual(sample, sorted(sample))
+        self.assertEqual(count, 1000)
+
+    def test_fewer_values(self) -> None:
+        self.assertEqual(reservoir_sample("ab", 3, random.Random(0)), (["a", "b"], 2))
+
+    def test_exact_size(self) -> None:
+        self.assertEqual(reservoir_sample("abc", 3, random.Random(0)), (list("abc"), 3))
+
+    def test_empty_sample(self) -> None:
+        self.assertEqual(reservoir_sample(range(5), 0, random.Random(0)), ([], 5))
+
+    def test_uniform(self) -> None:
+        counts: collections.Counter = collections.Counter()
+        for seed in range(3000):
+            counts.update(reservoir_sample(range(10), 3, random.Random(seed))[0])
+        for value in range(10):
+            self.assertAlmostEqual(counts[value], 900, delta=120)
+
+    def test_seed(self) -> None:
+        self.assertEqual(
+            reservoir_sample(range(100), 5, random.Random(42)),
+            reservoir_sample(range(100), 5, random.Random(42)),
+        )
+
+    def test_invalid_size(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            reservoir_sample(range(5), -1, random.Random(0))
+
+
+class TestEstimate(TestCase):
+    def test_estimate(self) -> None:
+        estimate = estimate_from_sample([1, 2, 3, 4], 100, 0.95)
+        self.assertEqual(estimate.mean, 2.5)
+        self.assertEqual(estimate.sample_size, 4)
+        self.assertEqual(estimate.population, 100)
+        self.assertEqual(estimate.total, 250)
+        # z * stdev / sqrt(n) * sqrt((N - n) / (N - 1))
+        error = 1.959964 * 1.290994 / 2 * math.sqrt(96 / 99)
+        self.assertAlmostEqual(estimate.error, error, places=4)
+        self.assertAlmostEqual(estimate.interval[0], 2.5 - error, places=4)
+        self.assertAlmostEqual(
+            estimate.total_interval[1], 100 * (2.5 + error), places=2
+        )
+
+    def test_census(self) -> None:
+        estimate = estimate_from_sample([1, 2, 3], 3, 0.95)
+        self.assertEqual(estimate.interval, (2, 2))
+        self.assertEqual(estimate.total_interval, (6, 6))
+
+    def test_single_value(self) -> None:
+        estimate = estimate_from_sample([5], 10, 0.95)
+        self.assertEqual(estimate.mean, 5)
+        self.assertEqual(estimate.error, math.inf)
+
+    def test_no_values(self) -> None:
+        estimate = estimate_from_sample([], 0, 0.9)
+        self.assertEqual(estimate.total, 0)
+        self.assertEqual(estimate.confidence, 0.9)
+        self.assertEqual(estimate.error, 0)
+
+    def test_empty_sample_of_values(self) -> None:
+        estimate = estimate_from_sample([], 10, 0.9)
+        self.assertEqual(estimate.mean, 0)
+        self.assertEqual(estimate.error, math.inf)
+        self.assertEqual(estimate.total_interval, (-math.inf, math.inf))
+
+    def test_invalid_confidence(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            estimate_from_sample([1, 2], 10, 1)
@@ -0,0 +1,159 @@
+import random
+from unittest import TestCase
+
+import hofs as fs
+
+
+class TestP2Quantile(TestCase):
+    def test_no_values(self) -> None:
+        self.assertIsNone(fs.P2Quantile(0.5).value)
+
+    def test_few_values_exact(self) -> None:
+        sketch = fs.P2Quantile(0.5)
+        for value in [5, 1, 3, 2]:
+            sketch.add(value)
+        self.assertEqual(sketch.value, 2.5)
+
+    def test_single_value(self) -> None:
+        sketch = fs.P2Quantile(0.9)
+        sketch.add(7)
+        self.assertEqual(sketch.value, 7)
+
+    def test_median_estimate(self) -> None:
+        rng = random.Random(42)
+        sketch = fs.P2Quantile(0.5)
+        for _ in range(10000):
+            sketch.add(rng.random())
+        self.assertEqual(sketch.count, 10000)
+        self.assertAlmostEqual(sketch.value, 0.5, delta=0.02)  # type: ignore
+
+    def test_high_quantile_estimate(self) -> None:
+        rng = random.Random(42)
+        sketch = fs.P2Quantile(0.99)
+        for _ in range(10000):
+            sketch.add(rng.gauss(0, 1))
+        self.assertAlmostEqual(sketch.value, 2.326, delta=0.1)  # type: ignore
+
+    def test_sorted_values(self) -> None:
+        sketch = fs.P2Quantile(0.25)
+        for value in range(1, 1001):
+            sketch.add(value)
+        self.assertAlmostEqual(sketch.value, 250, delta=10)  # type: ignore
+
+    def test_reverse_sorted_values(self) -> None:
+        sketch = fs.P2Quantile(0.75)
+        for value in range(1000, 0, -1):
+            sketch.add(value)
+        self.assertAlmostEqual(sketch.value, 750, delta=10)  # type: ignore
+
+    def test_constant_values(self) -> None:
+        sketch = fs.P2Quantile(0.5)
+        for _ in range(100):
+            sketch.add(3)
+        self.assertEqual(sketch.value, 3)
+
+    def test_invalid_quantile(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.P2Quantile(1)
+        with self.assertRaises(fs.HofsException):
+            fs.P2Quantile(0)
+
+
+class TestHash(TestCase):
+    def test_equal_numbers(self) -> None:
+        bloom = fs.BloomFilter(100)
+        bloom.add(1)
+        self.assertIn(1.0, bloom)
+        self.assertIn(True, bloom)
+        self.assertNotIn("1", bloom)
+        self.assertNotIn(b"1", bloom)
+
+        sketch = fs.HyperLogLog()
+        for value in [1, 1.0, True, 2.5, "2.5", None, (1, "a"), (1.0, "a"), ("a", 1)]:
+            sketch.add(value)
+        self.assertEqual(sketch.count, 6)
+
+    def test_unsupported_value(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.HyperLogLog().add(object())
+        with self.assertRaises(fs.HofsException):
+            fs.BloomFilter(10).add([1])
+
+
+class TestBloomFilter(TestCase):
+    def test_contains(self) -> None:
+        bloom = fs.BloomFilter(1000)
+        for value in range(1000):
+            self.assertFalse(bloom.add(f"value {value}"))
+        self.assertTrue(bloom.add("value 10"))
+        self.assertTrue(all(f"value {value}" in bloom for value in range(1000)))
+
+    def test_false_positive_rate(self) -> None:
+        bloom = fs.BloomFilter(2000, fp_rate=0.01)
+        for value in range(2000):
+            bloom.add(value)
+        false_positives = sum(value in bloom for value in range(2000, 12000))
+        self.assertLess(false_positives, 200)
+
+    def test_bytes(self) -> None:
+        bloom = fs.BloomFilter(10)
+        bloom.add(b"abc")
+        self.assertIn(b"abc", bloom)
+        self.assertNotIn(b"abd", bloom)
+
+    def test_merge(self) -> None:
+        bloom, other = fs.BloomFilter(100), fs.BloomFilter(100)
+        bloom.add("a")
+        other.add("b")
+        bloom.merge(other)
+        self.assertIn("a", bloom)
+        self.assertIn("b", bloom)
+
+        with self.assertRaises(fs.HofsException):
+            bloom.merge(fs.BloomFilter(1000))
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.BloomFilter(0)
+        with self.assertRaises(fs.HofsException):
+            fs.BloomFilter(10, fp_rate=1)
+
+
+class TestHyperLogLog(TestCase):
+    def test_empty(self) -> None:
+        self.assertEqual(fs.HyperLogLog().count, 0)
+
+    def test_small_counts_exact(self) -> None:
+        sketch = fs.HyperLogLog()
+        for value in map(str, range(100)):
+            sketch.add(value)
+            sketch.add(value)
+        self.assertEqual(sketch.count, 100)
+
+    def test_large_count(self) -> None:
+        sketch = fs.HyperLogLog(precision=10)
+        for value in range(20000):
+            sketch.add(str(value))
+        self.assertAlmostEqual(sketch.count, 20000, delta=20000 * 0.1)
+
+    def test_tiny_precision(self) -> None:
+        sketch = fs.HyperLogLog(precision=4)
+        for value in range(1000):
+            sketch.add(value)
+        self.assertAlmostEqual(sketch.count, 1000, delta=1000 * 0.6)
+
+    def test_merge(self) -> None:
+        sketch, other = fs.HyperLogLog(), fs.HyperLogLog()
+        for value in range(300):
+            sketch.add(value)
+        for value in range(200, 500):
+            other.add(value)
+        sketch.merge(other)
+        self.assertAlmostEqual(sketch.count, 500, delta=10)
+
+        with self.assertRaises(fs.HofsException):
+            sketch.merge(fs.HyperLogLog(precision=10))
+
+    def test_invalid_precision(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.HyperLogLog(precision=3)
@@ -0,0 +1,31 @@
+import os
+from unittest import TestCase
+
+import hofs as fs
+from hofs.common.spill import SpillFiles
+
+
+class TestSpillFiles(TestCase):
+    def test_merge_compacts(self) -> None:
+        with SpillFiles(chunk_size=2, max_fan_in=2) as spill:
+            for run in range(5):
+                spill.write([(value, run) for value in range(run, 10, 2)])
+            result = list(spill.merge(key=lambda pair: pair[0]))
+            self.assertEqual(len(spill.paths), 2)
+            self.assertEqual(len(os.listdir(os.path.dirname(spill.paths[0]))), 2)
+
+        # Equal values keep the order of the runs they come from
+        expected = sorted(
+            [(value, run) for run in range(5) for value in range(run, 10, 2)]
+        )
+        self.assertEqual(result, expected)
+
+    def test_merge_reverse(self) -> None:
+        with SpillFiles(max_fan_in=2) as spill:
+            for run in range(3):
+                spill.write([3 - run, -run])
+            self.assertEqual(list(spill.merge(reverse=True)), [3, 2, 1, 0, -1, -2])
+
+    def test_max_fan_in_too_small(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            SpillFiles(max_fan_in=1)
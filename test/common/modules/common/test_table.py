@@ -1,3 +1,4 @@
+import io
 from unittest import TestCase
 
 import hofs as fs
@@ -89,3 +90,221 @@ class TestTable(TestCase):
         self.assertEqual(
             str(table), "Col1 Col2 Col3 \nA    B    C    \nD    E    F    \n"
         )
+
+    def test_render(self) -> None:
+        out = io.StringIO()
+        self.table.render(out)
+        self.assertEqual(out.getvalue(), repr(self.table))
+
+    def test_render_max_rows(self) -> None:
+        out = io.StringIO()
+        self.table.render(out, max_rows=1)
+        self.assertEqual(
+            out.getvalue(), "Col1 Col2 Col3 \nA    B    C    \n... 1 more rows\n"
+        )
+
+    def test_render_pages(self) -> None:
+        table = fs.table_from_rows(["n"], [[1], [2], [3]])
+        out = io.StringIO()
+        table.render(out, page_size=2)
+        self.assertEqual(out.getvalue(), "n \n1 \n2 \n\nn \n3 \n")
+
+    def test_render_many_rows(self) -> None:
+        table = fs.Table(["n"], types={"n": "int"})
+        for n in range(3000):
+            table.add_row([n])
+        out = io.StringIO()
+        table.render(out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3001)
+        self.assertEqual(lines[-1], "2999 ")
+
+    def test_render_empty(self) -> None:
+        out = io.StringIO()
+        fs.Table(["name"]).render(out, max_rows=10)
+        self.assertEqual(out.getvalue(), "name \n")
+
+    def test_render_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            self.table.render(io.StringIO(), max_rows=-1)
+        with self.assertRaises(fs.HofsException):
+            self.table.render(io.StringIO(), page_size=0)
+
+    def test_repr_non_str_values(self) -> None:
+        table = fs.table_from_rows(cols=["Name", "Count"], rows=[["a", 10]])
+        self.assertEqual(repr(table), "Name Count \na    10    \n")
+
+
+class TestTypedTable(TestCase):
+    def setUp(self) -> None:
+        self.table = fs.table_from_rows(
+            cols=["path", "lines", "ratio"],
+            rows=[
+                ["b.py", "20", 0.5],
+                ["a.py", 3, 1],
+                ["c.py", fs.FileSize(10), "0.25"],
+            ],
+            types={"path": "str", "lines": "int", "ratio": "float"},
+        )
+
+    def test_col_types(self) -> None:
+        self.assertEqual(
+            fs.Table(["a", "b"], types={"b": "int"}).col_types, {"a": None, "b": "int"}
+        )
+
+    def test_values_converted(self) -> None:
+        self.assertEqual(self.table.col(1), [20, 3, 10])
+        self.assertEqual(self.table.col(2), [0.5, 1.0, 0.25])
+        self.assertEqual(self.table.row(0), ["b.py", 20, 0.5])
+        self.assertEqual(self.table.value_by_name(2, "lines"), 10)
+        self.assertIsInstance(self.table.col(1), list)
+
+    def test_typed_value(self) -> None:
+        self.assertEqual(self.table.value(0, 1), 20)
+        self.assertEqual(self.table.value(2, 2), 0.25)
+
+    def test_col_copied(self) -> None:
+        table = fs.Table(["a", "b"], types={"b": "int"})
+        table.add_row(["x", 1])
+        for idx in range(2):
+            table.col(idx).append(2)
+            self.assertEqual(len(table.col(idx)), 1)
+
+    def test_strings_interned(self) -> None:
+        table = fs.Table(["name"], types={"name": "str"})
+        table.add_row(["".join(["a", "b"])])
+        table.add_row(["".join(["a", "b"])])
+        self.assertIs(table.value(0, 0), table.value(1, 0))
+
+    def test_wrong_value(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            self.table.add_row(["d.py", "many", 1])
+        self.assertEqual(self.table.n_rows, 3)
+        self.assertEqual(len(self.table.col(0)), 3)
+
+    def test_value_out_of_range(self) -> None:
+        table = fs.Table(["a", "b"], types={"b": "int"})
+        for value in [2**70, 3.9, float("inf")]:
+            with self.assertRaises(fs.HofsException):
+                table.add_row(["x", value])
+        with self.assertRaises(fs.HofsException):
+            fs.Table(["a"], types={"a": "float"}).add_row([10**400])
+        table.add_row(["y", 2**63 - 1])
+        table.add_row(["z", 4.0])
+        self.assertEqual(table.col(0), ["y", "z"])
+        self.assertEqual(table.col(1), [2**63 - 1, 4])
+
+    def test_col_sum(self) -> None:
+        self.assertEqual(self.table.col_sum("lines"), 33)
+        self.assertEqual(self.table.col_sum("ratio"), 1.75)
+        with self.assertRaises(fs.HofsException):
+            self.table.col_sum("path")
+        with self.assertRaises(fs.HofsException):
+            self.table.col_sum("size")
+
+    def test_col_sum_untyped(self) -> None:
+        table = fs.table_from_rows(["size"], [[fs.FileSize(3)], [fs.FileSize(4)]])
+        self.assertEqual(int(table.col_sum("size")), 7)
+
+    def test_col_mean(self) -> None:
+        self.assertEqual(self.table.col_mean("lines"), 11)
+        self.assertIsNone(fs.Table(["a"], types={"a": "int"}).col_mean("a"))
+
+    def test_sort_by(self) -> None:
+        table = self.table.sort_by("lines", reverse=True)
+        self.assertEqual(table.col(0), ["b.py", "c.py", "a.py"])
+        self.assertEqual(table.col(1), [20, 10, 3])
+        self.assertEqual(table.col_types, self.table.col_types)
+        self.assertEqual(self.table.sort_by("path").col(2), [1.0, 0.5, 0.25])
+        self.assertEqual(self.table.col(0), ["b.py", "a.py", "c.py"])
+
+    def test_filter(self) -> None:
+        table = self.table.filter("ratio", lambda ratio: ratio < 1)
+        self.assertEqual(table.col(0), ["b.py", "c.py"])
+        self.assertEqual(table.col(1), [20, 10])
+        table.add_row(["d.py", "4", "1"])
+        self.assertEqual(table.col(1), [20, 10, 4])
+
+    def test_repr(self) -> None:
+        self.assertEqual(
+            repr(self.table.filter("lines", lambda lines: lines > 5)),
+            "path lines ratio \nb.py 20    0.5   \nc.py 10    0.25  \n",
+        )
+
+    def test_invalid_types(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Table(["a"], types={"b": "int"})
+        with self.assertRaises(fs.HofsException):
+            fs.Table(["a"], types={"a": "int64"})
+
+
+class TestTableIO(TestCase):
+    def setUp(self) -> None:
+        self.table = fs.table_from_rows(
+            cols=["path", "lines"],
+            rows=[["a, b.py", 20], ['say "hi".py', 3]],
+            types={"lines": "int"},
+        )
+
+    def test_csv(self) -> None:
+        out = io.StringIO()
+        self.table.to_csv(out)
+        self.assertEqual(
+            out.getvalue(), 'path,lines\r\n"a, b.py",20\r\n"say ""hi"".py",3\r\n'
+        )
+
+        out.seek(0)
+        table = fs.Table.from_csv(out, types={"lines": "int"})
+        self.assertEqual(table.col_names, ["path", "lines"])
+        self.assertEqual(table.col(0), ["a, b.py", 'say "hi".py'])
+        self.assertEqual(table.col(1), [20, 3])
+
+    def test_csv_blank_lines(self) -> None:
+        table = fs.Table.from_csv(io.StringIO("\na,b\n1,x\n\n2,y\n\n\n"))
+        self.assertEqual(table.col_names, ["a", "b"])
+        self.assertEqual(table.col(0), ["1", "2"])
+
+    def test_csv_untyped(self) -> None:
+        table = fs.Table.from_csv(io.StringIO("a,b\n1,x\n"))
+        self.assertEqual(table.row(0), ["1", "x"])
+
+    def test_csv_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Table.from_csv(io.StringIO(""))
+        with self.assertRaises(fs.HofsException):
+            fs.Table.from_csv(io.StringIO("a,b\n1\n"))
+        with self.assertRaises(fs.HofsException):
+            fs.Table.from_csv(io.StringIO("a,b\n1,x\n"), types={"b": "int"})
+
+    def test_jsonl(self) -> None:
+        out = io.StringIO()
+        self.table.to_jsonl(out)
+        self.assertEqual(
+            out.getvalue(),
+            '{"path": "a, b.py", "lines": 20}\n{"path": "say \\"hi\\".py", "lines": 3}\n',
+        )
+
+        out.seek(0)
+        table = fs.Table.from_jsonl(out)
+        self.assertEqual(table.col_names, ["path", "lines"])
+        self.assertEqual(table.col(1), [20, 3])
+
+    def test_jsonl_non_json_values(self) -> None:
+        out = io.StringIO()
+        fs.table_from_rows(["size"], [[fs.FileSize(3)]]).to_jsonl(out)
+        self.assertEqual(out.getvalue(), '{"size": "3.0B"}\n')
+
+    def test_jsonl_many_rows(self) -> None:
+        table = fs.Table(["n"], types={"n": "int"})
+        for n in range(2000):
+            table.add_row([n])
+        out = io.StringIO()
+        table.to_jsonl(out)
+        out.seek(0)
+        self.assertEqual(fs.Table.from_jsonl(out).col(0), list(range(2000)))
+
+    def test_jsonl_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Table.from_jsonl(io.StringIO("\n"))
+        with self.assertRaises(fs.HofsException):
+            fs.Table.from_jsonl(io.StringIO('{"a": 1}\n{"b": 2}\n'))
@@ -0,0 +1,103 @@
+from test.test_fs_values import A_TXT_PATH, SUB_DIR_PATH
+from typing import List, Tuple
+from unittest import TestCase, mock
+
+import hofs as fs
+from hofs.common import instrumentation
+
+
+class TestThrottle(TestCase):
+    def test_bytes(self) -> None:
+        # 6 bytes are read, but the bucket only holds 5 tokens
+        with fs.Throttle(bytes_per_second=5) as throttle:
+            self.assertEqual(fs.File(A_TXT_PATH).bytes, b"line 1")
+        self.assertGreater(throttle.waited, 0)
+        self.assertEqual(instrumentation.hooks, [])
+
+    def test_ops(self) -> None:
+        with fs.Throttle(ops_per_second=1000) as throttle:
+            self.assertEqual(fs.Dir(SUB_DIR_PATH).files.len(), 4)
+            self.assertEqual(fs.File(A_TXT_PATH).bytes, b"line 1")
+        self.assertEqual(throttle.waited, 0)
+
+    def test_debt(self) -> None:
+        throttle = fs.Throttle(bytes_per_second=1000, ops_per_second=1000)
+        throttle._on_event(instrumentation.STAT, 1)
+        self.assertEqual(throttle.waited, 0)
+        throttle._on_event(instrumentation.READ_BYTES, 1050)
+        self.assertAlmostEqual(throttle.waited, 0.05, delta=0.01)
+
+    def test_install_twice(self) -> None:
+        throttle = fs.Throttle(ops_per_second=1000, adaptive=True)
+        throttle.install()
+        throttle.install()
+        self.assertEqual(instrumentation.hooks, [throttle._on_event])
+        self.assertEqual(instrumentation.latency_hooks, [throttle._on_latency])
+        throttle.remove()
+        throttle.remove()
+        self.assertEqual(instrumentation.hooks, [])
+        self.assertEqual(instrumentation.latency_hooks, [])
+
+    def test_adaptive(self) -> None:
+        throttle = fs.Throttle(bytes_per_second=1000, adaptive=True, target_latency=1)
+        throttle._on_latency(2)
+        self.assertEqual(throttle.factor, 0.5)
+        # The rates are halved at most once per second
+        throttle._on_latency(2)
+        self.assertEqual(throttle.factor, 0.5)
+        for _ in range(4):
+            throttle._on_latency(0)
+        self.assertLess(throttle.latency, 1)  # type: ignore
+        self.assertAlmostEqual(throttle.factor, 0.55)
+
+    def test_adaptive_reads(self) -> None:
+        with fs.Throttle(bytes_per_second=10**9, adaptive=True) as throttle:
+            self.assertEqual(fs.TextFile(A_TXT_PATH).content, "line 1")
+        self.assertIsNotNone(throttle.latency)
+        self.assertEqual(throttle.factor, 1)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Throttle()
+        with self.assertRaises(fs.HofsException):
+            fs.Throttle(bytes_per_second=0)
+        with self.assertRaises(fs.HofsException):
+            fs.Throttle(ops_per_second=-1)
+
+
+class TestLatencyHooks(TestCase):
+    def setUp(self) -> None:
+        self.durations: List[float] = []
+        instrumentation.add_hook(self.hook)
+        instrumentation.add_latency_hook(self.durations.append)
+
+    def tearDown(self) -> None:
+        instrumentation.remove_latency_hook(self.durations.append)
+        instrumentation.remove_hook(self.hook)
+
+    def hook(self, event: str, amount: int) -> None:
+        pass
+
+    def test_read_latency(self) -> None:
+        self.assertEqual(fs.File(A_TXT_PATH).bytes, b"line 1")
+        self.assertNotEqual(len(self.durations), 0)
+        self.assertTrue(all(duration >= 0 for duration in self.durations))
+
+
+class TestChunkedReads(TestCase):
+    def setUp(self) -> None:
+        self.events: List[Tuple[str, int]] = []
+        instrumentation.add_hook(self.hook)
+
+    def tearDown(self) -> None:
+        instrumentation.remove_hook(self.hook)
+
+    def hook(self, event: str, amount: int) -> None:
+        self.events.append((event, amount))
+
+    def test_whole_file_read_in_chunks(self) -> None:
+        # Every chunk is reported before the next one is read
+        with mock.patch.object(instrumentation, "_READ_CHUNK_SIZE", 4):
+            self.assertEqual(fs.File(A_TXT_PATH).bytes, b"line 1")
+        reads = [n for event, n in self.events if event == instrumentation.READ_BYTES]
+        self.assertEqual(reads, [4, 2])
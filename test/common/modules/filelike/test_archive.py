@@ -0,0 +1,144 @@
+import datetime
+import gzip
+import os
+import tarfile
+import tempfile
+import zipfile
+from test.test_fs_values import A_TXT_PATH, BAD_F_TXT_PATH, BASE_DIR_PATH
+from typing import List
+from unittest import TestCase
+
+import hofs as fs
+
+BASE_DIR_NAMES = [
+    "a.txt",
+    "b.txt",
+    "c.txt2",
+    "emptybin",
+    "rndbin1",
+    "sub_dir/d.txt",
+    "sub_dir/e.txt",
+    "sub_dir/empty.txt",
+    "sub_dir/rndbin2",
+]
+
+
+def member_names(archive_dir: fs.ArchiveDir) -> List[str]:
+    return (
+        archive_dir.files.map_path()
+        .map(lambda path: fs.relative_path(path, archive_dir.path).replace(os.sep, "/"))
+        .list()
+    )
+
+
+class ArchiveDirTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.zip_path = os.path.join(self.tmp_dir.name, "base_dir.zip")
+        self.tar_path = os.path.join(self.tmp_dir.name, "base_dir.tar.gz")
+
+        # Add the members in reverse order to check that listing is sorted like Dir.files
+        with zipfile.ZipFile(self.zip_path, "w") as zip_file:
+            zip_file.writestr("sub_dir/", "")
+            for name in reversed(BASE_DIR_NAMES):
+                zip_file.write(os.path.join(BASE_DIR_PATH, name), name)
+            zip_file.writestr("logs/x.log", gzip.compress(b"1\n2\n3\n"))
+        with tarfile.open(self.tar_path, "w:gz") as tar_file:
+            tar_file.add(
+                os.path.join(BASE_DIR_PATH, "sub_dir"), "./sub_dir", recursive=False
+            )
+            for name in reversed(BASE_DIR_NAMES):
+                tar_file.add(os.path.join(BASE_DIR_PATH, name), "./" + name)
+
+        self.zip_dir = fs.ArchiveDir(self.zip_path)
+        self.tar_dir = fs.ArchiveDir(self.tar_path)
+
+    def tearDown(self) -> None:
+        self.zip_dir.close()
+        self.tar_dir.close()
+        self.tmp_dir.cleanup()
+
+    def test_no_archive_exception(self) -> None:
+        self.assertRaises(fs.HofsException, fs.ArchiveDir, BAD_F_TXT_PATH)
+
+    def test_not_an_archive_exception(self) -> None:
+        self.assertRaises(fs.HofsException, fs.ArchiveDir, A_TXT_PATH)
+
+    def test_files_zip(self) -> None:
+        self.assertEqual(
+            member_names(self.zip_dir),
+            BASE_DIR_NAMES[:5] + ["logs/x.log"] + BASE_DIR_NAMES[5:],
+        )
+
+    def test_files_tar(self) -> None:
+        # Compressed tars are listed in archive order, so that they are read front to back
+        self.assertEqual(member_names(self.tar_dir), list(reversed(BASE_DIR_NAMES)))
+
+    def test_files_uncompressed_tar(self) -> None:
+        tar_path = os.path.join(self.tmp_dir.name, "base_dir.tar")
+        with tarfile.open(tar_path, "w") as tar_file:
+            for name in reversed(BASE_DIR_NAMES):
+                tar_file.add(os.path.join(BASE_DIR_PATH, name), name)
+        with fs.ArchiveDir(tar_path) as tar_dir:
+            self.assertEqual(member_names(tar_dir), BASE_DIR_NAMES)
+
+    def test_member_outside_root(self) -> None:
+        tar_path = os.path.join(self.tmp_dir.name, "escape.tar")
+        with tarfile.open(tar_path, "w") as tar_file:
+            for name in ["../x.txt", "../../sub/y.txt", "/abs.txt", "a/../../z.txt"]:
+                tar_file.add(A_TXT_PATH, name)
+        with fs.ArchiveDir(tar_path) as tar_dir:
+            self.assertEqual(
+                member_names(tar_dir), ["abs.txt", "x.txt", "z.txt", "sub/y.txt"]
+            )
+            for path in tar_dir.files.map_path():
+                self.assertTrue(path.startswith(os.path.join(tar_path, "")))
+
+    def test_paths(self) -> None:
+        self.assertEqual(
+            self.tar_dir.files.map_path().list()[0],
+            os.path.join(self.tar_dir.path, "sub_dir", "rndbin2"),
+        )
+
+    def test_map_line_count(self) -> None:
+        for archive_dir in [self.zip_dir, self.tar_dir]:
+            self.assertEqual(archive_dir.files.filter_ext("txt").t().map_lc().sum(), 10)
+
+    def test_compressed_member(self) -> None:
+        self.assertEqual(self.zip_dir.file("logs/x.log").t().lc, 3)
+
+    def test_bytes(self) -> None:
+        self.assertEqual(
+            self.tar_dir.file("sub_dir/rndbin2").bytes,
+            fs.File(os.path.join(BASE_DIR_PATH, "sub_dir", "rndbin2")).bytes,
+        )
+
+    def test_file_missing_exception(self) -> None:
+        self.assertRaises(fs.HofsException, self.zip_dir.file, "f.txt")
+
+    def test_size(self) -> None:
+        self.assertEqual(int(self.zip_dir.file("a.txt").size), 6)
+
+    def test_mod_time(self) -> None:
+        self.assertIsInstance(self.zip_dir.file("a.txt").mtime, datetime.datetime)
+        self.assertEqual(
+            self.tar_dir.file("a.txt").mtime.replace(microsecond=0),
+            fs.File(A_TXT_PATH).mtime.replace(microsecond=0),
+        )
+
+    def test_access_time_exception(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            self.zip_dir.file("a.txt").atime
+
+    def test_dir(self) -> None:
+        self.assertEqual(self.zip_dir.file("sub_dir/d.txt").dir, self.zip_dir)
+
+    def test_context_manager(self) -> None:
+        with fs.ArchiveDir(self.zip_path) as archive_dir:
+            self.assertEqual(archive_dir.files.len(), 10)
+
+    def test_repr(self) -> None:
+        self.assertEqual(repr(self.zip_dir), f'ArchiveDir("{self.zip_dir.path}")')
+        file = self.zip_dir.file("a.txt")
+        self.assertEqual(repr(file), f'ArchiveFile("{file.path}")')
+        self.assertEqual(repr(file.t()), f"ArchiveTextFile({file.path})")
@@ -0,0 +1,145 @@
+import os
+import tempfile
+from test.test_fs_values import BASE_DIR_PATH, D_TXT_PATH, SUB_DIR_PATH
+from typing import Any, Callable
+from unittest import TestCase
+
+import hofs as fs
+from hofs.filelike.file_likes import _FileTreeWalkIterator, _FileTreeWalkIteratorKind
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_at(path: str) -> Callable[[Any], Any]:
+    # Kill the run when the file at path is reached
+    def fun(file: Any) -> Any:
+        if file.path == path:
+            raise Crash()
+        return file
+
+    return fun
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ckpt")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_len(self) -> None:
+        checkpoint = fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path)
+        self.assertFalse(checkpoint.resumed)
+        self.assertEqual(checkpoint.len(), 9)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_len(self) -> None:
+        with self.assertRaises(Crash):
+            fs.Dir(BASE_DIR_PATH).files.map(crash_at(D_TXT_PATH)).checkpoint(
+                self.path, interval=0
+            ).len()
+        self.assertTrue(os.path.exists(self.path))
+
+        checkpoint = fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path)
+        self.assertTrue(checkpoint.resumed)
+        self.assertEqual(checkpoint.len(), 9)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_resume_sum_line_counts(self) -> None:
+        with self.assertRaises(Crash):
+            fs.Dir(BASE_DIR_PATH).files.filter_ext("txt").t().map(
+                crash_at(D_TXT_PATH)
+            ).map(lambda file: file.line_count).checkpoint(self.path, interval=0).sum()
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.filter_ext("txt")
+            .t()
+            .map_lc()
+            .checkpoint(self.path)
+            .sum(),
+            fs.Dir(BASE_DIR_PATH).files.filter_ext("txt").t().map_lc().sum(),
+        )
+
+    def test_resume_count_by(self) -> None:
+        with self.assertRaises(Crash):
+            fs.Dir(BASE_DIR_PATH).files.map(crash_at(D_TXT_PATH)).checkpoint(
+                self.path, interval=0
+            ).count_by(lambda file: file.extension, name="ext")
+
+        table = (
+            fs.Dir(BASE_DIR_PATH)
+            .files.checkpoint(self.path)
+            .count_by(lambda file: file.extension, name="ext")
+        )
+        expected = fs.Dir(BASE_DIR_PATH).files.count_by(
+            lambda file: file.extension, name="ext"
+        )
+        self.assertEqual(table.col_names, ["ext", "count"])
+        self.assertEqual(table.col(0), expected.col(0))
+        self.assertEqual(table.col(1), expected.col(1))
+
+    def test_reduce(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.map_name()
+            .checkpoint(self.path)
+            .reduce(lambda names, name: names + [name], []),
+            fs.Dir(BASE_DIR_PATH).files.map_name().list(),
+        )
+
+    def test_save(self) -> None:
+        checkpoint = fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path)
+        checkpoint.save()
+        self.assertTrue(fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path).resumed)
+
+    def test_other_terminal(self) -> None:
+        with self.assertRaises(Crash):
+            fs.Dir(BASE_DIR_PATH).files.map(crash_at(D_TXT_PATH)).checkpoint(
+                self.path, interval=0
+            ).len()
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path).sum()
+
+    def test_other_dir(self) -> None:
+        with self.assertRaises(Crash):
+            fs.Dir(BASE_DIR_PATH).files.map(crash_at(D_TXT_PATH)).checkpoint(
+                self.path, interval=0
+            ).len()
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(SUB_DIR_PATH).files.checkpoint(self.path).len()
+
+    def test_invalid_chains(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.FunctionalIterator(range(3)).checkpoint(self.path)
+
+        files = fs.Dir(BASE_DIR_PATH).files
+        next(files)
+        with self.assertRaises(fs.HofsException):
+            files.checkpoint(self.path)
+
+    def test_invalid_interval(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(BASE_DIR_PATH).files.checkpoint(self.path, interval=-1)
+
+    def test_dirs(self) -> None:
+        self.assertEqual(fs.Dir(BASE_DIR_PATH).dirs.checkpoint(self.path).len(), 2)
+
+
+class TestWalkState(TestCase):
+    def test_restore(self) -> None:
+        walker = _FileTreeWalkIterator(
+            BASE_DIR_PATH, _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY
+        )
+        paths = [next(walker).path for _ in range(6)]
+        state = walker.state()
+        rest = [file.path for file in walker]
+
+        resumed = _FileTreeWalkIterator(
+            BASE_DIR_PATH, _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY
+        )
+        resumed.restore(state)
+        self.assertEqual([file.path for file in resumed], rest)
+        self.assertEqual(len(paths) + len(rest), 9)
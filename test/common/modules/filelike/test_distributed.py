@@ -0,0 +1,258 @@
+import copy
+import os
+import tempfile
+from test.test_fs_values import BASE_DIR_PATH, SUB_DIR_PATH
+from typing import Any, List
+from unittest import TestCase, mock
+
+import hofs as fs
+from hofs.filelike import distributed
+from hofs.filelike.distributed import _shards
+from hofs.filelike.file_likes import _FileTreeWalkIterator, _FileTreeWalkIteratorKind
+
+
+class TestDistributed(TestCase):
+    def test_len(self) -> None:
+        self.assertEqual(fs.Dir(BASE_DIR_PATH).files.distributed(2).len(), 9)
+
+    def test_len_default_workers(self) -> None:
+        self.assertEqual(fs.Dir(BASE_DIR_PATH).files.distributed().len(), 9)
+
+    def test_sum(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.map(lambda file: file.size)
+            .distributed(2)
+            .sum(),
+            fs.Dir(BASE_DIR_PATH).files.map(lambda file: file.size).sum(),
+        )
+
+    def test_sum_line_counts(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.filter_ext("txt")
+            .t()
+            .map_lc()
+            .distributed(2)
+            .sum(),
+            10,
+        )
+
+    def test_min_max(self) -> None:
+        sizes = fs.Dir(BASE_DIR_PATH).files.map(lambda file: int(file.size))
+        self.assertEqual(sizes.distributed(2).min(), 0)
+        sizes = fs.Dir(BASE_DIR_PATH).files.map(lambda file: int(file.size))
+        self.assertEqual(
+            sizes.distributed(2).max(),
+            fs.Dir(BASE_DIR_PATH).files.map(lambda file: int(file.size)).max(),
+        )
+
+    def test_min_max_empty_shard(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, content in [("a/x.txt", "abc"), ("b/y.bin", "abcdef")]:
+                os.makedirs(os.path.dirname(os.path.join(tmp_dir, name)))
+                with open(os.path.join(tmp_dir, name), "w") as f:
+                    f.write(content)
+
+            def sizes() -> fs.FunctionalIterator:
+                return (
+                    fs.Dir(tmp_dir).files.filter_ext("txt").map(lambda f: int(f.size))
+                )
+
+            self.assertEqual(sizes().distributed(2).min(), 3)
+            self.assertEqual(sizes().distributed(2).max(), 3)
+
+            with self.assertRaises(ValueError):
+                fs.Dir(tmp_dir).files.filter_ext("py").distributed(2).min()
+
+    def test_count_distinct(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(2)
+            .count_distinct(lambda file: file.extension),
+            3,
+        )
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.map(lambda file: int(file.size))
+            .distributed(2)
+            .count_distinct(approx=True),
+            fs.Dir(BASE_DIR_PATH)
+            .files.map(lambda file: int(file.size))
+            .count_distinct(),
+        )
+
+    def test_top_n(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(2)
+            .top_n(3, key=lambda file: (file.size, file.path)),
+            fs.Dir(BASE_DIR_PATH).files.top_n(
+                3, key=lambda file: (file.size, file.path)
+            ),
+        )
+
+    def test_count_by(self) -> None:
+        table = (
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(2)
+            .count_by(lambda file: file.extension, name="ext")
+        )
+        expected = fs.Dir(BASE_DIR_PATH).files.count_by(
+            lambda file: file.extension, name="ext"
+        )
+        self.assertEqual(table.col_names, ["ext", "count"])
+        self.assertEqual(table.col(0), expected.col(0))
+        self.assertEqual(table.col(1), expected.col(1))
+
+    def test_group_by(self) -> None:
+        table = (
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(2)
+            .group_by(lambda file: os.path.dirname(file.path), max_groups=1)
+            .agg(n="count", size=("sum", lambda file: int(file.size)))
+        )
+        self.assertEqual(table.col_names, ["key", "n", "size"])
+        self.assertEqual(table.col(0), [BASE_DIR_PATH, SUB_DIR_PATH])
+        self.assertEqual(table.col(1), [5, 4])
+
+    def test_filters_pushed_down(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.exclude(SUB_DIR_PATH)
+            .map_name()
+            .distributed(2)
+            .len(),
+            5,
+        )
+
+    def test_many_dirs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i in range(3):
+                for j in range(3):
+                    dir_path = os.path.join(tmp_dir, f"d{i}", f"d{j}")
+                    os.makedirs(dir_path)
+                    with open(os.path.join(dir_path, "f"), "w") as f:
+                        f.write("x" * (i * 3 + j))
+            with open(os.path.join(tmp_dir, "root"), "w") as f:
+                f.write("xy")
+
+            self.assertEqual(fs.Dir(tmp_dir).files.distributed(3).len(), 10)
+            self.assertEqual(
+                fs.Dir(tmp_dir)
+                .files.map(lambda file: int(file.size))
+                .distributed(3)
+                .sum(),
+                sum(range(9)) + 2,
+            )
+
+    def test_dirs(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .dirs.map(lambda dir: dir.path)
+            .distributed(2)
+            .top_n(5),
+            [SUB_DIR_PATH, BASE_DIR_PATH],
+        )
+
+    def test_one_worker(self) -> None:
+        self.assertEqual(fs.Dir(BASE_DIR_PATH).files.distributed(1).len(), 9)
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.map(lambda file: int(file.size))
+            .distributed(1)
+            .min(),
+            0,
+        )
+        with self.assertRaises(ValueError):
+            fs.Dir(BASE_DIR_PATH).files.filter_ext("py").distributed(1).max()
+        table = (
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(1)
+            .count_by(lambda file: os.path.dirname(file.path))
+        )
+        self.assertEqual(table.col(1), [5, 4])
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(1)
+            .count_distinct(lambda file: file.extension),
+            3,
+        )
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.distributed(1)
+            .count_distinct(lambda file: file.extension, approx=True),
+            3,
+        )
+
+    def test_sequential_stages(self) -> None:
+        # These stages need all values, so the chain runs in this process
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(files.take(2).distributed(4).len(), 2)
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(files.skip(7).distributed(4).len(), 2)
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(
+            files.map(lambda file: file.extension).distinct().distributed(4).len(), 3
+        )
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(
+            files.sample(1).map(lambda file: file.name).distributed(4).len(), 1
+        )
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(files.batch(4).distributed(4).len(), 3)
+
+    def test_not_fed_by_walk(self) -> None:
+        self.assertEqual(fs.FunctionalIterator(range(5)).distributed(2).sum(), 10)
+
+    def test_started(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files
+        next(files)
+        self.assertEqual(files.distributed(2).len(), 8)
+
+    def test_invalid_workers(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(BASE_DIR_PATH).files.distributed(0)
+
+    def test_shards(self) -> None:
+        walker = _FileTreeWalkIterator(
+            BASE_DIR_PATH, _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY
+        )
+        self.assertEqual(_shards(walker, 1), [(BASE_DIR_PATH, False)])
+        self.assertEqual(
+            _shards(walker, 2), [(BASE_DIR_PATH, True), (SUB_DIR_PATH, True)]
+        )
+
+        walker.prune = lambda path: path == SUB_DIR_PATH
+        self.assertEqual(_shards(walker, 2), [(BASE_DIR_PATH, True)])
+
+    def test_shards_missing_dir(self) -> None:
+        walker = _FileTreeWalkIterator(
+            os.path.join(BASE_DIR_PATH, "missing"),
+            _FileTreeWalkIteratorKind.REGULAR_FILES_ONLY,
+        )
+        self.assertEqual(
+            _shards(walker, 2), [(os.path.join(BASE_DIR_PATH, "missing"), True)]
+        )
+
+
+def run_shards_in_process(workers: int, n_shards: int) -> List[Any]:
+    # Like forking a process per shard, every shard gets a fresh copy of the unused chain
+    job = distributed._job
+    results = []
+    try:
+        for idx in range(n_shards):
+            distributed._job = copy.deepcopy(job)
+            results.append(distributed._run_shard(idx))
+    finally:
+        distributed._job = job
+    return results
+
+
+class TestDistributedInProcess(TestDistributed):
+    # The same tests, with the shards run in this process, so that merging the partial
+    # results is tested on platforms that can't fork, too
+    def setUp(self) -> None:
+        patcher = mock.patch.object(distributed, "_shard_runner", run_shards_in_process)
+        patcher.start()
+        self.addCleanup(patcher.stop)
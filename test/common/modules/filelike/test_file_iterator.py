@@ -1,3 +1,5 @@
+import os
+import tempfile
 from test.test_fs_values import (
     A_TXT_PATH,
     B_TXT_PATH,
@@ -11,6 +13,7 @@ from test.test_fs_values import (
     RNDBIN2_PATH,
     SUB_DIR_PATH,
 )
+from typing import List, Optional, Tuple
 from unittest import TestCase
 
 import hofs as fs
@@ -195,3 +198,302 @@ class TestFileIterator(TestCase):
             .list(),
             [C_TXT2_PATH, EMPTYBIN_PATH, RNDBIN1_PATH, RNDBIN2_PATH],
         )
+
+    def test_scan_literals(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.scan_literals(["line 1", "ne 9", b"\xff"])
+            .list(),
+            [
+                (A_TXT_PATH, 0, "line 1"),
+                (RNDBIN1_PATH, 10, b"\xff"),
+                (E_TXT_PATH, 16, "ne 9"),
+                (E_TXT_PATH, 21, "line 1"),
+            ],
+        )
+
+    def test_scan_literals_workers(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.scan_literals(["line", "words"], workers=2)
+            .map(lambda match: match[2])
+            .list(),
+            ["line"] * 3 + ["words"] + ["line"] * 7,
+        )
+
+    def test_filter(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.filter(lambda file: int(file.size) > 0)
+            .filter_extension("txt")
+            .filter(lambda file: file.name != "e.txt")
+            .exclude(A_TXT_PATH)
+            .map_path()
+            .list(),
+            [B_TXT_PATH, D_TXT_PATH],
+        )
+
+    def test_include_regex_str(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH).files.include_regex(r".*\.txt2").map_path().list(),
+            [C_TXT2_PATH],
+        )
+
+    def test_filter_started(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files
+        next(files)
+        txt_files = files.filter_extension("txt")
+        self.assertEqual(
+            txt_files.explain(),
+            f"walk {BASE_DIR_PATH}\nfilter: filter_extension('txt')",
+        )
+        self.assertEqual(
+            txt_files.map_path().list(),
+            [B_TXT_PATH, D_TXT_PATH, E_TXT_PATH, EMPTY_TXT_PATH],
+        )
+
+    def test_filter_list(self) -> None:
+        files = fs.FileIterator([fs.File(A_TXT_PATH), fs.File(C_TXT2_PATH)])
+        self.assertEqual(files.filter_extension("txt").map_path().list(), [A_TXT_PATH])
+
+    def test_explain(self) -> None:
+        self.assertEqual(
+            fs.Dir(BASE_DIR_PATH)
+            .files.filter(lambda file: int(file.size) > 0)
+            .exclude([SUB_DIR_PATH])
+            .filter_ext("txt")
+            .t()
+            .map_lc()
+            .explain(),
+            "\n".join(
+                [
+                    f"walk {BASE_DIR_PATH}",
+                    f"  prune directories: exclude([{SUB_DIR_PATH!r}])",
+                    f"  filter paths: exclude([{SUB_DIR_PATH!r}]) AND filter_extension('txt')",
+                    "filter: TestFileIterator.test_explain",
+                    "map: text_file_iterator",
+                    "map: TextFileIterator.map_line_count",
+                ]
+            ),
+        )
+
+    def test_explain_executed(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files.include_glob("*.txt2")
+        explanation = files.explain()
+        self.assertEqual(files.list(), [fs.File(C_TXT2_PATH)])
+        self.assertEqual(files.explain(), explanation)
+
+    def test_explain_list(self) -> None:
+        files = fs.FileIterator([fs.File(A_TXT_PATH)]).filter_name("a.*")
+        self.assertEqual(files.explain(), "list\nfilter: filter_name('a.*')")
+
+    def test_walk_skips_removed_dirs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a", "b"]:
+                os.mkdir(os.path.join(tmp_dir, name))
+            dirs = fs.Dir(tmp_dir).dirs
+            next(dirs)
+            os.rmdir(os.path.join(tmp_dir, "a"))
+            self.assertEqual(dirs.map(lambda d: d.name).list(), ["b"])
+
+    def test_cache(self) -> None:
+        cache = fs.Dir(BASE_DIR_PATH).files.cache()
+        files, other_files = cache.replay(), cache.replay()
+        assert isinstance(files, fs.FileIterator)
+        assert isinstance(other_files, fs.FileIterator)
+        self.assertEqual(files.filter_ext("txt2").map_path().list(), [C_TXT2_PATH])
+        self.assertEqual(cache.replay().len(), 9)
+        self.assertEqual(
+            other_files.filter_ext("txt2").explain(),
+            "\n".join(
+                [
+                    f"cache of: walk {BASE_DIR_PATH}",
+                    "filter: filter_extension('txt2')",
+                ]
+            ),
+        )
+
+    def test_tee_text_files(self) -> None:
+        files, other_files = fs.Dir(SUB_DIR_PATH).files.filter_ext("txt").t().tee()
+        assert isinstance(files, fs.TextFileIterator)
+        self.assertEqual(files.map_lc().list(), [3, 4, 0])
+        self.assertEqual(other_files.len(), 3)
+
+    def test_broadcast(self) -> None:
+        sizes, paths = fs.Dir(BASE_DIR_PATH).files.broadcast(
+            lambda files: files.filter_ext("txt2").map(lambda f: int(f.size)).list(),
+            lambda files: files.filter_ext("txt2").map_path().list(),
+        )
+        self.assertEqual(sizes, [16])
+        self.assertEqual(paths, [C_TXT2_PATH])
+
+    def test_broadcast_shares_stat(self) -> None:
+        first, second = fs.Dir(SUB_DIR_PATH).files.broadcast(
+            lambda files: files.map(lambda f: (f, f.size, f.mod_time, f.atime)).list(),
+            lambda files: files.list(),
+        )
+        for (file, _, _, _), other_file in zip(first, second):
+            self.assertIs(file, other_file)
+            self.assertIsNotNone(file._stat_result)
+
+    def test_broadcast_t_shares_stat(self) -> None:
+        first, second = fs.Dir(SUB_DIR_PATH).files.broadcast(
+            lambda files: files.t().map(lambda f: (f, int(f.size))).list(),
+            lambda files: files.map(lambda f: int(f.size)).list(),
+        )
+        self.assertEqual([size for _, size in first], second)
+        for text_file, _ in first:
+            self.assertIsInstance(text_file, fs.TextFile)
+            self.assertIsNotNone(text_file._stat_source._stat_result)
+
+    def test_broadcast_text_files(self) -> None:
+        line_counts, files = (
+            fs.Dir(SUB_DIR_PATH)
+            .files.filter_ext("txt")
+            .t()
+            .broadcast(lambda files: files.map_lc().list(), lambda files: files.list())
+        )
+        self.assertEqual(line_counts, [3, 4, 0])
+        self.assertIsInstance(files[0], fs.TextFile)
+
+    def test_first_stops_walk(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files
+        self.assertEqual(files.filter_ext("txt").first(), fs.File(A_TXT_PATH))
+        self.assertEqual(files.list(), [])
+
+    def test_any_stops_walk(self) -> None:
+        walk = fs.Dir(BASE_DIR_PATH).files
+        self.assertTrue(walk.filter(lambda file: file.name == "a.txt").any())
+        self.assertEqual(walk.list(), [])
+
+    def test_close_before_start(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files.filter_ext("txt")
+        files.close()
+        self.assertEqual(files.list(), [])
+
+    def test_close_list(self) -> None:
+        files = fs.FileIterator([fs.File(A_TXT_PATH), fs.File(B_TXT_PATH)])
+        self.assertEqual(files.take(1).list(), [fs.File(A_TXT_PATH)])
+        self.assertEqual(files.list(), [])
+
+    def test_early_exit_keeps_kind(self) -> None:
+        files = fs.Dir(BASE_DIR_PATH).files.filter_ext("txt")
+        taken = files.take(2)
+        assert isinstance(taken, fs.FileIterator)
+        self.assertEqual(taken.t().map_lc().list(), [1, 2])
+        self.assertIn("take: 2", taken.explain())
+
+        files = fs.Dir(BASE_DIR_PATH).files.filter_ext("txt")
+        skipped = files.skip(3).take_while(lambda f: f.name != "empty.txt")
+        assert isinstance(skipped, fs.FileIterator)
+        self.assertEqual(skipped.map_name().list(), ["e.txt"])
+
+    def test_sample(self) -> None:
+        sample = fs.Dir(BASE_DIR_PATH).files.filter_ext("txt").sample(2, seed=0)
+        self.assertIsInstance(sample, fs.FileIterator)
+        assert isinstance(sample, fs.FileIterator)
+        line_counts = sample.t().map_lc().list()
+        self.assertEqual(len(line_counts), 2)
+        self.assertIn("sample: 2", sample.explain())
+
+    def test_estimate(self) -> None:
+        estimate = fs.Dir(BASE_DIR_PATH).files.estimate(lambda file: int(file.size))
+        self.assertEqual(estimate.population, 9)
+        self.assertEqual(
+            estimate.total,
+            fs.Dir(BASE_DIR_PATH).files.map(lambda file: int(file.size)).sum(),
+        )
+
+
+class TestJoin(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp_dir.name, "src")
+        self.dst = os.path.join(self.tmp_dir.name, "dst")
+        for root, paths in [
+            (self.src, ["a", "c", "b/x", "b/y", "b/z/1", "d/1"]),
+            (self.dst, ["a", "b/y", "b/z/1", "b/z/2", "c/1", "e"]),
+        ]:
+            for path in paths:
+                path = os.path.join(root, *path.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write(path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def join(self, how: str) -> List[Tuple[Optional[str], Optional[str]]]:
+        pairs = fs.Dir(self.src).files.join(fs.Dir(self.dst).files, how=how)
+        return [
+            (
+                os.path.relpath(src.path, self.src) if src is not None else None,
+                os.path.relpath(dst.path, self.dst) if dst is not None else None,
+            )
+            for src, dst in pairs
+        ]
+
+    def test_inner(self) -> None:
+        self.assertEqual(
+            self.join("inner"),
+            [
+                ("a", "a"),
+                (os.path.join("b", "y"), os.path.join("b", "y")),
+                (os.path.join("b", "z", "1"), os.path.join("b", "z", "1")),
+            ],
+        )
+
+    def test_left(self) -> None:
+        self.assertEqual(
+            self.join("left"),
+            [
+                ("a", "a"),
+                ("c", None),
+                (os.path.join("b", "x"), None),
+                (os.path.join("b", "y"), os.path.join("b", "y")),
+                (os.path.join("b", "z", "1"), os.path.join("b", "z", "1")),
+                (os.path.join("d", "1"), None),
+            ],
+        )
+
+    def test_outer(self) -> None:
+        self.assertEqual(
+            self.join("outer"),
+            [
+                ("a", "a"),
+                ("c", None),
+                (None, "e"),
+                (os.path.join("b", "x"), None),
+                (os.path.join("b", "y"), os.path.join("b", "y")),
+                (os.path.join("b", "z", "1"), os.path.join("b", "z", "1")),
+                (None, os.path.join("b", "z", "2")),
+                (None, os.path.join("c", "1")),
+                (os.path.join("d", "1"), None),
+            ],
+        )
+
+    def test_outer_other_longer(self) -> None:
+        pairs = fs.Dir(SUB_DIR_PATH).files.join(
+            fs.Dir(BASE_DIR_PATH).files, how="outer"
+        )
+        self.assertEqual(len(pairs.list()), 13)
+
+    def test_filtered(self) -> None:
+        pairs = (
+            fs.Dir(self.src)
+            .files.exclude(os.path.join(self.src, "b"))
+            .join(fs.Dir(self.dst).files.filter_name("a|e"), how="outer")
+        )
+        self.assertEqual(
+            [(src is not None, dst is not None) for src, dst in pairs],
+            [(True, True), (True, False), (False, True), (True, False)],
+        )
+        self.assertIn("join: outer on relpath", pairs.explain())
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(self.src).files.join(fs.Dir(self.dst).files, on="name")
+        with self.assertRaises(fs.HofsException):
+            fs.Dir(self.src).files.join(fs.Dir(self.dst).files, how="right")
+        with self.assertRaises(fs.HofsException):
+            fs.FileIterator([fs.File(A_TXT_PATH)]).join(fs.Dir(self.dst).files)
@@ -1,4 +1,10 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
 from test.test_fs_values import A_TXT_PATH, B_TXT_PATH, EMPTY_TXT_PATH
+from typing import Callable, List, Tuple
 from unittest import TestCase
 
 import hofs as fs
@@ -63,6 +69,66 @@ class TextFileLineCountTest(TestCase):
         self.assertEqual(fs.TextFile(B_TXT_PATH).lc, 2)
 
 
+class TextFileCompressionTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        content = b"line 2\nline 3"
+        # The extensions are deliberately misleading, detection uses magic bytes
+        compressors: List[Tuple[str, Callable[[bytes], bytes]]] = [
+            ("gzip.txt", gzip.compress),
+            ("bz2.txt", bz2.compress),
+            ("xz.txt", lzma.compress),
+        ]
+        for name, compress in compressors:
+            with open(os.path.join(self.tmp_dir.name, name), "wb") as file:
+                file.write(compress(content))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def text_file(self, name: str) -> fs.TextFile:
+        return fs.TextFile(os.path.join(self.tmp_dir.name, name))
+
+    def test_compression(self) -> None:
+        self.assertEqual(self.text_file("gzip.txt").compression, "gzip")
+        self.assertEqual(self.text_file("bz2.txt").compression, "bz2")
+        self.assertEqual(self.text_file("xz.txt").compression, "xz")
+
+    def test_compression_none(self) -> None:
+        self.assertIsNone(fs.TextFile(B_TXT_PATH).compression)
+
+    def test_plain_text_with_magic(self) -> None:
+        for name, content in [
+            ("notes.txt", "BZh9 notes\n"),
+            ("gzip_like.txt", "\x1f\x8b not gzip\n"),
+            ("xz_like.txt", "\xfd7zXZ\x00 not xz\n"),
+        ]:
+            path = os.path.join(self.tmp_dir.name, name)
+            with open(path, "w", encoding="latin-1") as file:
+                file.write(content)
+            text_file = fs.TextFile(path, encoding="latin-1")
+            self.assertIsNone(text_file.compression)
+            self.assertEqual(text_file.content, content)
+
+    def test_content(self) -> None:
+        for name in ["gzip.txt", "bz2.txt", "xz.txt"]:
+            self.assertEqual(self.text_file(name).content, "line 2\nline 3")
+
+    def test_lines(self) -> None:
+        for name in ["gzip.txt", "bz2.txt", "xz.txt"]:
+            self.assertEqual(self.text_file(name).lines.list(), ["line 2\n", "line 3"])
+
+    def test_counts(self) -> None:
+        text_file = self.text_file("gzip.txt")
+        self.assertEqual(
+            (text_file.char_count, text_file.word_count, text_file.line_count),
+            (13, 4, 2),
+        )
+
+    def test_map_line_count(self) -> None:
+        self.assertEqual(fs.Dir(self.tmp_dir.name).files.t().map_lc().sum(), 6)
+
+
 class TextFileStrTest(TestCase):
     def test_str(self) -> None:
         self.assertEqual(str(fs.TextFile(A_TXT_PATH)), f"TextFile({A_TXT_PATH})")
@@ -15,6 +15,9 @@ class FileSizeTest(TestCase):
     def test_int(self) -> None:
         self.assertEqual(int(self.file_size), 2000)
 
+    def test_float(self) -> None:
+        self.assertEqual(float(self.file_size), 2000.0)
+
     def test_add_int(self) -> None:
         self.assertEqual(self.file_size + 450, fs.FileSize(2450))
 
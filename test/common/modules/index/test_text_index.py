@@ -0,0 +1,121 @@
+import gzip
+import os
+import shutil
+import tempfile
+from test.test_fs_values import BASE_DIR_PATH, RNDBIN1_PATH
+from unittest import TestCase
+
+import hofs as fs
+
+
+class TextIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir_path = os.path.join(self.tmp_dir.name, "base_dir")
+        shutil.copytree(BASE_DIR_PATH, self.dir_path)
+        self.index_path = os.path.join(self.tmp_dir.name, "index.db")
+        self.index = fs.Dir(self.dir_path).build_text_index(self.index_path, workers=1)
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def path(self, *names: str) -> str:
+        return os.path.join(self.dir_path, *names)
+
+    def write(self, content: str, *names: str) -> None:
+        with open(self.path(*names), "w") as file:
+            file.write(content)
+
+    def test_n_files(self) -> None:
+        self.assertEqual(self.index.n_files, 9)
+
+    def test_query(self) -> None:
+        self.assertEqual(
+            self.index.query("line").map(lambda f: f.path).list(),
+            [
+                self.path("a.txt"),
+                self.path("b.txt"),
+                self.path("sub_dir", "d.txt"),
+                self.path("sub_dir", "e.txt"),
+            ],
+        )
+
+    def test_query_missing_token(self) -> None:
+        self.assertEqual(self.index.query("missing").list(), [])
+
+    def test_query_lines(self) -> None:
+        self.assertEqual(
+            self.index.query_lines("5").map(lambda hit: (hit[0].name, hit[1])).list(),
+            [("d.txt", 2)],
+        )
+
+    def test_query_line_count(self) -> None:
+        self.assertEqual(self.index.query("3").map_lc().sum(), 2)
+
+    def test_refresh_changed_file(self) -> None:
+        self.write("foo(bar_baz)\nfoo", "a.txt")
+        self.index.refresh(workers=1)
+        self.assertEqual(
+            self.index.query_lines("foo").map(lambda hit: hit[1]).list(), [1, 2]
+        )
+        self.assertEqual(
+            self.index.query("bar_baz").map(lambda f: f.name).list(), ["a.txt"]
+        )
+        self.assertEqual(self.index.query("1").list(), [])
+
+    def test_refresh_new_and_removed_files(self) -> None:
+        self.write("new token", "sub_dir", "f.txt")
+        os.remove(self.path("b.txt"))
+        self.index.refresh(workers=1)
+        self.assertEqual(self.index.n_files, 9)
+        self.assertEqual(
+            self.index.query("new").map(lambda f: f.name).list(), ["f.txt"]
+        )
+        self.assertNotIn("b.txt", self.index.query("line").map(lambda f: f.name).list())
+
+    def test_query_skips_removed_files(self) -> None:
+        os.remove(self.path("a.txt"))
+        self.assertNotIn("a.txt", self.index.query("line").map(lambda f: f.name).list())
+
+    def test_refresh_corrupt_file(self) -> None:
+        data = gzip.compress("\n".join(f"line {i}" for i in range(10000)).encode())
+        with open(self.path("corrupt.gz"), "wb") as file:
+            file.write(data[: len(data) // 2])
+        self.write("fresh token", "fresh.txt")
+        self.index.refresh(workers=1)
+        self.assertEqual(self.index.n_files, 11)
+        self.assertEqual(
+            self.index.query("fresh").map(lambda file: file.path).list(),
+            [self.path("fresh.txt")],
+        )
+
+    def test_refresh_workers(self) -> None:
+        self.index.close()
+        os.remove(self.index_path)
+        with fs.Dir(self.dir_path).build_text_index(
+            self.index_path, workers=2
+        ) as index:
+            self.assertEqual(index.n_files, 9)
+            self.assertEqual(index.query("2").map(lambda f: f.name).list(), ["b.txt"])
+
+    def test_reopen(self) -> None:
+        self.index.close()
+        self.index = fs.TextIndex(self.index_path, self.dir_path)
+        self.assertEqual(self.index.query("line").len(), 4)
+
+    def test_other_dir_exception(self) -> None:
+        self.assertRaises(
+            fs.HofsException, fs.TextIndex, self.index_path, self.path("sub_dir")
+        )
+
+
+class TokenizeLinesTest(TestCase):
+    def test_tokenize_lines(self) -> None:
+        self.assertEqual(
+            fs.tokenize_lines(os.path.join(BASE_DIR_PATH, "b.txt")),
+            {"line": [1, 2], "2": [1], "3": [2]},
+        )
+
+    def test_tokenize_lines_binary(self) -> None:
+        self.assertEqual(fs.tokenize_lines(RNDBIN1_PATH), {})
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+from test.test_fs_values import B_TXT_PATH, BASE_DIR_PATH, RNDBIN1_PATH
+from typing import List, Tuple
+from unittest import TestCase, mock
+
+import hofs as fs
+
+
+class TrigramIndexTest(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir_path = os.path.join(self.tmp_dir.name, "base_dir")
+        shutil.copytree(BASE_DIR_PATH, self.dir_path)
+        self.index_path = os.path.join(self.tmp_dir.name, "index.db")
+        self.index = fs.Dir(self.dir_path).build_trigram_index(
+            self.index_path, workers=1
+        )
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def candidate_names(self, regex: str) -> List[str]:
+        return self.index.candidates(regex).map(lambda f: f.name).list()
+
+    def search(self, regex: str) -> List[Tuple[str, int, str]]:
+        return (
+            self.index.search(regex)
+            .map(lambda match: (match[0].name, match[1], match[2]))
+            .list()
+        )
+
+    def test_candidates(self) -> None:
+        self.assertEqual(self.candidate_names("bunch"), ["c.txt2"])
+
+    def test_candidates_or(self) -> None:
+        self.assertEqual(self.candidate_names("(bunch|ne 5)"), ["c.txt2", "d.txt"])
+
+    def test_candidates_all(self) -> None:
+        self.assertEqual(len(self.candidate_names("[a-z]")), 9)
+
+    def test_candidates_batched(self) -> None:
+        with mock.patch("hofs.index.trigram_index._MAX_SQL_PARAMS", 1):
+            self.assertEqual(self.candidate_names("(bunch|ne 5)"), ["c.txt2", "d.txt"])
+
+    def test_candidates_skip_removed_files(self) -> None:
+        os.remove(os.path.join(self.dir_path, "c.txt2"))
+        self.assertEqual(self.candidate_names("bunch"), [])
+
+    def test_search(self) -> None:
+        self.assertEqual(
+            self.search(r"line [5-7]$"),
+            [
+                ("d.txt", 2, "line 5\n"),
+                ("d.txt", 3, "line 6"),
+                ("e.txt", 1, "line 7\n"),
+            ],
+        )
+
+    def test_search_skips_binary_files(self) -> None:
+        self.assertEqual(self.search(r"^.*s$"), [("c.txt2", 1, "a bunch of words")])
+
+    def test_search_newline(self) -> None:
+        self.assertEqual(self.search("ne 5\n"), [("d.txt", 2, "line 5\n")])
+
+    def test_refresh(self) -> None:
+        with open(os.path.join(self.dir_path, "a.txt"), "w") as file:
+            file.write("a bunch of lines")
+        self.index.refresh(workers=1)
+        self.assertEqual(self.candidate_names("bunch"), ["a.txt", "c.txt2"])
+        self.assertEqual(self.search("line 1$"), [])
+
+
+class RegexTrigramQueryTest(TestCase):
+    def test_literal(self) -> None:
+        self.assertEqual(
+            fs.regex_trigram_query("abcd"), ("and", [("tri", "abc"), ("tri", "bcd")])
+        )
+
+    def test_literal_newline(self) -> None:
+        self.assertEqual(fs.regex_trigram_query("abc\nde"), ("tri", "abc"))
+
+    def test_short_literal(self) -> None:
+        self.assertIsNone(fs.regex_trigram_query("ab"))
+
+    def test_branch(self) -> None:
+        self.assertEqual(
+            fs.regex_trigram_query("x(abc|def)"),
+            ("or", [("tri", "abc"), ("tri", "def")]),
+        )
+
+    def test_branch_unrestricted(self) -> None:
+        self.assertIsNone(fs.regex_trigram_query("abc|d"))
+
+    def test_repeat(self) -> None:
+        self.assertEqual(fs.regex_trigram_query("(?:abc)+x*(def)*"), ("tri", "abc"))
+
+    def test_ignore_case(self) -> None:
+        self.assertIsNone(fs.regex_trigram_query("(?i)abc"))
+        self.assertEqual(fs.regex_trigram_query("(?i:abc)def"), ("tri", "def"))
+
+
+class TrigramsTest(TestCase):
+    def test_trigrams(self) -> None:
+        self.assertEqual(fs.trigrams(B_TXT_PATH), {"lin", "ine", "ne ", "e 2", "e 3"})
+
+    def test_trigrams_binary(self) -> None:
+        self.assertEqual(fs.trigrams(RNDBIN1_PATH), set())
@@ -85,6 +85,11 @@ class TestPath(TestCase):
             hofs.paths.matches.path_matches_base(SUB_DIR_PATH, [BASE_DIR_PATH])
         )
 
+    def test_path_matches_base_false(self) -> None:
+        self.assertFalse(
+            hofs.paths.matches.path_matches_base(BASE_DIR_PATH, [SUB_DIR_PATH])
+        )
+
     def test_path_matches_regex_str(self) -> None:
         self.assertTrue(hofs.paths.matches.path_matches_regex(A_TXT_PATH, r".*a\.txt"))
 